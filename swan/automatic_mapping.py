@@ -124,71 +124,42 @@ def generate_feature_vectors(parent_class, feature_dictionary, additional_dictio
     return np.nan_to_num(feature_vectors)
 
 
-def get_session_ids(blocks):
-    session_ids = []
-    for b, block in enumerate(blocks):
-        units = block.channel_indexes[0].units
-        for u, unit in enumerate(units):
-            if 'noise' not in unit.description.split() and 'unclassified' not in unit.description.split():
-                session_ids.append(b)
+def get_session_ids(neodata):
+    channel_data = neodata.channel_data
+    return channel_data.session_ids[channel_data.real].tolist()
 
-    return session_ids
 
+def get_real_unit_ids(neodata):
+    channel_data = neodata.channel_data
+    return channel_data.unit_ids[channel_data.real].tolist()
 
-def get_real_unit_ids(blocks):
-    unit_ids = []
-    for block in blocks:
-        units = block.channel_indexes[0].units
-        for u, unit in enumerate(units):
-            if 'noise' not in unit.description.split() and 'unclassified' not in unit.description.split():
-                unit_ids.append(u)
 
-    return unit_ids
-
-
-def get_mean_waveforms(blocks):
+def get_mean_waveforms(neodata):
     mean_waveforms = []
-    for block in blocks:
-        units = block.channel_indexes[0].units
-        for unit in units:
-            if 'noise' not in unit.description.split() and 'unclassified' not in unit.description.split():
-                waves = unit.spiketrains[0].waveforms.magnitude[:, 0, :]
-                waves = waves - waves.mean(axis=1, keepdims=True)
-                mean_waveforms.append(waves.mean(axis=0))
+    for record in neodata.channel_data.real_records:
+        waves = neodata.get_waveforms(record.unit).magnitude[:, 0, :]
+        waves = waves - waves.mean(axis=1, keepdims=True)
+        mean_waveforms.append(waves.mean(axis=0))
 
     return mean_waveforms
 
 
-def get_all_waveforms(blocks):
+def get_all_waveforms(neodata):
     waveforms = []
-    for block in blocks:
-        units = block.channel_indexes[0].units
-        for unit in units:
-            if 'noise' not in unit.description.split() and 'unclassified' not in unit.description.split():
-                waves = unit.spiketrains[0].waveforms.magnitude[:, 0, :]
-                waves = waves - waves.mean(axis=1, keepdims=True)
-                waveforms.append(waves)
+    for record in neodata.channel_data.real_records:
+        waves = neodata.get_waveforms(record.unit).magnitude[:, 0, :]
+        waves = waves - waves.mean(axis=1, keepdims=True)
+        waveforms.append(waves)
     return waveforms
 
 
-def get_all_spiketrains(blocks):
-    spiketrains = []
-    for block in blocks:
-        units = block.channel_indexes[0].units
-        for unit in units:
-            if 'noise' not in unit.description.split() and 'unclassified' not in unit.description.split():
-                train = unit.spiketrains[0].times.magnitude
-                spiketrains.append(train)
-    return spiketrains
+def get_all_spiketrains(neodata):
+    channel_data = neodata.channel_data
+    return [channel_data.get_spike_times(record) for record in channel_data.real_records]
 
 
-def get_time_stamps(blocks):
-    all_time_stamps = []
-    for block in blocks:
-        units = block.channel_indexes[0].units
-        for unit in units:
-            if 'noise' not in unit.description.split() and 'unclassified' not in unit.description.split():
-                all_time_stamps.append(block.rec_datetime)
+def get_time_stamps(neodata):
+    all_time_stamps = [neodata.blocks[record.session].rec_datetime for record in neodata.channel_data.real_records]
 
     corrected_time_stamps = []
     for ts in all_time_stamps:
@@ -243,12 +214,12 @@ class SwanImplementation:
                                 'bin step': 60,
                                 'max_clusters': 20}
 
-        self.mean_waveforms = get_mean_waveforms(self.blocks)
-        self.all_waveforms = get_all_waveforms(self.blocks)
-        self.all_spiketrains = get_all_spiketrains(self.blocks)
-        self.timestamps = get_time_stamps(self.blocks)
-        self.unit_ids = get_real_unit_ids(self.blocks)
-        self.session_ids = get_session_ids(self.blocks)
+        self.mean_waveforms = get_mean_waveforms(neodata)
+        self.all_waveforms = get_all_waveforms(neodata)
+        self.all_spiketrains = get_all_spiketrains(neodata)
+        self.timestamps = get_time_stamps(neodata)
+        self.unit_ids = get_real_unit_ids(neodata)
+        self.session_ids = get_session_ids(neodata)
 
         self.pca = PCA(n_components=self.additional_dict['reduced mean dims'])
         self.pca.fit(np.vstack(self.all_waveforms))
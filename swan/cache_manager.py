@@ -0,0 +1,521 @@
+"""
+Created on Oct 18, 2026
+
+@author: SWAN authors and contributors
+
+In this module you can find the :class:`CacheManager` which decides
+where the cache entries of a session are stored and keeps track of
+them in a manifest.
+
+The name of a cache entry contains a fingerprint of the source files
+(path, size, modification time and optionally a content hash) and the
+cache schema version. A re-sorted file that keeps its name and two files
+with the same name in different directories therefore never share an entry.
+"""
+# system imports
+import json
+import hashlib
+import threading
+from contextlib import contextmanager
+from glob import glob
+from os import replace, getpid, walk, listdir
+from os.path import join, split, exists, isfile, abspath, getsize, getmtime
+from shutil import rmtree
+from time import time
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+# swan-specific imports
+from swan.columnar_io import ColumnarIO
+
+THUMBNAIL_DIR = "thumbnails"
+"""
+The subdirectory of the cache directory with the thumbnails of the overview,
+see :class:`swan.widgets.thumbnail_cache.ThumbnailCache`. It bounds the
+number of thumbnails itself, so they do not count towards the cache budget.
+
+"""
+
+ORPHAN_AGE = 24 * 3600
+"""
+The age in seconds after which cache entries that are not in the manifest
+are deleted. Entries are registered after a channel has been read, so
+younger ones may still belong to a running load.
+
+"""
+
+
+def source_files(filename):
+    """
+    Returns the files a session is read from.
+
+    Blackrock sessions are given without extension, only the .nev
+    file is read for the spike data. If there is no .nev file all files
+    of the file set are used.
+
+    **Arguments**
+
+        *filename* (string):
+            The session file.
+
+        **Returns**: list of string
+            The existing source files.
+
+    """
+    if isfile(filename):
+        return [filename]
+    elif isfile(filename + ".nev"):
+        return [filename + ".nev"]
+    return sorted(glob(filename + ".*"))
+
+
+def source_mtime(filename):
+    """
+    Returns the latest modification time of the source files of a session.
+
+    **Arguments**
+
+        *filename* (string):
+            The session file.
+
+        **Returns**: float or None
+            The modification time or None if there are no source files.
+
+    """
+    files = source_files(filename)
+    if not files:
+        return None
+    return max(getmtime(f) for f in files)
+
+
+def _directory_size(dirname):
+    """
+    Returns the size of all files in a directory.
+
+    """
+    size = 0
+    for root, dirs, files in walk(dirname):
+        size += sum(getsize(join(root, f)) for f in files)
+    return size
+
+
+class CacheManager(object):
+    """
+    A class to name the cache entries of sessions and to keep a manifest of them.
+
+    **Arguments**
+
+        *cache_dir* (string):
+            The cache directory.
+        *content_hash* (boolean):
+            Whether or not the content of the source files should be hashed.
+            This is slower, but also detects changes which keep the size
+            and the modification time.
+            Default: False.
+        *budget* (integer or None):
+            The maximum size of the cache in bytes. If the cache grows
+            beyond it, the least recently used entries will be deleted.
+            Default: None (no limit).
+
+    """
+
+    VERSION = 1
+    """
+    The version of the cache schema. Changing it invalidates all entries.
+
+    """
+
+    MANIFEST = "manifest.json"
+
+    LOCK = "manifest.lock"
+    """
+    The file that is locked while the manifest is changed, see :func:`_locked`.
+
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, cache_dir, content_hash=False, budget=None):
+        """
+        **Properties**
+
+            *cache_dir* (string):
+                The cache directory.
+            *content_hash* (boolean):
+                Whether or not the content of the source files is hashed.
+            *budget* (integer or None):
+                The maximum size of the cache in bytes.
+            *_keys* (dictionary):
+                The source keys of the sessions computed so far.
+            *_pinned* (dictionary):
+                The names of the entries that are in use, for example by the
+                loaded channel, under the name of their user, see :func:`pin`.
+
+        """
+        self.cache_dir = cache_dir
+        self.content_hash = content_hash
+        self.budget = budget
+        self._keys = {}
+        self._pinned = {}
+
+    def fingerprint(self, filename):
+        """
+        Computes the fingerprint of the source files of a session.
+
+        **Arguments**
+
+            *filename* (string):
+                The session file.
+
+            **Returns**: dictionary or None
+                The path, sizes, modification times and optionally
+                the content hash of the source files or None if there
+                are no source files.
+
+        """
+        files = source_files(filename)
+        if not files:
+            return None
+        fingerprint = {
+            "path": abspath(filename),
+            "files": [split(f)[1] for f in files],
+            "size": [getsize(f) for f in files],
+            "mtime": [getmtime(f) for f in files],
+            "hash": None,
+        }
+        previous = self._keys.get(fingerprint["path"])
+        if self.content_hash and previous is not None \
+                and all(previous[1].get(k) == fingerprint[k] for k in ("files", "size", "mtime")):
+            # hashing is slow, so the hash of unchanged files is reused
+            fingerprint["hash"] = previous[1].get("hash")
+        elif self.content_hash:
+            digest = hashlib.sha1()
+            for f in files:
+                with open(f, "rb") as fn:
+                    for chunk in iter(lambda: fn.read(2 ** 20), b""):
+                        digest.update(chunk)
+            fingerprint["hash"] = digest.hexdigest()
+        return fingerprint
+
+    def source_key(self, filename):
+        """
+        Returns the part of the entry names that identifies a session.
+
+        It consists of the base name of the session and a digest of its
+        fingerprint and the schema versions. If the source files do not exist
+        anymore, the key that was registered last for the session is used.
+
+        **Arguments**
+
+            *filename* (string):
+                The session file.
+
+            **Returns**: string
+                The source key.
+
+        """
+        fingerprint = self.fingerprint(filename)
+        if fingerprint is None:
+            source = self.read_manifest()["sources"].get(abspath(filename))
+            if source is not None:
+                self._keys[abspath(filename)] = (source["key"], source)
+                return source["key"]
+            fingerprint = {"path": abspath(filename)}
+
+        ident = json.dumps([fingerprint, self.VERSION, ColumnarIO.VERSION], sort_keys=True)
+        key = split(filename)[1] + "_" + hashlib.sha1(ident.encode()).hexdigest()[:16]
+        self._keys[abspath(filename)] = (key, fingerprint)
+        return key
+
+    def get_prefix(self, filename):
+        """
+        Returns the path of the cache entries of a session without the channel.
+
+        **Arguments**
+
+            *filename* (string):
+                The session file.
+
+            **Returns**: string
+                The path prefix of the cache entries.
+
+        """
+        return join(self.cache_dir, self.source_key(filename))
+
+    def read_manifest(self):
+        """
+        Reads the manifest of the cache directory.
+
+            **Returns**: dictionary
+                The sources and entries of the cache.
+
+        """
+        manifest = {"version": self.VERSION, "sources": {}, "entries": {}}
+        name = join(self.cache_dir, self.MANIFEST)
+        if exists(name):
+            try:
+                with open(name, "r") as f:
+                    stored = json.load(f)
+                if stored.get("version") == self.VERSION:
+                    manifest = stored
+            except (IOError, ValueError):
+                pass
+        return manifest
+
+    def write_manifest(self, manifest):
+        """
+        Writes the manifest of the cache directory.
+
+        The manifest is written to a temporary file first and
+        moved to its place afterwards.
+
+        **Arguments**
+
+            *manifest* (dictionary):
+                The sources and entries of the cache.
+
+        """
+        name = join(self.cache_dir, self.MANIFEST)
+        tmp = name + "." + str(getpid()) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(manifest, f)
+        replace(tmp, name)
+
+    @contextmanager
+    def _locked(self):
+        """
+        Holds the lock of the manifest while it is read, changed and written.
+
+        The cache directory is shared by the threads of this process, the
+        worker processes and other instances of the program, so besides the
+        thread lock the lock file in the cache directory is locked as well.
+
+        """
+        with self._lock:
+            with open(join(self.cache_dir, self.LOCK), "a+") as f:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                    else:
+                        f.seek(0)
+                        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def entry_names(self, sources):
+        """
+        Returns the names of the cache entries of sessions and channels.
+
+        **Arguments**
+
+            *sources* (dictionary):
+                The session files as keys and lists of channels as values.
+
+            **Returns**: list of string
+                The names of the entries.
+
+        """
+        return [self.source_key(filename) + "_" + str(channel)
+                for filename, channels in sources.items() for channel in channels]
+
+    def pin(self, owner, sources):
+        """
+        Protects the cache entries of sessions from being evicted.
+
+        The entries stay pinned until :func:`unpin` is called or
+        the same owner pins other entries.
+
+        **Arguments**
+
+            *owner* (hashable):
+                The name of the user of the entries, e.g. "loaded"
+                or ("loading", 3) for one of several loads.
+            *sources* (dictionary):
+                The session files as keys and lists of channels as values.
+
+        """
+        names = set(self.entry_names(sources))
+        with self._lock:
+            self._pinned[owner] = names
+
+    def unpin(self, owner):
+        """
+        Lets the cache entries pinned by an owner be evicted again.
+
+        **Arguments**
+
+            *owner* (hashable):
+                The name of the user of the entries.
+
+        """
+        with self._lock:
+            self._pinned.pop(owner, None)
+
+    def pinned(self):
+        """
+        Returns the names of all pinned cache entries.
+
+            **Returns**: set of string
+                The names of the entries.
+
+        """
+        return set().union(*self._pinned.values())
+
+    def register(self, sources):
+        """
+        Adds the cache entries of sessions to the manifest.
+
+        If a session was registered before with another fingerprint,
+        the entries of the old fingerprint are stale and will be removed.
+        The access times of the entries are updated and the least recently
+        used entries are deleted if the cache exceeds its budget.
+
+        **Arguments**
+
+            *sources* (dictionary):
+                The session files as keys and the lists of channels
+                whose entries have been written or read as values.
+
+        """
+        used = []
+        with self._locked():
+            manifest = self.read_manifest()
+            for filename, channels in sources.items():
+                path = abspath(filename)
+                if path not in self._keys:
+                    self.source_key(filename)
+                key, fingerprint = self._keys[path]
+
+                old = manifest["sources"].get(path)
+                if old is not None and old["key"] != key:
+                    self._remove_entries(manifest, [name for name, entry in manifest["entries"].items()
+                                                    if entry["source"] == path])
+                manifest["sources"][path] = dict(fingerprint, key=key)
+                for channel in channels:
+                    name = key + "_" + str(channel)
+                    entry = manifest["entries"].setdefault(name, {"created": time()})
+                    entry.update({"source": path, "channel": channel, "accessed": time()})
+                    if "size" not in entry:
+                        entry["size"] = _directory_size(join(self.cache_dir, name + ".col"))
+                    used.append(name)
+            self._evict(manifest, used)
+            self.write_manifest(manifest)
+
+    def _evict(self, manifest, used):
+        """
+        Deletes the least recently used entries until the cache fits into the budget.
+
+        Entries that are not in the manifest are swept first, see :func:`_sweep`.
+        Pinned entries are never deleted, see :func:`pin`.
+        It has to be called with the manifest locked, see :func:`_locked`.
+
+        **Arguments**
+
+            *manifest* (dictionary):
+                The manifest the entries are removed from.
+            *used* (list of string):
+                The names of the entries that are in use and must not be deleted.
+
+        """
+        self._sweep(manifest)
+        if not self.budget:
+            return
+        total = sum(entry.get("size", 0) for entry in manifest["entries"].values())
+        if total <= self.budget:
+            return
+        keep = set(used) | self.pinned()
+        candidates = sorted((entry.get("accessed", 0), name) for name, entry in manifest["entries"].items()
+                            if name not in keep)
+        evicted = []
+        for accessed, name in candidates:
+            if total <= self.budget:
+                break
+            total -= manifest["entries"][name].get("size", 0)
+            evicted.append(name)
+        self._remove_entries(manifest, evicted)
+
+    def _sweep(self, manifest):
+        """
+        Deletes the cache entries that are not in the manifest and the
+        temporary directories of interrupted writes once they are older
+        than :data:`ORPHAN_AGE`. They are left by cancelled loads and
+        prefetches and would otherwise never be evicted.
+
+        It has to be called with the manifest locked, see :func:`_locked`.
+
+        **Arguments**
+
+            *manifest* (dictionary):
+                The manifest with the registered entries.
+
+        """
+        keep = set(manifest["entries"]) | self.pinned()
+        now = time()
+        for name in listdir(self.cache_dir):
+            if name.endswith(".col"):
+                if name[:-len(".col")] in keep:
+                    continue
+            elif not name.startswith(".tmp_"):
+                continue
+            path = join(self.cache_dir, name)
+            try:
+                if now - getmtime(path) > ORPHAN_AGE:
+                    rmtree(path, ignore_errors=True)
+            except OSError:
+                # e.g. removed by another process
+                pass
+
+    def set_budget(self, budget):
+        """
+        Sets the maximum size of the cache and deletes entries if it is exceeded.
+
+        **Arguments**
+
+            *budget* (integer or None):
+                The maximum size of the cache in bytes.
+
+        """
+        self.budget = budget
+        with self._locked():
+            manifest = self.read_manifest()
+            self._evict(manifest, [])
+            self.write_manifest(manifest)
+
+    def usage(self):
+        """
+        Returns the size of all registered cache entries.
+
+        This is the size that is kept within the budget. The thumbnails
+        are not counted, see :data:`THUMBNAIL_DIR`.
+
+            **Returns**: integer
+                The size in bytes.
+
+        """
+        return sum(entry.get("size", 0) for entry in self.read_manifest()["entries"].values())
+
+    def _remove_entries(self, manifest, names):
+        """
+        Deletes cache entries from the disk and from the manifest.
+
+        **Arguments**
+
+            *manifest* (dictionary):
+                The manifest the entries are removed from.
+            *names* (list of string):
+                The names of the entries.
+
+        """
+        for name in names:
+            rmtree(join(self.cache_dir, name + ".col"), ignore_errors=True)
+            manifest["entries"].pop(name, None)
@@ -0,0 +1,222 @@
+"""
+Created on Oct 18, 2026
+
+@author: SWAN authors and contributors
+
+In this module you can find the :class:`ChannelData` which holds the
+units of one channel over all sessions in flat arrays.
+
+The neo structure (block > channel index > unit > spike train) is walked
+only once per loaded channel. Afterwards the spike times of all units are
+available as one concatenated array with offsets per unit (like the index
+pointer of a CSR matrix) and the session and unit indices as tables, so
+that the views and the mapping code do not have to traverse neo objects
+and split unit descriptions on every refresh.
+"""
+# system imports
+import numpy as np
+
+
+def is_real_unit(unit):
+    """
+    Checks whether a unit is a real unit and not noise or unclassified.
+
+    **Arguments**
+
+        *unit* (:class:`neo.core.unit.Unit`):
+            The unit.
+
+        **Returns**: boolean
+            Whether the unit is a real unit.
+
+    """
+    description = unit.description.split() if unit.description else []
+    return "noise" not in description and "unclassified" not in description
+
+
+class UnitRecord(object):
+    """
+    The record of one unit of a session.
+
+    **Arguments**
+
+        *session* (integer):
+            The index of the session.
+        *index* (integer):
+            The index of the unit in the channel index of the session.
+        *unit* (:class:`neo.core.unit.Unit`):
+            The neo unit.
+        *real* (boolean):
+            Whether the unit is a real unit and not noise or unclassified.
+        *start* (integer):
+            The offset of the first spike of the unit in the flat arrays.
+        *stop* (integer):
+            The offset after the last spike of the unit in the flat arrays.
+
+    """
+
+    __slots__ = ("session", "index", "unit", "real", "start", "stop")
+
+    def __init__(self, session, index, unit, real, start, stop):
+        self.session = session
+        self.index = index
+        self.unit = unit
+        self.real = real
+        self.start = start
+        self.stop = stop
+
+    @property
+    def n_spikes(self):
+        """
+        The number of spikes of the unit.
+
+        """
+        return self.stop - self.start
+
+
+class ChannelData(object):
+    """
+    The units of one channel over all sessions in flat arrays.
+
+    Only the first spike train of every unit is used, like everywhere else.
+
+    **Arguments**
+
+        *blocks* (list of :class:`neo.core.block.Block`):
+            The blocks of the channel in the order of the sessions.
+
+    """
+
+    def __init__(self, blocks):
+        """
+        **Properties**
+
+            *records* (list of :class:`UnitRecord`):
+                The records of all units, ordered by session and unit index.
+            *sessions* (list of list of :class:`UnitRecord`):
+                The records of all units per session.
+            *real_records* (list of :class:`UnitRecord`):
+                The records of the real units, ordered by session and unit index.
+            *units* (list of list of :class:`neo.core.unit.Unit`):
+                The real units per session.
+            *total_units_per_block* (list of integer):
+                The number of real units per session.
+            *spike_times* (numpy array):
+                The spike times of all units concatenated, each in the
+                units of its spike train.
+            *offsets* (numpy array of integer):
+                The offsets of the units into *spike_times*. The spikes of
+                the i-th record are spike_times[offsets[i]:offsets[i + 1]].
+            *session_ids* (numpy array of integer):
+                The session index of every record.
+            *unit_ids* (numpy array of integer):
+                The unit index of every record.
+            *real* (numpy array of boolean):
+                Whether the unit of every record is a real unit.
+            *_by_unit* (dictionary):
+                Maps the ids of the neo units to their records.
+            *_realunit_shift* (list of integer):
+                Per session, the difference between a virtual unit number
+                and the index of the unit, see :func:`get_realunit`.
+
+        """
+        self.records = []
+        self.sessions = []
+        times = []
+        offset = 0
+        for s, block in enumerate(blocks):
+            self.sessions.append([])
+            units = block.channel_indexes[0].units if block.channel_indexes else []
+            for u, unit in enumerate(units):
+                train = unit.spiketrains[0]
+                n = len(train)
+                record = UnitRecord(s, u, unit, is_real_unit(unit), offset, offset + n)
+                self.records.append(record)
+                self.sessions[s].append(record)
+                times.append(np.asarray(train.magnitude, dtype=np.float64))
+                offset += n
+
+        self.spike_times = np.concatenate(times) if times else np.empty(0)
+        self.offsets = np.array([0] + [record.stop for record in self.records], dtype=np.int64)
+        self.session_ids = np.array([record.session for record in self.records], dtype=np.int64)
+        self.unit_ids = np.array([record.index for record in self.records], dtype=np.int64)
+        self.real = np.array([record.real for record in self.records], dtype=bool)
+
+        self.real_records = [record for record in self.records if record.real]
+        self.units = [[record.unit for record in session if record.real] for session in self.sessions]
+        self.total_units_per_block = [len(units) for units in self.units]
+        self._by_unit = {id(record.unit): record for record in self.records}
+        # the virtual unit numbers count from 1, unless the first unit is the unclassified one
+        self._realunit_shift = [0 if session and session[0].unit.description
+                                and "unclassified" in session[0].unit.description.split() else 1
+                                for session in self.sessions]
+
+    def get_record(self, unit):
+        """
+        Returns the record of a neo unit.
+
+        **Arguments**
+
+            *unit* (:class:`neo.core.unit.Unit`):
+                The unit.
+
+            **Returns**: :class:`UnitRecord` or None
+                The record or None if the unit does not belong to the channel.
+
+        """
+        record = self._by_unit.get(id(unit))
+        if record is not None and record.unit is unit:
+            return record
+        return None
+
+    def get_spike_times(self, record):
+        """
+        Returns the spike times of a unit without copying them.
+
+        **Arguments**
+
+            *record* (:class:`UnitRecord`):
+                The record of the unit.
+
+            **Returns**: numpy array
+                The spike times in the units of the spike train.
+
+        """
+        return self.spike_times[record.start:record.stop]
+
+    def get_realunit(self, session, virtual_unit):
+        """
+        Returns the neo unit for a virtual unit number of a session.
+
+        **Arguments**
+
+            *session* (integer):
+                The session index.
+            *virtual_unit* (integer):
+                The number of the unit in the virtual unit map.
+
+            **Returns**: :class:`neo.core.unit.Unit`
+                The real unit.
+
+        """
+        return self.sessions[session][virtual_unit - self._realunit_shift[session]].unit
+
+    def is_real(self, session, index):
+        """
+        Checks whether a unit of a session is a real unit.
+
+        **Arguments**
+
+            *session* (integer):
+                The session index.
+            *index* (integer):
+                The unit index.
+
+            **Returns**: boolean
+                Whether the unit is a real unit.
+
+            **Raises**: IndexError
+                If there is no such unit.
+
+        """
+        return self.sessions[session][index].real
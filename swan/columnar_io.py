@@ -0,0 +1,540 @@
+"""
+Created on Oct 18, 2026
+
+@author: SWAN authors and contributors
+
+In this module you can find the :class:`ColumnarIO` which is used to
+cache neo blocks as flat numpy arrays.
+
+A cache entry is a directory which contains a small json manifest with the
+metadata of the block and one .npy file per array. All spike times of the
+block are concatenated into one array, and so are all waveforms. The
+spike trains only store their offsets into these arrays.
+
+The waveforms are opened as a read-only memory map, so reading a cached
+block costs almost no time and almost no resident memory. The waveforms
+of a unit are only paged in when they are accessed. In the lazy mode the
+spike trains only get a :class:`LazyWaveforms` reference and the waveforms
+are opened when they are needed for the first time.
+
+Each entry also stores a :class:`swan.unit_summary.UnitSummary` per spike
+train, which is attached to the spike trains as *summary* when reading.
+
+The waveforms can be stored compactly as float32 or as int16 with a
+scale factor per recording channel. They are converted back to float32
+only for the spike trains whose waveforms are read.
+"""
+# system imports
+import json
+from datetime import datetime
+from os import rename, makedirs, listdir
+from os.path import join, exists, split, getsize
+from shutil import rmtree
+from tempfile import mkdtemp
+import numpy as np
+import quantities as pq
+from neo.core import Block, Segment, ChannelIndex, Unit, SpikeTrain, Event
+
+# swan-specific imports
+from swan.unit_summary import UnitSummary
+
+
+class ColumnarIO(object):
+    """
+    A class to write neo blocks to and read neo blocks from a columnar cache entry.
+
+    The interface follows the neo IOs, so it can be used in place of
+    :class:`neo.io.pickleio.PickleIO`.
+
+    **Arguments**
+
+        *dirname* (string):
+            The directory of the cache entry.
+
+    """
+
+    VERSION = 3
+    """
+    The version of the on-disk layout. Entries with another version
+    are treated as not existing.
+
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, dirname):
+        """
+        **Properties**
+
+            *dirname* (string):
+                The directory of the cache entry.
+
+        """
+        self.dirname = dirname
+
+    def exists(self):
+        """
+        Checks if there is a complete cache entry with the current layout version.
+
+            **Returns**: boolean
+                Whether the entry can be read.
+
+        """
+        try:
+            return self.read_manifest()["version"] == self.VERSION
+        except (IOError, ValueError, KeyError):
+            return False
+
+    def read_manifest(self):
+        """
+        Reads the manifest of the cache entry.
+
+            **Returns**: dictionary
+                The metadata of the cached block.
+
+        """
+        with open(join(self.dirname, self.MANIFEST), "r") as f:
+            return json.load(f)
+
+    def write_block(self, block, waveform_dtype=None):
+        """
+        Writes a block to the cache entry.
+
+        The entry is written to a temporary directory first and moved
+        to its place afterwards, so that a half written entry is never read.
+
+        **Arguments**
+
+            *block* (:class:`neo.core.block.Block`):
+                The block that should be cached.
+            *waveform_dtype* (string or None):
+                How the waveforms should be stored. "float32" halves
+                the size of float64 waveforms, "int16" quarters it
+                by storing them with a scale factor per recording channel.
+                Default: None (the dtype of the waveforms is kept).
+
+        """
+        parent = split(self.dirname)[0]
+        makedirs(parent, exist_ok=True)
+        tmp = mkdtemp(dir=parent, prefix=".tmp_")
+
+        try:
+            manifest = {
+                "version": self.VERSION,
+                "block": {
+                    "name": block.name,
+                    "description": block.description,
+                    "file_origin": block.file_origin,
+                    "rec_datetime": block.rec_datetime.isoformat() if block.rec_datetime is not None else None,
+                    "annotations": _encode(block.annotations),
+                },
+                "segments": [],
+                "channel_indexes": [],
+                "spiketrains": [],
+            }
+
+            # events
+            event_times = []
+            event_labels = []
+            for segment in block.segments:
+                seg_entry = {"name": segment.name, "events": []}
+                for event in segment.events:
+                    seg_entry["events"].append({
+                        "name": event.name,
+                        "units": event.times.dimensionality.string,
+                        "n": len(event.times),
+                        "annotations": _encode(event.annotations),
+                    })
+                    event_times.append(np.asarray(event.times.magnitude, dtype=np.float64))
+                    event_labels.append(np.asarray(event.labels).astype(str))
+                manifest["segments"].append(seg_entry)
+
+            # units and their spike trains
+            spike_times = []
+            waveforms = []
+            has_waveforms = True
+            for c, channel_index in enumerate(block.channel_indexes):
+                chx_entry = {
+                    "name": channel_index.name,
+                    "index": np.asarray(channel_index.index).tolist(),
+                    "channel_ids": np.asarray(channel_index.channel_ids).tolist(),
+                    "units": [],
+                }
+                for u, unit in enumerate(channel_index.units):
+                    chx_entry["units"].append({
+                        "name": unit.name,
+                        "description": unit.description,
+                        "annotations": _encode(unit.annotations),
+                    })
+                    for train in unit.spiketrains:
+                        try:
+                            segment = [s for s, seg in enumerate(block.segments) if seg is train.segment][0]
+                        except IndexError:
+                            segment = None
+                        manifest["spiketrains"].append({
+                            "channel_index": c,
+                            "unit": u,
+                            "segment": segment,
+                            "n": len(train),
+                            "units": train.dimensionality.string,
+                            "t_start": float(train.t_start.rescale(train.units).magnitude),
+                            "t_stop": float(train.t_stop.rescale(train.units).magnitude),
+                            "sampling_rate": _encode(train.sampling_rate),
+                            "left_sweep": _encode(train.left_sweep),
+                            "waveform_units": (train.waveforms.dimensionality.string
+                                               if train.waveforms is not None else None),
+                            "annotations": _encode(train.annotations),
+                        })
+                        spike_times.append(np.asarray(train.magnitude, dtype=np.float64))
+                        if train.waveforms is None or train.waveforms.shape[0] != len(train):
+                            has_waveforms = False
+                        else:
+                            waveforms.append(train.waveforms.magnitude)
+                manifest["channel_indexes"].append(chx_entry)
+            manifest["has_waveforms"] = has_waveforms and len(waveforms) > 0
+
+            # the summaries are computed while the waveforms are in memory anyway
+            if manifest["has_waveforms"]:
+                summaries = [UnitSummary.compute(train) for channel_index in block.channel_indexes
+                             for unit in channel_index.units for train in unit.spiketrains]
+                np.save(join(tmp, "summary_mean.npy"), np.array([sm.mean for sm in summaries]))
+                np.save(join(tmp, "summary_std.npy"), np.array([sm.std for sm in summaries]))
+                np.save(join(tmp, "summary_extremes.npy"),
+                        np.array([[sm.minimum, sm.maximum] for sm in summaries], dtype=np.float64))
+                np.save(join(tmp, "summary_isi.npy"), _concatenate([sm.isi for sm in summaries], (0,), np.float64))
+                np.save(join(tmp, "summary_rate_profile.npy"), np.array([sm.rate_profile for sm in summaries]))
+                np.save(join(tmp, "summary_density.npy"), np.array([sm.density for sm in summaries]))
+
+            np.save(join(tmp, "spike_times.npy"), _concatenate(spike_times, (0,), np.float64))
+            np.save(join(tmp, "event_times.npy"), _concatenate(event_times, (0,), np.float64))
+            np.save(join(tmp, "event_labels.npy"), _concatenate(event_labels, (0,), str))
+            manifest["waveform_scale"] = None
+            if manifest["has_waveforms"]:
+                waveforms = np.concatenate(waveforms, axis=0)
+                if waveform_dtype == "int16":
+                    # the largest amplitude of every channel is mapped to the int16 range
+                    peak = np.max(np.abs(waveforms), axis=(0, 2)) if len(waveforms) else np.ones(waveforms.shape[1])
+                    scale = np.where(peak > 0, peak / np.iinfo(np.int16).max, 1.)
+                    waveforms = np.round(waveforms / scale[None, :, None]).astype(np.int16)
+                    manifest["waveform_scale"] = scale.tolist()
+                elif waveform_dtype is not None:
+                    waveforms = waveforms.astype(waveform_dtype)
+                np.save(join(tmp, "waveforms.npy"), waveforms)
+
+            # the manifest is written last, it marks the entry as complete
+            with open(join(tmp, self.MANIFEST), "w") as f:
+                json.dump(manifest, f)
+
+            if exists(self.dirname):
+                rmtree(self.dirname, ignore_errors=True)
+            try:
+                rename(tmp, self.dirname)
+            except OSError:
+                # another process has written the same entry in the meantime
+                if not self.exists():
+                    raise
+                rmtree(tmp, ignore_errors=True)
+        except BaseException:
+            rmtree(tmp, ignore_errors=True)
+            raise
+
+    def nbytes(self, waveforms=True):
+        """
+        Returns the size of the arrays of the cache entry.
+
+        **Arguments**
+
+            *waveforms* (boolean):
+                Whether or not the size of the waveforms should be included.
+                Default: True.
+
+            **Returns**: integer
+                The size in bytes.
+
+        """
+        return sum(getsize(join(self.dirname, f)) for f in listdir(self.dirname)
+                   if f.endswith(".npy") and (waveforms or f != "waveforms.npy"))
+
+    def read_block(self, load_waveforms=True, mmap=True, lazy=False):
+        """
+        Reads the block from the cache entry.
+
+        **Arguments**
+
+            *load_waveforms* (boolean):
+                Whether or not the memory mapped waveforms should
+                be attached to the spike trains.
+                Default: True.
+            *mmap* (boolean):
+                Whether the waveforms should be memory mapped or
+                read into memory.
+                Default: True.
+            *lazy* (boolean):
+                Whether the waveforms should be left out and only
+                be referenced by a :class:`LazyWaveforms` object
+                in the *lazy_waveforms* attribute of the spike trains.
+                Default: False.
+
+            **Returns**: :class:`neo.core.block.Block`
+                The cached block.
+
+        """
+        manifest = self.read_manifest()
+        b = manifest["block"]
+
+        rec_datetime = datetime.fromisoformat(b["rec_datetime"]) if b["rec_datetime"] is not None else None
+        block = Block(name=b["name"], description=b["description"], file_origin=b["file_origin"],
+                      rec_datetime=rec_datetime, **_decode(b["annotations"]))
+
+        # events
+        event_times = np.load(join(self.dirname, "event_times.npy"))
+        event_labels = np.load(join(self.dirname, "event_labels.npy"))
+        offset = 0
+        for seg_entry in manifest["segments"]:
+            segment = Segment(name=seg_entry["name"])
+            for ev in seg_entry["events"]:
+                n = ev["n"]
+                event = Event(times=event_times[offset:offset + n], units=ev["units"],
+                              labels=event_labels[offset:offset + n], name=ev["name"],
+                              **_decode(ev["annotations"]))
+                event.segment = segment
+                segment.events.append(event)
+                offset += n
+            segment.block = block
+            block.segments.append(segment)
+
+        # units
+        units = []
+        for chx_entry in manifest["channel_indexes"]:
+            channel_index = ChannelIndex(index=np.array(chx_entry["index"], dtype=int),
+                                         channel_ids=np.array(chx_entry["channel_ids"], dtype=int),
+                                         name=chx_entry["name"])
+            units.append([])
+            for unit_entry in chx_entry["units"]:
+                unit = Unit(name=unit_entry["name"], description=unit_entry["description"],
+                            **_decode(unit_entry["annotations"]))
+                unit.channel_index = channel_index
+                channel_index.units.append(unit)
+                units[-1].append(unit)
+            channel_index.block = block
+            block.channel_indexes.append(channel_index)
+
+        # spike trains
+        spike_times = np.load(join(self.dirname, "spike_times.npy"))
+        waveforms = None
+        shape = None
+        scale = manifest.get("waveform_scale")
+        if lazy and manifest["has_waveforms"]:
+            # only the header is read here, the int16 waveforms are not scaled
+            shape = self.read_waveforms(scaled=False).shape[1:]
+        elif load_waveforms and manifest["has_waveforms"]:
+            waveforms = self.read_waveforms(mmap, scaled=False)
+        summaries = self.read_summaries() if manifest["has_waveforms"] else None
+        offset = 0
+        for i, st in enumerate(manifest["spiketrains"]):
+            n = st["n"]
+            if waveforms is not None:
+                wforms = pq.Quantity(_scale(waveforms[offset:offset + n], scale), st["waveform_units"], copy=False)
+            else:
+                wforms = None
+            train = SpikeTrain(spike_times[offset:offset + n], units=st["units"],
+                               t_start=st["t_start"], t_stop=st["t_stop"],
+                               sampling_rate=_decode(st["sampling_rate"]), left_sweep=_decode(st["left_sweep"]),
+                               copy=False, **_decode(st["annotations"]))
+            # assigned afterwards, so that neo does not copy the memory map
+            train.waveforms = wforms
+            if shape is not None:
+                train.lazy_waveforms = LazyWaveforms(self.dirname, offset, n, st["waveform_units"], shape, scale)
+            if summaries is not None:
+                train.summary = summaries[i]
+            unit = units[st["channel_index"]][st["unit"]]
+            train.unit = unit
+            unit.spiketrains.append(train)
+            if st["segment"] is not None:
+                segment = block.segments[st["segment"]]
+                train.segment = segment
+                segment.spiketrains.append(train)
+            offset += n
+
+        return block
+
+    def read_summaries(self):
+        """
+        Reads the summaries of all spike trains.
+
+            **Returns**: list of :class:`swan.unit_summary.UnitSummary`
+                The summaries in the order of the spike trains.
+
+        """
+        manifest = self.read_manifest()
+        mean = np.load(join(self.dirname, "summary_mean.npy"))
+        std = np.load(join(self.dirname, "summary_std.npy"))
+        extremes = np.load(join(self.dirname, "summary_extremes.npy"))
+        isi = np.load(join(self.dirname, "summary_isi.npy"))
+        profiles = np.load(join(self.dirname, "summary_rate_profile.npy"))
+        densities = np.load(join(self.dirname, "summary_density.npy"))
+
+        summaries = []
+        offset = 0
+        for i, st in enumerate(manifest["spiketrains"]):
+            n = max(st["n"] - 1, 0)
+            summaries.append(UnitSummary(mean[i], std[i], extremes[i], isi[offset:offset + n], profiles[i],
+                                         densities[i]))
+            offset += n
+        return summaries
+
+    def read_waveforms(self, mmap=True, scaled=True):
+        """
+        Opens the waveforms of all spike trains as one read-only memory map.
+
+        **Arguments**
+
+            *mmap* (boolean):
+                Whether the waveforms should be memory mapped or
+                read into memory.
+                Default: True.
+            *scaled* (boolean):
+                Whether int16 waveforms should be converted to float32.
+                This reads all of them into memory.
+                Default: True.
+
+            **Returns**: :class:`numpy.memmap` or :class:`numpy.ndarray`
+                The waveforms of shape (total number of spikes, channels, samples).
+
+        """
+        waveforms = np.load(join(self.dirname, "waveforms.npy"), mmap_mode="r" if mmap else None)
+        if scaled:
+            return _scale(waveforms, self.read_manifest().get("waveform_scale"))
+        return waveforms
+
+
+class LazyWaveforms(object):
+    """
+    A reference to the waveforms of one spike train in a cache entry.
+
+    **Arguments**
+
+        *dirname* (string):
+            The directory of the cache entry.
+        *offset* (integer):
+            The index of the first waveform of the spike train.
+        *n* (integer):
+            The number of waveforms of the spike train.
+        *units* (string):
+            The units of the waveforms.
+        *shape* (tuple of integer):
+            The shape of one waveform (channels, samples).
+        *scale* (list of float or None):
+            The scale factors of int16 waveforms per channel.
+            Default: None.
+
+    """
+
+    def __init__(self, dirname, offset, n, units, shape, scale=None):
+        """
+        **Properties**
+
+            *dirname* (string):
+                The directory of the cache entry.
+            *offset* (integer):
+                The index of the first waveform of the spike train.
+            *n* (integer):
+                The number of waveforms of the spike train.
+            *units* (string):
+                The units of the waveforms.
+            *shape* (tuple of integer):
+                The shape of all waveforms (spikes, channels, samples).
+            *scale* (list of float or None):
+                The scale factors of int16 waveforms per channel.
+
+        """
+        self.dirname = dirname
+        self.offset = offset
+        self.n = n
+        self.units = units
+        self.shape = (n,) + tuple(shape)
+        self.scale = scale
+
+    def load(self, mmap=True):
+        """
+        Reads the waveforms.
+
+        **Arguments**
+
+            *mmap* (boolean):
+                Whether the waveforms should be memory mapped or
+                read into memory.
+                Default: True.
+
+            **Returns**: :class:`quantities.Quantity`
+                The waveforms of shape (spikes, channels, samples).
+
+        """
+        waveforms = ColumnarIO(self.dirname).read_waveforms(mmap, scaled=False)[self.offset:self.offset + self.n]
+        if not mmap and self.scale is None:
+            waveforms = np.array(waveforms)
+        return pq.Quantity(_scale(waveforms, self.scale), self.units, copy=False)
+
+
+def _scale(waveforms, scale):
+    """
+    Converts int16 waveforms to float32 with their scale factors per channel.
+    Other waveforms are returned unchanged.
+
+    """
+    if scale is None:
+        return waveforms
+    return waveforms.astype(np.float32) * np.asarray(scale, dtype=np.float32)[None, :, None]
+
+
+def _concatenate(arrays, empty_shape, dtype):
+    """
+    Concatenates arrays and returns an empty array if there are none.
+
+    """
+    if arrays:
+        return np.concatenate(arrays)
+    return np.empty(empty_shape, dtype=dtype)
+
+
+def _encode(value):
+    """
+    Converts annotations into something that can be written to json.
+
+    Quantities are stored together with their units, so that they can be
+    restored by :func:`_decode`. Everything that is not understood is
+    stored as a string.
+
+    """
+    if isinstance(value, pq.Quantity):
+        return {"__quantity__": value.magnitude.tolist(), "units": value.dimensionality.string}
+    elif isinstance(value, np.ndarray):
+        return value.tolist()
+    elif isinstance(value, np.generic):
+        return value.item()
+    elif isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    elif isinstance(value, dict):
+        return {str(k): _encode(v) for k, v in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    elif value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    else:
+        return str(value)
+
+
+def _decode(value):
+    """
+    Restores annotations written by :func:`_encode`.
+
+    """
+    if isinstance(value, dict):
+        if "__quantity__" in value:
+            return pq.Quantity(value["__quantity__"], value["units"])
+        elif "__datetime__" in value:
+            return datetime.fromisoformat(value["__datetime__"])
+        return {k: _decode(v) for k, v in value.items()}
+    elif isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
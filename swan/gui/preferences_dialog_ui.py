@@ -96,6 +96,23 @@ class Ui_Preferences(object):
         self.label_6.setObjectName(_fromUtf8("label_6"))
         self.gridLayout.addWidget(self.label_6, 0, 0, 1, 1)
         
+        self.label_7 = QtGui.QLabel(self.groupBox_4)
+        self.label_7.setObjectName(_fromUtf8("label_7"))
+        self.gridLayout.addWidget(self.label_7, 1, 0, 1, 1)
+        
+        self.cacheSizeEdit = QtGui.QLineEdit(self.groupBox_4)
+        self.cacheSizeEdit.setMaximumSize(QtCore.QSize(100, 16777215))
+        self.cacheSizeEdit.setObjectName(_fromUtf8("cacheSizeEdit"))
+        self.gridLayout.addWidget(self.cacheSizeEdit, 1, 1, 1, 1)
+        
+        self.label_8 = QtGui.QLabel(self.groupBox_4)
+        self.label_8.setObjectName(_fromUtf8("label_8"))
+        self.gridLayout.addWidget(self.label_8, 2, 0, 1, 1)
+        
+        self.cacheUsageLabel = QtGui.QLabel(self.groupBox_4)
+        self.cacheUsageLabel.setObjectName(_fromUtf8("cacheUsageLabel"))
+        self.gridLayout.addWidget(self.cacheUsageLabel, 2, 1, 1, 2)
+        
         self.verticalLayout_2.addWidget(self.groupBox_4)
         
         self.optionsView.addWidget(self.general)
@@ -188,6 +205,18 @@ class Ui_Preferences(object):
         
         self.verticalLayout_3.addWidget(self.groupBox_3)
         
+        self.groupBox_5 = QtGui.QGroupBox(self.overview)
+        self.groupBox_5.setObjectName(_fromUtf8("groupBox_5"))
+        
+        self.verticalLayout_5 = QtGui.QVBoxLayout(self.groupBox_5)
+        self.verticalLayout_5.setObjectName(_fromUtf8("verticalLayout_5"))
+        
+        self.tiledOverviewCheck = QtGui.QCheckBox(self.groupBox_5)
+        self.tiledOverviewCheck.setObjectName(_fromUtf8("tiledOverviewCheck"))
+        self.verticalLayout_5.addWidget(self.tiledOverviewCheck)
+        
+        self.verticalLayout_3.addWidget(self.groupBox_5)
+        
         self.optionsView.addWidget(self.overview)
         
         self.horizontalLayout_3.addWidget(self.optionsView)
@@ -217,6 +246,7 @@ class Ui_Preferences(object):
         
         self.label.setBuddy(self.projectNameEdit)
         self.label_6.setBuddy(self.cacheDirEdit)
+        self.label_7.setBuddy(self.cacheSizeEdit)
         self.label_2.setBuddy(self.zinStepEdit)
         self.label_3.setBuddy(self.zoutStepEdit)
         self.label_4.setBuddy(self.expandStepEdit)
@@ -247,11 +277,15 @@ class Ui_Preferences(object):
         self.groupBox_4.setTitle(QtGui.QApplication.translate("Preferences", "Cache", None))
         self.cacheDirBtn.setText(QtGui.QApplication.translate("Preferences", "browse...", None))
         self.label_6.setText(QtGui.QApplication.translate("Preferences", "Location:", None))
+        self.label_7.setText(QtGui.QApplication.translate("Preferences", "Size limit (GB, 0 = none):", None))
+        self.label_8.setText(QtGui.QApplication.translate("Preferences", "Used:", None))
         self.groupBox_2.setTitle(QtGui.QApplication.translate("Preferences", "Resizing", None))
         self.label_2.setText(QtGui.QApplication.translate("Preferences", "Zoom in step:", None))
         self.label_3.setText(QtGui.QApplication.translate("Preferences", "Zoom out step:", None))
         self.groupBox_3.setTitle(QtGui.QApplication.translate("Preferences", "Reranging", None))
         self.label_4.setText(QtGui.QApplication.translate("Preferences", "Expand step:", None))
         self.label_5.setText(QtGui.QApplication.translate("Preferences", "Collapse step:", None))
+        self.groupBox_5.setTitle(QtGui.QApplication.translate("Preferences", "Drawing", None))
+        self.tiledOverviewCheck.setText(QtGui.QApplication.translate("Preferences", "Draw the overview as one scene (after restart)", None))
         self.defaultBtn.setText(QtGui.QApplication.translate("Preferences", "Restore default", None))
 
@@ -28,6 +28,7 @@ from swan.gui.main_ui import MainUI
 from swan.widgets.file_dialog import File_Dialog
 from swan.widgets.preferences_dialog import Preferences_Dialog
 from swan.storage import MyStorage
+from swan.widgets.thumbnail_cache import ThumbnailCache
 from swan.views.virtual_units_view import VirtualUnitsView
 from swan.export import Export
 
@@ -149,6 +150,7 @@ class Main(QtWidgets.QMainWindow):
         self._CACHEDIR = join(home_dir, "swan", "cache")
         self._current_dirty = False
         self._global_dirty = False
+        self._on_loaded = None
         self._preferences = None
         self._PREFS = {"projectName": "swan.txt",
                        "zinStep": 20.0,
@@ -156,13 +158,17 @@ class Main(QtWidgets.QMainWindow):
                        "zoutStep": 20.0,
                        "expandStep": 5,
                        "collapseStep": 5,
+                       "cacheSize": 0.0,
+                       "tiledOverview": False,
                        }
         self._prodir = join(home_dir, "swan")
 
         # preferences have to be present for the base.
         self.load_preferences()
+        self.ui.plotGrid.set_tiled(self._preferences["tiledOverview"])
 
-        self._my_storage = MyStorage(program_dir, self._preferences["cacheDir"])
+        self._my_storage = MyStorage(program_dir, self._preferences["cacheDir"], self.get_cache_budget())
+        self.thumbnails = ThumbnailCache(self._preferences["cacheDir"])
         # }
         self.setWindowTitle(title)
 
@@ -173,9 +179,14 @@ class Main(QtWidgets.QMainWindow):
 
         # connect loading progress
         self._my_storage.progress.connect(self.set_progress)
+        self._my_storage.ingested.connect(self.on_ingested)
+        self._my_storage.ingest_failed.connect(self.on_ingest_failed)
+        self._my_storage.channel_loaded.connect(self.on_channel_loaded)
+        self._my_storage.channel_failed.connect(self.on_channel_failed)
 
         # shortcut reference
         self.plots = self.ui.plotGrid.child
+        self.plots.set_thumbnail_cache(self.thumbnails)
         self.selector = self.ui.tools.selector
         self.virtual_units_view = self.ui.virtual_units_view
 
@@ -251,15 +262,9 @@ class Main(QtWidgets.QMainWindow):
 
                 success = self._my_storage.load_project(self._prodir, self._preferences["projectName"], channel, files)
 
-                if success and self.do_channel(self._my_storage.get_channel(), self._my_storage.get_last_channel()):
-                    files_str = self._my_storage.get_files(as_string=True, only_basenames=True)
-
-                    self.save_project()
-                    self.update_project()
-                    self.reset_dirty()
-                    self.selector.select_only(self._my_storage.get_channel())
-                    self.set_status("Created new project successfully.")
-                else:
+                # the project is saved when the channel has been loaded
+                if not (success and self.do_channel(self._my_storage.get_channel(),
+                                                    on_loaded=self.on_project_created)):
                     self.set_status("No files given. Nothing loaded.")
 
     @QtCore.pyqtSlot(name="")
@@ -285,14 +290,9 @@ class Main(QtWidgets.QMainWindow):
 
                 success = self._my_storage.load_project(prodir, proname, channel)
 
-                if success and self.do_channel(self._my_storage.get_channel(), self._my_storage.get_last_channel()):
-                    self.save_project()
-                    self.update_project()
-                    self.reset_dirty()
-                    self.find_saved()
-                    self.selector.select_only(self._my_storage.get_channel())
-                    self.set_status("Loaded project successfully.")
-                else:
+                # the project is saved when the channel has been loaded
+                if not (success and self.do_channel(self._my_storage.get_channel(),
+                                                    on_loaded=self.on_project_loaded)):
                     self.set_status("No files given. Nothing loaded.")
 
     @QtCore.pyqtSlot(name="")
@@ -568,12 +568,14 @@ class Main(QtWidgets.QMainWindow):
         to view and change the preferences.
         
         """
-        dia = Preferences_Dialog(self._preferences.copy(), self._PREFS.copy())
+        dia = Preferences_Dialog(self._preferences.copy(), self._PREFS.copy(), self._my_storage.get_cache_usage())
         if dia.exec_():
             pref = dia.get_preferences()
             self._preferences = pref
             self.save_preferences()
             self._my_storage.set_cache_dir(pref["cacheDir"])
+            self.thumbnails.set_cache_dir(pref["cacheDir"])
+            self._my_storage.set_cache_budget(self.get_cache_budget())
 
     @QtCore.pyqtSlot(name="")
     def on_action_tutorials_triggered(self):
@@ -628,22 +630,30 @@ class Main(QtWidgets.QMainWindow):
 
         self.saved_gui_state = self.saveState()
 
-    def do_channel(self, channel, lastchannel, automatic_mapping=0):
+    def do_channel(self, channel, automatic_mapping=0, on_loaded=None):
         """
-        Loads the data from the given electrode and plots it.
+        Starts loading the data from the given electrode.
+        
+        The loading runs in the background, the data is plotted
+        by :func:`on_channel_loaded`. If another channel is still loading,
+        that load is abandoned. The actions that change the mapping
+        are disabled until then, because the mapping of the channel
+        that is shown meanwhile will be replaced.
         
         **Arguments**
         
             *channel* (integer):
                 The electrode channel that will be loaded.
-            *lastchannel* (integer):
-                The channel that was loaded before.
+            *on_loaded* (function or None):
+                A function without arguments which is called
+                after the channel has been plotted.
+                Default: None.
         
             **Returns**: boolean
                 Whether or not there was something to load for the electrode.
         
         """
-        if self._my_storage.has_project() and not self._my_storage.is_loading():
+        if self._my_storage.has_project():
             # initialize the progress bar
             self.progress_bar.setValue(0)
             self.progress_bar.show()
@@ -654,44 +664,150 @@ class Main(QtWidgets.QMainWindow):
             self.memorytask.stop_timer()
             self.set_status("Loading... This may take a while...", 0)
 
-            QtWidgets.QApplication.setOverrideCursor(QtGui.QCursor(QtCore.Qt.WaitCursor))
-
-            # checking if the last channel's mapping was dirty
-            if self._current_dirty:
-                self.selector.set_dirty(lastchannel, True)
+            if QtWidgets.QApplication.overrideCursor() is None:
+                QtWidgets.QApplication.setOverrideCursor(QtGui.QCursor(QtCore.Qt.WaitCursor))
 
-            self._current_dirty = self.selector.get_item(channel).dirty
+            # a follow-up of an abandoned load is still due
+            if on_loaded is not None:
+                self._on_loaded = on_loaded
 
             # loading
-            (n, m) = self._my_storage.load_channel(channel)
+            self.set_mapping_actions_enabled(False)
+            self.show_preview(channel)
+            self._my_storage.load_channel(channel)
+            return True
+        return False
 
-            # plotting
+    def set_mapping_actions_enabled(self, enabled):
+        """
+        Enables or disables the actions that change the mapping of the loaded channel.
+        
+        **Arguments**
+        
+            *enabled* (boolean):
+                Whether or not the actions can be used.
+        
+        """
+        for action in (self.ui.action_recalculate_mapping, self.ui.action_revert_mapping, self.ui.action_swap):
+            action.setEnabled(enabled)
+
+    def show_preview(self, channel):
+        """
+        Paints the overview of a channel from the cached thumbnails
+        while the channel is loading, if it has been plotted before.
+        
+        **Arguments**
+        
+            *channel* (integer):
+                The channel that is loading.
+        
+        """
+        data = self._my_storage.get_data()
+        sources = [data.cache.source_key(f) for f in self._my_storage.get_files()]
+        layout = self.thumbnails.get_layout(sources, channel)
+        if layout is not None:
             self.plots.reset_selection()
-            data = self._my_storage.get_data()
-            self.plots.make_plots(n, m, data.get_dates())
+            self.plots.show_layout(layout)
 
-            if any(data.total_units_per_block):
-                min0, max0 = data.get_yscale()
-            else:
-                min0, max0 = [-100, 100]
-            self.plots.set_yranges(min0, max0)
+    def on_channel_loaded(self, channel, n, m):
+        """
+        This method is called when a channel has been loaded.
+        
+        Plots the data of the channel.
+        
+        **Arguments**
+        
+            *channel* (integer):
+                The loaded channel.
+            *n* (integer):
+                The number of unit rows.
+            *m* (integer):
+                The number of sessions.
+        
+        """
+        # checking if the last channel's mapping was dirty
+        if self._current_dirty:
+            self.selector.set_dirty(self._my_storage.get_last_channel(), True)
 
-            self.plot_all()
+        self._current_dirty = self.selector.get_item(channel).dirty
 
-            self.ui.set_program_title(self, self._preferences["projectName"] + " | " + "Channel " + str(
-                channel) + " | " + title)
+        self.plot_channel(n, m)
 
-            # setting tooltips
-            self.plots.set_tooltips(self._my_storage.get_tooltips())
+        self.ui.set_program_title(self, self._preferences["projectName"] + " | " + "Channel " + str(
+            channel) + " | " + title)
 
-            self.progress_bar.hide()
-            QtWidgets.QApplication.restoreOverrideCursor()
-            self.memorytask.start_timer()
-            return True
+        self.progress_bar.hide()
+        QtWidgets.QApplication.restoreOverrideCursor()
+        self.memorytask.start_timer()
+        self.set_mapping_actions_enabled(True)
+
+        on_loaded, self._on_loaded = self._on_loaded, None
+        if on_loaded is not None:
+            on_loaded()
+
+        # the user will probably move to a neighbouring channel next
+        self._my_storage.prefetch(self.selector.get_likely_channels(channel))
+
+    def plot_channel(self, n, m):
+        """
+        Creates the overview of the loaded channel and plots everything.
+        
+        **Arguments**
+        
+            *n* (integer):
+                The number of unit rows.
+            *m* (integer):
+                The number of sessions.
+        
+        """
+        self.plots.reset_selection()
+        data = self._my_storage.get_data()
+        self.plots.make_plots(n, m, data.get_dates())
 
-        elif self._my_storage.is_loading():
+        if any(data.total_units_per_block):
+            min0, max0 = data.get_yscale()
+        else:
+            min0, max0 = [-100, 100]
+        self.plots.set_yranges(min0, max0)
+
+        self.plot_all()
+
+        # setting tooltips
+        self.plots.set_tooltips(self._my_storage.get_tooltips())
+
+    def on_channel_failed(self, channel, message):
+        """
+        This method is called when a channel could not be loaded.
+        
+        Restores the user interface and shows the channel
+        that is still loaded instead of the preview.
+        
+        **Arguments**
+        
+            *channel* (integer):
+                The channel that could not be loaded.
+            *message* (string):
+                The error message.
+        
+        """
+        self.progress_bar.hide()
+        QtWidgets.QApplication.restoreOverrideCursor()
+        self.memorytask.start_timer()
+        self.set_mapping_actions_enabled(True)
+        # the follow-up of the load is dropped
+        self._on_loaded = None
+
+        data = self._my_storage.get_data()
+        if data.blocks:
             self.selector.select_only(self._my_storage.get_channel())
-            return False
+            self.plot_channel(sum(data.total_units_per_block), len(self._my_storage.get_map().mapping))
+        else:
+            self.plots.reset_selection()
+            self.plots.make_plots(0, 0)
+
+        self.set_status("Channel " + str(channel) + " could not be loaded.")
+        QtWidgets.QMessageBox.critical(None, "Loading error",
+                                       "Channel " + str(channel) + " could not be loaded!\n\n" + message)
 
     def plot_all(self, i=None, j=None, visible=False):
         """
@@ -727,6 +843,55 @@ class Main(QtWidgets.QMainWindow):
 
             QtWidgets.QApplication.restoreOverrideCursor()
 
+    def on_project_created(self):
+        """
+        This method is called when the first channel of a new project has been loaded.
+        
+        Saves the project and starts caching all other channels.
+        
+        """
+        self.save_project()
+        self.update_project()
+        self.reset_dirty()
+        self.selector.select_only(self._my_storage.get_channel())
+        self.set_status("Created new project successfully.")
+
+        # cache all other channels while the user is working
+        self._my_storage.ingest()
+
+    def on_project_loaded(self):
+        """
+        This method is called when the first channel of a loaded project has been loaded.
+        
+        """
+        self.save_project()
+        self.update_project()
+        self.reset_dirty()
+        self.find_saved()
+        self.selector.select_only(self._my_storage.get_channel())
+        self.set_status("Loaded project successfully.")
+
+    def on_ingested(self):
+        """
+        This method is called when all channels of the project have been cached.
+        
+        """
+        self.set_status("All channels have been cached.")
+
+    def on_ingest_failed(self, message):
+        """
+        This method is called when some channels of the project could not be cached.
+        
+        They are read from the session files when they are loaded.
+        
+        **Arguments**
+        
+            *message* (string):
+                The error message.
+        
+        """
+        self.set_status("Not all channels could be cached: " + message.replace("\n", "; "))
+
     def refresh_views(self):
 
         if self._my_storage.has_project():
@@ -858,6 +1023,7 @@ class Main(QtWidgets.QMainWindow):
         """
         self._current_dirty = False
         self._global_dirty = False
+        self._on_loaded = None
         self.selector.reset_dirty()
 
     def find_saved(self):
@@ -946,10 +1112,23 @@ class Main(QtWidgets.QMainWindow):
         name = join(self._program_dir, "data", "preferences.pkl")
         if exists(name):
             prefs = pkl.load(open(name, "rb"))
-            self._preferences = prefs
+            # preferences that were added later get their default value
+            self._preferences = dict(self._PREFS, **prefs)
         else:
             self._preferences = self._PREFS.copy()
 
+    def get_cache_budget(self):
+        """
+        Converts the cache size preference to a budget in bytes.
+        
+            **Returns**: integer or None
+                The maximum size of the cache directory in bytes
+                or None if the size is not limited.
+        
+        """
+        budget = int(float(self._preferences["cacheSize"]) * 2 ** 30)
+        return budget if budget > 0 else None
+
     def save_preferences(self):
         """
         Writes the preferences to a file.
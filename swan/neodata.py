@@ -11,15 +11,314 @@ After loading you can get different data for the units.
 This class works together with the :class:`src.virtualunitmap.VirtualUnitMap`.
 """
 import gc
+import threading
+from collections import OrderedDict
 from itertools import chain
+from multiprocessing import get_context
+from neo.core import Block
 from neo.io.blackrockio_v4 import BlackrockIO
 from neo.io.pickleio import PickleIO
 import numpy as np
 from numpy.linalg import norm
-from os.path import join, split, exists
+from os import cpu_count
+from os.path import join, split, exists, getmtime, getsize
+import psutil
 from PyQt5.QtCore import QObject, pyqtSignal
 import quantities as pq
-from scipy.signal import filtfilt, butter
+
+# swan-specific imports
+from swan.cache_manager import CacheManager, source_mtime
+from swan.channel_data import ChannelData
+from swan.columnar_io import ColumnarIO
+from swan.unit_summary import UnitSummary, RATE_PROFILE, rate_profile, intervals, waveform_moments, waveform_density
+
+INGEST_MEMORY_FACTOR = 8
+"""
+The estimated memory needed to ingest a session as a multiple of its file size,
+because the waveforms are read as float64 together with the neo objects.
+
+"""
+
+
+def get_cache_name(cache_prefix, channel):
+    """
+    Returns the path of the cache entry of a session and a channel.
+
+    **Arguments**
+
+        *cache_prefix* (string):
+            The path of the cache entries of the session without the channel,
+            see :func:`swan.cache_manager.CacheManager.get_prefix`.
+        *channel* (integer):
+            The channel.
+
+        **Returns**: string
+            The path of the cache entry.
+
+    """
+    return cache_prefix + "_" + str(channel) + ".col"
+
+
+def read_session(filename, channel, cache_prefix):
+    """
+    Reads one session for the given channel without using the columnar cache.
+
+    Sessions that were cached by older versions in a pickle file
+    are read with the :class:`neo.io.pickleio.PickleIO`, as long as
+    the pickle file is newer than the session file. All others are read
+    with the :class:`neo.io.BlackrockIO`.
+
+    **Arguments**
+
+        *filename* (string):
+            The session file that should be read.
+        *channel* (integer):
+            The channel that should be read.
+        *cache_prefix* (string):
+            The path of the cache entries of the session without the channel.
+
+        **Returns**: :class:`neo.core.block.Block`
+            The read block.
+
+    """
+    pickle_name = join(split(cache_prefix)[0], split(filename)[1] + "_" + str(channel) + ".pkl")
+    mtime = source_mtime(filename)
+    if exists(pickle_name) and (mtime is None or getmtime(pickle_name) >= mtime):
+        pIO = PickleIO(pickle_name)
+        block = pIO.read_block()
+    else:
+        session = BlackrockIO(filename)
+        block = session.read_block(index=None, name=None, description=None, nsx_to_load='none',
+                                   n_starts=None, n_stops=None, channels=channel, units='all',
+                                   load_waveforms=True, load_events=True, lazy=False, cascade=True)
+        del session
+    return block
+
+
+def cache_session(filename, channel, cache_prefix, waveform_dtype=None):
+    """
+    Reads one session for the given channel and writes it to the columnar cache.
+
+    This is a module level function so that it can be run
+    in a worker process.
+
+    **Arguments**
+
+        *filename* (string):
+            The session file that should be cached.
+        *channel* (integer):
+            The channel that should be cached.
+        *cache_prefix* (string):
+            The path of the cache entries of the session without the channel.
+        *waveform_dtype* (string or None):
+            How the waveforms are stored in the cache.
+            See :func:`swan.columnar_io.ColumnarIO.write_block`.
+            Default: None.
+
+        **Returns**: :class:`neo.core.block.Block`
+            The read block.
+
+    """
+    block = read_session(filename, channel, cache_prefix)
+    ColumnarIO(get_cache_name(cache_prefix, channel)).write_block(block, waveform_dtype)
+    return block
+
+
+def load_session(filename, channel, cache_prefix, lazy=False, waveform_dtype=None):
+    """
+    Loads one session for the given channel.
+
+    If the session is cached the cached block will be loaded with
+    memory mapped waveforms, if not, it will be read and cached afterwards.
+    If the cache entry can not be written, the block that was read is returned.
+
+    **Arguments**
+
+        *filename* (string):
+            The session file that should be loaded.
+        *channel* (integer):
+            The channel that should be loaded.
+        *cache_prefix* (string):
+            The path of the cache entries of the session without the channel.
+        *lazy* (boolean):
+            Whether the waveforms of the cached block should only be
+            loaded on first use.
+            See :class:`swan.columnar_io.LazyWaveforms`.
+            Default: False.
+        *waveform_dtype* (string or None):
+            How the waveforms are stored in the cache.
+            See :func:`swan.columnar_io.ColumnarIO.write_block`.
+            Default: None.
+
+        **Returns**: :class:`neo.core.block.Block`
+            The loaded block.
+
+    """
+    cIO = ColumnarIO(get_cache_name(cache_prefix, channel))
+    if not cIO.exists():
+        block = read_session(filename, channel, cache_prefix)
+        try:
+            cIO.write_block(block, waveform_dtype)
+        except OSError:
+            return block
+    return cIO.read_block(lazy=lazy)
+
+
+def split_block(block):
+    """
+    Splits a block that contains several channels into one block per channel.
+
+    The blocks of the channels share the segments and thereby the events
+    of the given block, but each of them only contains one channel index.
+
+    **Arguments**
+
+        *block* (:class:`neo.core.block.Block`):
+            The block containing all channels.
+
+        **Returns**: list of tuple
+            The (channel id, block) pairs.
+
+    """
+    blocks = []
+    for channel_index in block.channel_indexes:
+        channel_block = Block(name=block.name, description=block.description, file_origin=block.file_origin,
+                              rec_datetime=block.rec_datetime, **block.annotations)
+        channel_block.segments = block.segments
+        channel_block.channel_indexes = [channel_index]
+        blocks.append((int(channel_index.channel_ids[0]), channel_block))
+    return blocks
+
+
+def ingest_session(filename, cache_prefix, waveform_dtype=None):
+    """
+    Reads all channels of one session in a single pass and writes
+    a cache entry for every channel that is not cached yet.
+
+    This is a module level function so that it can be run
+    in a worker process.
+
+    **Arguments**
+
+        *filename* (string):
+            The session file that should be cached.
+        *cache_prefix* (string):
+            The path of the cache entries of the session without the channel.
+        *waveform_dtype* (string or None):
+            How the waveforms are stored in the cache.
+            See :func:`swan.columnar_io.ColumnarIO.write_block`.
+            Default: None.
+
+        **Returns**: list of integer
+            The channels that were found in the session.
+
+    """
+    session = BlackrockIO(filename)
+    block = session.read_block(index=None, name=None, description=None, nsx_to_load='none',
+                               n_starts=None, n_stops=None, channels='all', units='all',
+                               load_waveforms=True, load_events=True, lazy=False, cascade=True)
+    del session
+
+    channels = []
+    for channel, channel_block in split_block(block):
+        cIO = ColumnarIO(get_cache_name(cache_prefix, channel))
+        if not cIO.exists():
+            cIO.write_block(channel_block, waveform_dtype)
+        channels.append(channel)
+    return channels
+
+
+def index_events(block):
+    """
+    Groups the events of a block by their labels.
+
+    Only the first event array of the first segment is used,
+    because it holds the trigger events of the session.
+    All labels are ranked by :func:`numpy.unique` in a single pass and the
+    event times are sorted by label rank and time, so each label gets
+    a contiguous slice.
+
+    **Arguments**
+
+        *block* (:class:`neo.core.block.Block`):
+            The block containing the events.
+
+        **Returns**: dictionary
+            The event labels as keys and the sorted event times in ms
+            as values.
+
+    """
+    if not block.segments or not block.segments[0].events:
+        return {}
+    event = block.segments[0].events[0]
+    times = event.times.rescale(pq.ms).magnitude
+    labels = np.asarray(event.labels)
+
+    unique_labels, inverse = np.unique(labels, return_inverse=True)
+    order = np.lexsort((times, inverse))
+    bounds = np.searchsorted(inverse[order], np.arange(len(unique_labels) + 1))
+    times = times[order]
+    return {label: times[bounds[i]:bounds[i + 1]] for i, label in enumerate(unique_labels.tolist())}
+
+
+def _ingest_session_job(job):
+    """
+    Unpacks a (filename, cache_prefix, waveform_dtype) job for :func:`ingest_session`
+    and returns the file name together with the found channels and
+    the error message or None.
+
+    The errors are returned instead of raised, so that one unreadable
+    session does not abort the other jobs of the pool.
+
+    """
+    try:
+        return job[0], ingest_session(*job), None
+    except Exception as error:
+        return job[0], [], str(error) or type(error).__name__
+
+
+def ingest_workers(files, workers):
+    """
+    Returns the number of worker processes for ingesting the given files.
+
+    Every worker holds a whole session in memory, so the number of
+    workers is limited by the available memory, see :data:`INGEST_MEMORY_FACTOR`.
+
+    **Arguments**
+
+        *files* (list of string):
+            The files that should be ingested.
+        *workers* (integer):
+            The maximum number of worker processes.
+
+        **Returns**: integer
+            The number of worker processes.
+
+    """
+    sizes = [getsize(f) for f in files if exists(f)]
+    needed = max(sizes, default=0) * INGEST_MEMORY_FACTOR
+    if needed:
+        workers = min(workers, psutil.virtual_memory().available // needed)
+    return int(max(1, min(workers, len(files))))
+
+
+def _cache_session_job(job):
+    """
+    Unpacks a (index, filename, channel, cache_prefix, waveform_dtype) job for
+    :func:`cache_session` and returns the index so that the
+    session order can be restored, together with the error message or None.
+
+    The block itself is not sent back to the parent process,
+    it is read from the cache there. The errors are returned instead of
+    raised, so that one failed session does not abort the other jobs of the pool.
+
+    """
+    i, filename, channel, cache_prefix, waveform_dtype = job
+    try:
+        cache_session(filename, channel, cache_prefix, waveform_dtype)
+    except Exception as error:
+        return i, str(error) or type(error).__name__
+    return i, None
 
 
 class NeoData(QObject):
@@ -31,6 +330,31 @@ class NeoData(QObject):
         *cache_dir* (string):
             The directory where the cached data will be stored
             and from where it will be loaded.
+            See :class:`swan.cache_manager.CacheManager`.
+        *workers* (integer or None):
+            The number of worker processes used to read uncached sessions.
+            Default: None (the number of available CPUs).
+        *cache_budget* (integer or None):
+            The maximum size of the cache directory in bytes.
+            Default: None (no limit).
+        *prefetch_budget* (integer):
+            The maximum size in bytes of the prefetched channels kept in memory.
+            Default: 512 MB.
+        *lazy_waveforms* (boolean):
+            Whether the waveforms should be loaded per unit on first use
+            instead of together with the spike times.
+            Default: True.
+        *memo_size* (integer):
+            The maximum number of memoized :func:`get_data` results.
+            Default: 4096.
+        *memo_bytes* (integer):
+            The maximum size in bytes of the memoized :func:`get_data` results.
+            Default: 128 MB.
+        *waveform_dtype* (string or None):
+            How the waveforms are stored in new cache entries, "float32"
+            or "int16". They are converted to float32 only when they are read.
+            See :func:`swan.columnar_io.ColumnarIO.write_block`.
+            Default: None (as they are read from the files).
 
     """
 
@@ -41,35 +365,128 @@ class NeoData(QObject):
     
     """
 
-    def __init__(self, cache_dir):
+    ingest_progress = pyqtSignal(int)
+    """
+    Progress signal to let the parent widget know how far 
+    the ingestion of all channels is.
+    
+    """
+
+    def __init__(self, cache_dir, workers=None, cache_budget=None, prefetch_budget=2 ** 29, lazy_waveforms=True,
+                 memo_size=4096, memo_bytes=2 ** 27, waveform_dtype=None):
         """
         **Properties**
         
             *cdir* (string):
                 The path to the cache directory.
+            *cache* (:class:`swan.cache_manager.CacheManager`):
+                Names the cache entries and keeps the cache manifest.
+                It is replaced when *cdir* is changed.
+            *cache_budget* (integer or None):
+                The maximum size of the cache directory in bytes.
             *blocks* (list of :class:`neo.core.block.Block`):
                 The loaded neo Blocks. Will be cached after loading so 
                 that they can be loaded faster next time.
             *total_units_per_block* (list of integer):
                 Contains the number of real units per block.
+            *channel_data* (:class:`swan.channel_data.ChannelData`):
+                The units of the loaded channel in flat arrays.
+            *channel* (integer or None):
+                The loaded channel.
+            *source_keys* (list of string):
+                The source keys of the session files of the loaded blocks,
+                see :func:`swan.cache_manager.CacheManager.source_key`.
             *rgios* (list of :class:`neo.io.BlackrockIO`):
                 Contains the IO class to load the neo blocks.
+            *workers* (integer):
+                The number of worker processes used to read uncached sessions.
+            *prefetch_budget* (integer):
+                The maximum size in bytes of the prefetched channels kept in memory.
+            *lazy_waveforms* (boolean):
+                Whether the waveforms are loaded per unit on first use.
+            *memo_size* (integer):
+                The maximum number of memoized :func:`get_data` results.
+            *memo_bytes* (integer):
+                The maximum size in bytes of the memoized :func:`get_data` results.
+            *waveform_dtype* (string or None):
+                How the waveforms are stored in new cache entries.
+            *memo_hits* (integer):
+                The number of :func:`get_data` calls answered from the memo.
+            *memo_misses* (integer):
+                The number of :func:`get_data` calls that had to compute the result.
+            *_memo* (:class:`collections.OrderedDict`):
+                The memoized results in the order of their last use.
+            *_memo_nbytes* (integer):
+                The size in bytes of the memoized results.
+            *_memo_lock* (:class:`threading.Lock`):
+                Guards the memo, because the views compute in threads, too.
+            *_prefetched* (dictionary):
+                The prefetched channels as keys and tuples of the files,
+                the blocks and their size as values.
+            *_prefetch_lock* (:class:`threading.Lock`):
+                Guards the prefetched channels, which are shared
+                by the loading and the prefetching thread.
+            *_prefetch_stop* (:class:`threading.Event`):
+                Tells the latest prefetch run to stop.
+            *_event_indices* (dictionary):
+                The event indices of the loaded sessions, see :func:`index_events`.
+                The keys are the source keys of the session files.
             
         """
         super(QObject, self).__init__()
         # properties{
+        self.cache_budget = cache_budget
         self.cdir = cache_dir
         self.blocks = []
         self.total_units_per_block = []
         self.rgios = []
+        self.workers = workers if workers is not None else (cpu_count() or 1)
+        self.prefetch_budget = prefetch_budget
+        self.lazy_waveforms = lazy_waveforms
+        self.memo_size = memo_size
+        self.memo_bytes = memo_bytes
+        self.waveform_dtype = waveform_dtype
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self._memo = OrderedDict()
+        self._memo_nbytes = 0
+        self._memo_lock = threading.Lock()
+        self._prefetched = {}
+        self._prefetch_lock = threading.Lock()
+        self._prefetch_stop = threading.Event()
+        self._event_indices = {}
         self._wave_length = 0.
         self.segments = []
         self.units = []
+        self.channel_data = ChannelData([])
+        self.channel = None
+        self.source_keys = []
         self.events = []
         self.unique_labels = []
         self.sampling_rate = 0.
         # }
 
+    @property
+    def cdir(self):
+        return self.cache.cache_dir
+
+    @cdir.setter
+    def cdir(self, cache_dir):
+        self.cache = CacheManager(cache_dir, budget=self.cache_budget)
+
+    def set_cache_budget(self, cache_budget):
+        """
+        Sets the maximum size of the cache directory.
+        
+        **Arguments**
+        
+            *cache_budget* (integer or None):
+                The maximum size in bytes.
+        
+        """
+        self.cache_budget = cache_budget
+        self.cache.set_budget(cache_budget)
+
     #### general methods ####    
 
     #     def load_rgIOs(self, files):
@@ -89,6 +506,9 @@ class NeoData(QObject):
         If the blocks are cached the cached ones will be loaded, 
         if not, the normal loading routine of the IOs will be used 
         and after that the blocks will be cached.
+        See :class:`swan.columnar_io.ColumnarIO` for the cache format.
+        
+        This is :func:`read_channel` followed by :func:`set_blocks`.
         
         **Arguments**
         
@@ -97,6 +517,41 @@ class NeoData(QObject):
             *channel* (integer):
                 The channel that should be loaded.
         
+        """
+        self.set_blocks(self.read_channel(files, channel), files, channel)
+
+    def read_channel(self, files, channel, cancelled=None, progress=None, owner="loading"):
+        """
+        Reads the neo blocks from the given files and the given channel
+        without replacing the loaded ones.
+        
+        It can be run in a thread while the loaded blocks are still in use.
+        The cache entries of the channel stay pinned by *owner* until
+        the blocks are passed to :func:`set_blocks` with the same owner
+        or :func:`release_channel` is called.
+        
+        **Arguments**
+        
+            *files* (list of string):
+                The files that should be loaded.
+            *channel* (integer):
+                The channel that should be loaded.
+            *cancelled* (:class:`threading.Event` or None):
+                If it is set, the reading stops after the current session.
+                Default: None.
+            *progress* (callable or None):
+                Is called with the progress instead of
+                emitting the :attr:`progress` signal.
+                Default: None.
+            *owner* (hashable):
+                The pin owner of the cache entries. Loads that
+                run at the same time need different owners.
+                Default: "loading".
+        
+            **Returns**: list of :class:`neo.core.block.Block` or None
+                The blocks in the order of the files or None if
+                the reading was cancelled.
+        
         """
         # information for the progress
         l = len(files)
@@ -109,55 +564,94 @@ class NeoData(QObject):
         v = 0
         step = int(100 / l)
 
-        self.delete_blocks()
-        blocks = []
+        # a running prefetch must not compete with the foreground load
+        self.stop_prefetch()
 
-        # loading the blocks
-        for i, f in enumerate(files):
-            name = join(self.cdir, split(f)[1] + "_" + str(channel) + ".pkl")
+        if progress is None:
+            progress = self.progress.emit
 
-            if exists(name):
-                # load from cache
-                pIO = PickleIO(name)
-                block = pIO.read_block()
+        # the entries must not be evicted by a prefetch or an ingest
+        # until they are replaced by the next load, see set_blocks
+        self.cache.pin(owner, {f: [channel] for f in files})
+        try:
+            blocks = self._take_prefetched(files, channel)
+            if blocks is not None:
+                progress(100)
             else:
-                # loading
-                session = BlackrockIO(f)
-                block = session.read_block(index=None, name=None, description=None, nsx_to_load='none',
-                                           n_starts=None, n_stops=None, channels=channel, units='all',
-                                           load_waveforms=True, load_events=True, lazy=False, cascade=True)
-                del session
-
-                # caching
-                pIO = PickleIO(name)
-                pIO.write_block(block)
-
-            blocks.append(block)
-            # emits a signal with the current progress
-            # after loading a block
-            self.progress.emit(v + step * (i + 1))
+                blocks = self._read_blocks(files, channel, v, step, cancelled, progress)
+                if blocks is None:
+                    self.cache.unpin(owner)
+                    return None
 
-        self.blocks = blocks
-        self.segments = [block.segments for block in self.blocks]
-        nums = [len([unit for unit in b.channel_indexes[0].units
-                     if "noise" not in unit.description.split()
-                     and "unclassified" not in unit.description.split()])
-                for b in self.blocks]
-        self.units = [[unit for unit in b.channel_indexes[0].units
-                       if "noise" not in unit.description.split()
-                       and "unclassified" not in unit.description.split()]
-                      for b in self.blocks]
-        # self.spiketrains = self.create_spiketrains_dictionary(self.units)
-        self.set_events_and_labels()
-        self.total_units_per_block = nums
+            self.cache.register({f: [channel] for f in files})
+        except BaseException:
+            self.cache.unpin(owner)
+            raise
+        return blocks
 
-        waveform_sizes = []
-        for block in self.units:
-            for unit in block:
-                waveform_sizes.append(unit.spiketrains[0].waveforms.shape[-1])
+    def release_channel(self, owner="loading"):
+        """
+        Unpins the cache entries of a channel that was read
+        by :func:`read_channel` but whose blocks will not be set.
+        
+        **Arguments**
+        
+            *owner* (hashable):
+                The pin owner that was passed to :func:`read_channel`.
+                Default: "loading".
+        
+        """
+        self.cache.unpin(owner)
+
+    def set_blocks(self, blocks, files=None, channel=None, owner="loading"):
+        """
+        Replaces the loaded blocks and computes the data
+        that belongs to them.
+        
+        If the waveforms of the blocks have different widths, the
+        loaded blocks are kept and a ValueError is raised.
+        
+        **Arguments**
+        
+            *blocks* (list of :class:`neo.core.block.Block`):
+                The blocks of one channel in the order of the sessions.
+            *files* (list of string or None):
+                The session files of the blocks. They are needed
+                to reuse the event indices of the sessions.
+                Default: None.
+            *channel* (integer or None):
+                The channel of the blocks.
+                Default: None.
+            *owner* (hashable):
+                The pin owner that was passed to :func:`read_channel`.
+                Default: "loading".
+        
+        """
+        # the neo structure is only walked here
+        channel_data = ChannelData(blocks)
+        waveform_sizes = [self.get_waveform_shape(record.unit)[-1] for record in channel_data.real_records]
 
+        # the loaded blocks are kept if the new ones can not be used
         if not np.unique(waveform_sizes).size == 1:
+            self.cache.unpin(owner)
             raise ValueError("Spike waveform widths across datasets must be the same!")
+
+        self.delete_blocks()
+
+        # the lazily loaded waveforms are read from the cache entries
+        if files is not None and channel is not None:
+            self.cache.pin("loaded", {f: [channel] for f in files})
+        self.cache.unpin(owner)
+
+        self.blocks = blocks
+        self.channel = channel
+        self.source_keys = [self.cache.source_key(f) for f in files] if files is not None else []
+        self.segments = [block.segments for block in self.blocks]
+        self.channel_data = channel_data
+        self.units = self.channel_data.units
+        # self.spiketrains = self.create_spiketrains_dictionary(self.units)
+        self.set_events_and_labels(files)
+        self.total_units_per_block = self.channel_data.total_units_per_block
         self._wave_length = np.unique(waveform_sizes)[0]
 
         try:
@@ -170,10 +664,329 @@ class NeoData(QObject):
         except ValueError:
             self.sampling_rate = self.sampling_rate * pq.Hz
 
+    def _read_blocks(self, files, channel, v=0, step=0, cancelled=None, progress=None):
+        """
+        Reads the blocks of the given files and the given channel
+        from the cache or, if they are not cached, from the files.
+        
+        **Arguments**
+        
+            *files* (list of string):
+                The files that should be loaded.
+            *channel* (integer):
+                The channel that should be loaded.
+            *v* (integer):
+                The progress before loading.
+            *step* (integer):
+                The progress made by each loaded file.
+            *cancelled* (:class:`threading.Event` or None):
+                If it is set, the reading stops after the current session.
+            *progress* (callable or None):
+                Is called with the progress instead of
+                emitting the :attr:`progress` signal.
+        
+            **Returns**: list of :class:`neo.core.block.Block` or None
+                The blocks in the order of the files or None if
+                the reading was cancelled.
+        
+        """
+        if progress is None:
+            progress = self.progress.emit
+        l = len(files)
+        blocks = [None] * l
+
+        jobs = [(i, f, channel, self.cache.get_prefix(f), self.waveform_dtype) for i, f in enumerate(files)]
+
+        # cached sessions are cheap to read, so only the uncached ones
+        # are worth sending to the worker processes
+        uncached = [job for job in jobs if not ColumnarIO(get_cache_name(job[3], channel)).exists()]
+
+        if self.workers > 1 and len(uncached) > 1:
+            cached = [job[0] for job in jobs if job not in uncached]
+            # spawned workers do not inherit the state of the loading thread
+            context = get_context("spawn")
+            with context.Pool(processes=min(self.workers, len(uncached))) as pool:
+                results = pool.imap_unordered(_cache_session_job, uncached)
+                for finished, (i, _) in enumerate(chain(((i, None) for i in cached), results)):
+                    if cancelled is not None and cancelled.is_set():
+                        # leaving the pool terminates the workers
+                        return None
+                    # if the worker failed, the entry does not exist and the session
+                    # is read here like in the serial path, so that a cache entry that
+                    # can not be written is tolerated and a read error is raised
+                    blocks[i] = load_session(*jobs[i][1:4], lazy=self.lazy_waveforms,
+                                             waveform_dtype=self.waveform_dtype)
+                    # emits a signal with the current progress
+                    # after loading a block
+                    progress(v + step * (finished + 1))
+        else:
+            for i, job in enumerate(jobs):
+                if cancelled is not None and cancelled.is_set():
+                    return None
+                blocks[i] = load_session(*job[1:4], lazy=self.lazy_waveforms, waveform_dtype=self.waveform_dtype)
+                progress(v + step * (i + 1))
+
+        return blocks
+
+    def prefetch(self, files, channels):
+        """
+        Prefetches the given channels while another channel is displayed.
+        
+        The cache entries of all channels are written if they do not exist.
+        As long as the prefetch budget allows, the blocks of the channels
+        are also read into memory, so that :func:`load` does not have to
+        read them again.
+        
+        The prefetching stops as soon as :func:`stop_prefetch` is called,
+        which is done at the start of every :func:`load`. The stop flag is
+        checked before every session, so a session that is being read from
+        its file with the BlackrockIO is still finished, which can take a while.
+        :func:`load` does not wait for that.
+        
+        **Arguments**
+        
+            *files* (list of string):
+                The files that should be prefetched.
+            *channels* (list of integer):
+                The channels in the order of their likelihood to be loaded next.
+        
+        """
+        # every run has its own stop flag, so that starting a new run
+        # does not revive an older one that was told to stop
+        stop = threading.Event()
+        with self._prefetch_lock:
+            self._prefetch_stop.set()
+            self._prefetch_stop = stop
+
+            # channels that are not likely anymore only waste memory
+            for channel in list(self._prefetched.keys()):
+                if channel not in channels or self._prefetched[channel][0] != tuple(files):
+                    del self._prefetched[channel]
+            used = sum(size for _, _, size in self._prefetched.values())
+            self._pin_prefetched()
+
+        for channel in channels:
+            with self._prefetch_lock:
+                if channel in self._prefetched:
+                    continue
+
+            entries = []
+            for f in files:
+                if stop.is_set():
+                    return
+                prefix = self.cache.get_prefix(f)
+                cIO = ColumnarIO(get_cache_name(prefix, channel))
+                if not cIO.exists():
+                    try:
+                        cache_session(f, channel, prefix, self.waveform_dtype)
+                    except (IOError, OSError, ValueError):
+                        # the channel might not exist in this session
+                        break
+                entries.append(cIO)
+            else:
+                self.cache.register({f: [channel] for f in files})
+
+                size = sum(cIO.nbytes(waveforms=not self.lazy_waveforms) for cIO in entries)
+                if used + size > self.prefetch_budget:
+                    continue
+                blocks = []
+                for cIO in entries:
+                    if stop.is_set():
+                        return
+                    blocks.append(cIO.read_block(mmap=False, lazy=self.lazy_waveforms))
+                with self._prefetch_lock:
+                    if stop.is_set():
+                        return
+                    self._prefetched[channel] = (tuple(files), blocks, size)
+                    self._pin_prefetched()
+                used += size
+
+    def stop_prefetch(self):
+        """
+        Lets a running :func:`prefetch` stop after the session it is working on.
+        
+        It returns immediately. A read of an uncached session can not be
+        interrupted and runs to its end in the prefetching thread.
+        
+        """
+        with self._prefetch_lock:
+            self._prefetch_stop.set()
+
+    def _take_prefetched(self, files, channel):
+        """
+        Removes the prefetched blocks of a channel from the prefetch storage.
+        
+        **Arguments**
+        
+            *files* (list of string):
+                The files that should be loaded.
+            *channel* (integer):
+                The channel that should be loaded.
+        
+            **Returns**: list of :class:`neo.core.block.Block` or None
+                The blocks or None if the channel was not prefetched.
+        
+        """
+        with self._prefetch_lock:
+            prefetched = self._prefetched.pop(channel, None)
+            self._pin_prefetched()
+        if prefetched is None or prefetched[0] != tuple(files):
+            return None
+        return prefetched[1]
+
+    def _pin_prefetched(self):
+        """
+        Protects the cache entries of the prefetched channels from being evicted,
+        because their waveforms are read from there on first use.
+        
+        It has to be called with the prefetch lock held.
+        
+        """
+        sources = {}
+        for channel, (files, _, _) in self._prefetched.items():
+            for f in files:
+                sources.setdefault(f, []).append(channel)
+        self.cache.pin("prefetched", sources)
+
+    def ingest(self, files):
+        """
+        Caches all channels of the given files.
+
+        Every file is read only once and the cache entries for all
+        of its channels are written in that pass, see :func:`ingest_session`.
+        After that, every channel can be loaded from the cache.
+
+        **Arguments**
+
+            *files* (list of string):
+                The files that should be cached.
+
+            **Returns**: list of integer
+                The channels that were found in the files.
+
+            **Raises**: IOError
+                If some of the files could not be cached.
+                All other files are cached anyway.
+
+        """
+        l = len(files)
+        step = int(100 / l) if l else 100
+        jobs = [(f, self.cache.get_prefix(f), self.waveform_dtype) for f in files]
+        workers = ingest_workers(files, self.workers)
+        channels = set()
+        errors = []
+
+        if workers > 1:
+            context = get_context("spawn")
+            with context.Pool(processes=workers) as pool:
+                results = pool.imap_unordered(_ingest_session_job, jobs)
+                for i, (f, found, error) in enumerate(results):
+                    self._ingested(f, found, error, channels, errors)
+                    self.ingest_progress.emit(step * (i + 1))
+        else:
+            for i, job in enumerate(jobs):
+                self._ingested(*_ingest_session_job(job), channels, errors)
+                self.ingest_progress.emit(step * (i + 1))
+
+        if errors:
+            raise IOError("\n".join(errors))
+        return sorted(channels)
+
+    def _ingested(self, filename, found, error, channels, errors):
+        """
+        Registers the cache entries of an ingested session
+        or records the error if it could not be ingested.
+
+        """
+        if error is not None:
+            errors.append(split(filename)[1] + ": " + error)
+            return
+        self.cache.register({filename: found})
+        channels.update(found)
+
     def get_data(self, layer, unit, **kwargs):
         """
         Returns the data for a specific layer.
         
+        The results are memoized per unit, layer and parameters.
+        The least recently used results are dropped if there are more
+        than *memo_size* of them or if they take more than *memo_bytes*.
+        The waveforms of the "all" layer are not memoized, because they
+        are read from the memory mapped cache entry anyway and would
+        otherwise keep a copy per viewed unit. Returned arrays are read-only.
+        See :func:`_compute_data` for the layers.
+        
+        **Arguments**
+        
+            *layer* (string):
+                The layer you need data for.
+            *unit* (:class:`neo.core.unit.Unit`):
+                The unit that contains the data.
+        
+        """
+        if layer == "spiketrain":
+            return unit.spiketrains[0]
+        if layer == "all":
+            result = self._compute_data(layer, unit, **kwargs)
+            result.setflags(write=False)
+            return result
+
+        key = (id(unit), layer, tuple(sorted(kwargs.items())))
+        with self._memo_lock:
+            memo = self._memo.get(key)
+            # the identity check guards against reused ids of deleted units
+            if memo is not None and memo[0] is unit:
+                self._memo.move_to_end(key)
+                self.memo_hits += 1
+                result = memo[1]
+                return list(result) if isinstance(result, list) else result
+            self.memo_misses += 1
+
+        result = self._compute_data(layer, unit, **kwargs)
+        nbytes = 0
+        for array in (result if isinstance(result, tuple) else (result,)):
+            if isinstance(array, np.ndarray):
+                array.setflags(write=False)
+                nbytes += array.nbytes
+
+        with self._memo_lock:
+            previous = self._memo.pop(key, None)
+            if previous is not None:
+                self._memo_nbytes -= previous[2]
+            self._memo[key] = (unit, result, nbytes)
+            self._memo_nbytes += nbytes
+            while len(self._memo) > 1 and (len(self._memo) > self.memo_size or self._memo_nbytes > self.memo_bytes):
+                self._memo_nbytes -= self._memo.popitem(last=False)[1][2]
+        return list(result) if isinstance(result, list) else result
+
+    def get_memo_info(self):
+        """
+        Returns the statistics of the memoized :func:`get_data` results.
+        
+            **Returns**: dictionary
+                The number of hits, misses, stored results,
+                the maximum number of stored results and their
+                size and maximum size in bytes.
+        
+        """
+        with self._memo_lock:
+            return {"hits": self.memo_hits, "misses": self.memo_misses,
+                    "size": len(self._memo), "maxsize": self.memo_size,
+                    "bytes": self._memo_nbytes, "maxbytes": self.memo_bytes}
+
+    def clear_memo(self):
+        """
+        Drops all memoized :func:`get_data` results.
+        
+        """
+        with self._memo_lock:
+            self._memo.clear()
+            self._memo_nbytes = 0
+
+    def _compute_data(self, layer, unit, **kwargs):
+        """
+        Computes the data for a specific layer.
+        
         **Arguments**
         
             *layer* (string):
@@ -193,46 +1006,103 @@ class NeoData(QObject):
                 units: tuple containing a numpy array of shape (m,)
                 sessions: tuple containing a numpy array of shape (m,)
                 rate profile: 
+                density: tuple of a numpy array of shape (N, bins) with the
+                    number of waveforms per time and amplitude bin and
+                    a numpy array of shape (2,) with the amplitude range in uV
                 
              **Raises**: ValueError
                 If the layer is not supported.
         
         """
+        summary = getattr(unit.spiketrains[0], "summary", None)
+        if summary is None and layer in ("average", "standard deviation"):
+            # the moments are computed in chunks to bound the temporary memory
+            mean, std, extremes = waveform_moments(self.get_waveforms(unit).magnitude)
+            summary = UnitSummary(mean, std, extremes, None, None)
         if layer == "average":
-            return np.mean(unit.spiketrains[0].waveforms.magnitude, axis=0)[0] * pq.uV
+            return summary.mean[0] * pq.uV
         elif layer == "standard deviation":
-            means = np.mean(unit.spiketrains[0].waveforms.magnitude, axis=0)[0]
-            stds = np.std(unit.spiketrains[0].waveforms.magnitude, axis=0)[0]
+            means = summary.mean[0]
+            stds = summary.std[0]
             return np.array([means - 2 * stds, means + 2 * stds]) * pq.uV
+        elif layer == "density":
+            if summary is not None and summary.density is not None:
+                return summary.density, np.array([summary.minimum, summary.maximum])
+            # blocks that were not read from the cache have no summaries
+            wforms = self.get_waveforms(unit).magnitude
+            extremes = np.array([wforms.min(), wforms.max()]) if len(wforms) else np.array([np.nan, np.nan])
+            return waveform_density(wforms, extremes), extremes
         elif layer == "all":
-            wforms = unit.spiketrains[0].waveforms.magnitude
+            wforms = self.get_waveforms(unit).magnitude
             return wforms.reshape(wforms.shape[0], wforms.shape[-1])
         elif layer == "spiketrain":
             return unit.spiketrains[0]
         elif layer == "units":
-            vek = unit.spiketrains[0].copy().rescale(pq.s)
-            vek.sort()
-            d = vek[1:] - vek[:len(vek) - 1]
-            d = d.magnitude
-            return d,
+            if summary is not None:
+                return summary.isi,
+            return intervals(unit.spiketrains[0]),
         elif layer == "sessions":
-            vek = unit.spiketrains[0].copy().rescale(pq.s)
-            vek.sort()
-            d = vek[1:] - vek[:len(vek) - 1]
-            d = d.magnitude.tolist()
-            return d
+            if summary is not None:
+                return summary.isi.tolist()
+            return intervals(unit.spiketrains[0]).tolist()
         elif layer == "n_spikes":
+            record = self.channel_data.get_record(unit)
+            if record is not None:
+                return record.n_spikes
             return len(unit.spiketrains[0].magnitude)
         elif layer == "rate profile":
-            order = kwargs.get("order", 4)
-            Wn = kwargs.get("Wn", 0.008)
-            bins = kwargs.get("bins", 4000)
-            b, a = butter(order, Wn)
-            hist, bin_edges = np.histogram(unit.spiketrains[0].magnitude, bins=bins)
-            return filtfilt(b, a, hist)
+            params = {key: kwargs.get(key, value) for key, value in RATE_PROFILE.items()}
+            if summary is not None and params == RATE_PROFILE:
+                return summary.rate_profile
+            record = self.channel_data.get_record(unit)
+            if record is not None:
+                return rate_profile(self.channel_data.get_spike_times(record), **params)
+            return rate_profile(unit.spiketrains[0].magnitude, **params)
         else:
             raise ValueError("Layer not supported")
 
+    def get_waveforms(self, unit):
+        """
+        Returns the waveforms of a unit.
+        
+        If the waveforms have not been loaded yet, they are
+        loaded from the cache. They are not attached to the spike
+        train, so that they are freed as soon as they are not used anymore.
+        
+        **Arguments**
+        
+            *unit* (:class:`neo.core.unit.Unit`):
+                The unit that contains the data.
+        
+            **Returns**: :class:`quantities.Quantity`
+                The waveforms of shape (spikes, channels, samples).
+        
+        """
+        train = unit.spiketrains[0]
+        lazy = getattr(train, "lazy_waveforms", None)
+        if train.waveforms is None and lazy is not None:
+            return lazy.load()
+        return train.waveforms
+
+    def get_waveform_shape(self, unit):
+        """
+        Returns the shape of the waveforms of a unit without loading them.
+        
+        **Arguments**
+        
+            *unit* (:class:`neo.core.unit.Unit`):
+                The unit that contains the data.
+        
+            **Returns**: tuple of integer
+                The shape (spikes, channels, samples).
+        
+        """
+        train = unit.spiketrains[0]
+        lazy = getattr(train, "lazy_waveforms", None)
+        if train.waveforms is None and lazy is not None:
+            return lazy.shape
+        return train.waveforms.shape
+
     def get_channel_lengths(self):
         """
         Returns list containing the number of units in the channel
@@ -250,13 +1120,9 @@ class NeoData(QObject):
                 -maximum and +maximum
         
         """
-        datas = []
+        datas = [self.get_data(layer, record.unit) for record in self.channel_data.real_records]
         yranges0 = []
         yranges1 = []
-        for block in self.blocks:
-            for unit in block.channel_indexes[0].units:
-                if "noise" not in unit.description.split() and "unclassified" not in unit.description.split():
-                    datas.append(self.get_data(layer, unit))
         for data in datas:
             tmp0 = np.min(data)
             tmp1 = np.max(data)
@@ -330,6 +1196,9 @@ class NeoData(QObject):
                     del signal
                 del channel
             del block
+        self.channel_data = ChannelData([])
+        self.cache.unpin("loaded")
+        self.clear_memo()
         gc.collect()
 
     def delete_IOs(self):
@@ -342,47 +1211,40 @@ class NeoData(QObject):
             del rgio
         gc.collect()
 
-    def set_events_and_labels(self):
+    def set_events_and_labels(self, files=None):
         """
-        Returns a dictionary of event times to memory.
+        Sets the dictionary of event times and the unique event labels.
+        
+        The event index of a session does not depend on the channel,
+        so it is built once per session file by :func:`index_events`
+        and reused for every channel of that file.
         
         **Arguments**
             
-            *blocks* (list):
-                List of loaded blocks (sessions)
+            *files* (list of string or None):
+                The session files of the blocks. If it is None,
+                the index is built again for every block.
+                Default: None.
         
-        **Returns**
-            
-            *events_dict* (dict):
-                A dictionary of time points corresponding to each
-                event found in the whole dataset. The keys hold the
-                event ids and the corresponding values are lists of
-                lists. The list of lists preserve the neo structure:
-                    
-                    BLOCK > SEGMENT > EVENT
-                
-                The event list contains all the time points where the
-                event occured in the corresponding block.
-        """
-        events = [[seg.events for seg in block.segments] for block in self.blocks]
-        labels = [[[event.labels for event in segment] for segment in block] for block in events]
-        times = [[[event.times for event in segment] for segment in block] for block in events]
-
-        raveled_labels = list(chain.from_iterable(list(chain.from_iterable(list(chain.from_iterable(labels))))))
-        unique_labels = np.unique(raveled_labels)
-
-        event_dict = {}
-        for label in unique_labels:
-            temp_list = []
-            for b in range(len(events)):
-                temp_list.append([])
-                for s in range(len(events[b])):
-                    temp_list[b].append([])
-                    for e in range(len(events[b][s])):
-                        temp_list[b][s].append([])
-                        t_points = times[b][s][e][np.where(labels[b][s][e] == label)[0]]
-                        temp_list[b][s][e] = t_points.rescale(pq.ms)
-            event_dict[label] = temp_list
+        The dictionary of event times has the event labels as keys and
+        lists with one sorted array of time points in ms per block as values.
+        
+        """
+        indices = []
+        event_indices = {}
+        for b, block in enumerate(self.blocks):
+            if files is None:
+                indices.append(index_events(block))
+                continue
+            key = self.cache.source_key(files[b])
+            if key not in self._event_indices:
+                self._event_indices[key] = index_events(block)
+            event_indices[key] = self._event_indices[key]
+            indices.append(event_indices[key])
+        # the indices of changed files and of other projects are dropped
+        self._event_indices = event_indices
 
+        unique_labels = np.unique([label for index in indices for label in index])
+        empty = np.empty(0)
         self.unique_labels = unique_labels
-        self.events = event_dict
+        self.events = {label: [index.get(label, empty) for index in indices] for label in unique_labels.tolist()}
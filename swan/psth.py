@@ -0,0 +1,160 @@
+"""
+Created on Oct 18, 2026
+
+@author: SWAN authors and contributors
+
+In this module you can find the functions that compute the peri-stimulus
+time histograms (PSTHs) of the rate profile view.
+
+The PSTHs of many units are computed in one batch: the spikes around the
+triggers are found with :func:`numpy.searchsorted`, binned for all units
+at once and smoothed with a Gaussian kernel by FFT convolution.
+The binning, the kernel and the trimming are the same as in
+:func:`elephant.statistics.instantaneous_rate`, so the results match
+the rate estimate computed with elephant up to rounding.
+"""
+# system imports
+import numpy as np
+from scipy.signal import fftconvolve
+
+CUTOFF = 5.0
+"""
+The kernel is evaluated within this many standard deviations around zero.
+
+"""
+
+
+def gaussian_kernel(sampling_period, kernel_width, cutoff=CUTOFF):
+    """
+    Samples a Gaussian kernel like :func:`elephant.statistics.instantaneous_rate`.
+
+    **Arguments**
+
+        *sampling_period* (float):
+            The sampling period in milliseconds.
+        *kernel_width* (float):
+            The standard deviation of the kernel in milliseconds.
+        *cutoff* (float):
+            The kernel is evaluated within this many standard deviations.
+            Default: :data:`CUTOFF`.
+
+        **Returns**: tuple
+            The kernel values in Hz per spike and the index of the kernel median.
+
+    """
+    sigma = kernel_width / sampling_period
+    t = np.arange(-cutoff * sigma, cutoff * sigma + 1.0, 1.0)
+    kernel = 1.0 / (np.sqrt(2.0 * np.pi) * kernel_width) * np.exp(-0.5 * (t / sigma) ** 2) * 1000.0
+    median = np.nonzero(kernel.cumsum() * sampling_period / 1000.0 >= 0.5)[0].min()
+    return kernel, median
+
+
+def aligned_spikes(spike_times, triggers, t_start, t_stop):
+    """
+    Returns the spikes around the triggers relative to their trigger.
+
+    **Arguments**
+
+        *spike_times* (numpy array):
+            The sorted spike times in milliseconds.
+        *triggers* (numpy array):
+            The trigger times in milliseconds.
+        *t_start* (float):
+            The start of the window around every trigger in milliseconds.
+        *t_stop* (float):
+            The stop of the window around every trigger in milliseconds.
+
+        **Returns**: numpy array
+            The spike times relative to their trigger, for all triggers.
+
+    """
+    lower = np.searchsorted(spike_times, triggers + t_start, side="left")
+    upper = np.searchsorted(spike_times, triggers + t_stop, side="right")
+    counts = upper - lower
+    total = counts.sum()
+    if total == 0:
+        return np.empty(0)
+    # the indices of all spikes in the windows, one range per trigger
+    starts = np.cumsum(counts) - counts
+    indices = np.arange(total) - np.repeat(starts - lower, counts)
+    return spike_times[indices] - np.repeat(triggers, counts)
+
+
+def compute_psths(spiketrains, triggers, timerange, sampling_period, kernel_width,
+                  border_correction=0.0, minimum_spikes=10, max_elements=2 ** 22):
+    """
+    Computes the PSTHs of many units around their triggers.
+
+    Only the triggers between the first and the last spike of a unit are used.
+
+    **Arguments**
+
+        *spiketrains* (list of numpy array):
+            The sorted spike times of every unit in milliseconds.
+        *triggers* (list of numpy array):
+            The trigger times for every unit in milliseconds.
+        *timerange* (list or tuple):
+            The start and the stop of the PSTH relative to the trigger in milliseconds.
+        *sampling_period* (float):
+            The sampling period of the PSTH in milliseconds.
+        *kernel_width* (float):
+            The standard deviation of the Gaussian kernel in milliseconds.
+        *border_correction* (float):
+            The time in milliseconds added at both ends of the time range
+            to avoid edge effects of the kernel.
+            Default: 0.0.
+        *minimum_spikes* (integer):
+            The minimum number of spikes of a unit and around its triggers.
+            Default: 10.
+        *max_elements* (integer):
+            The maximum size of the histogram matrix convolved at once.
+            Default: 2 ** 22.
+
+        **Returns**: list of tuple
+            The times in seconds and the values in Hz of the PSTH of every unit.
+            Both are empty lists if the PSTH of a unit could not be computed.
+
+    """
+    t_start = timerange[0] - border_correction
+    t_stop = timerange[1] + border_correction
+    n_bins = int((t_stop - t_start) / sampling_period) + 1
+
+    results = [([], []) for _ in spiketrains]
+    rows = []
+    for i, (spike_times, trigger) in enumerate(zip(spiketrains, triggers)):
+        spike_times = np.asarray(spike_times, dtype=np.float64)
+        trigger = np.asarray(trigger, dtype=np.float64)
+        if len(spike_times) < minimum_spikes or len(spike_times) == 0:
+            continue
+        # choose the triggers within the period of activity
+        trigger = trigger[(trigger >= spike_times[0]) & (trigger <= spike_times[-1])]
+        if len(trigger) < 1:
+            continue
+        aligned = aligned_spikes(spike_times, trigger, t_start, t_stop)
+        if len(aligned) <= minimum_spikes:
+            continue
+        rows.append((i, ((aligned - t_start) / sampling_period).astype(np.int64), len(trigger)))
+
+    if not rows:
+        return results
+
+    kernel, median = gaussian_kernel(sampling_period, kernel_width)
+    # the slice of the rate estimate between the start and the stop of the time range
+    first = int(np.rint(border_correction / sampling_period))
+    last = first + int(np.rint((timerange[1] - timerange[0]) / sampling_period))
+    last = min(last, n_bins - 1)
+    times = (t_start + np.arange(first, last) * sampling_period) / 1000.0
+
+    batch = max(1, max_elements // (n_bins + len(kernel)))
+    for b in range(0, len(rows), batch):
+        chunk = rows[b:b + batch]
+        flat = np.concatenate([bins + r * n_bins for r, (_, bins, _) in enumerate(chunk)])
+        histograms = np.bincount(flat, minlength=len(chunk) * n_bins).reshape(len(chunk), n_bins)
+        rates = fftconvolve(histograms.astype(np.float64), kernel[np.newaxis, :], mode="full", axes=1)
+        rates = rates[:, median:median + n_bins - 1][:, first:last]
+        for (i, bins, n_triggers), rate in zip(chunk, rates):
+            if len(bins) < 2:
+                results[i] = (times.copy(), np.zeros_like(times))
+            else:
+                results[i] = (times.copy(), rate / float(n_triggers))
+    return results
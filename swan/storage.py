@@ -12,22 +12,33 @@ the data loading and the data writing.
 The data loading is called in the :class:`Task` which is a thread.
 """
 # system imports
+import threading
+from functools import partial
+from itertools import count
 from os import remove
 from os.path import splitext, basename, exists, split, join
-from pyqtgraph.Qt import QtGui, QtCore
+from pyqtgraph.Qt import QtCore
 import numpy as np
 
 # swan-specific imports
 from swan.base.storage import Storage
 from swan.base.project import Project
 from swan.neodata import NeoData
+from swan.cache_manager import CacheManager
 from swan.virtual_unit_map import VirtualUnitMap
 
+# every load pins the cache entries of its channel under its own name
+_load_ids = count()
+
 
 class Task(QtCore.QThread):
     """
     A thread that loads the data.
     
+    The blocks are only read here. They replace the loaded ones
+    in the main thread after the :attr:`loaded` signal has been emitted,
+    so the current channel stays usable while loading.
+    
     **Arguments**
         
         *data* (:class:`src.neodata.NeoData`):
@@ -39,6 +50,26 @@ class Task(QtCore.QThread):
                 
     """
 
+    loaded = QtCore.pyqtSignal(int, object)
+    """
+    Signal that is emitted with the channel and the read blocks
+    if the loading was not cancelled.
+    
+    """
+
+    failed = QtCore.pyqtSignal(int, str)
+    """
+    Signal that is emitted with the channel and the error message
+    if the reading failed and the loading was not cancelled.
+    
+    """
+
+    progress = QtCore.pyqtSignal(int)
+    """
+    Signal that indicates how far the reading has progressed.
+    
+    """
+
     def __init__(self, data, files, channel):
         """
         **Properties**
@@ -49,12 +80,19 @@ class Task(QtCore.QThread):
                 The list containing the file paths.
             *channel* (integer):
                 The channel that has to be loaded.
+            *cancelled* (:class:`threading.Event`):
+                Is set if the loading should be abandoned.
+            *owner* (tuple):
+                The pin owner of the cache entries of the channel,
+                see :func:`src.neodata.NeoData.read_channel`.
         
         """
         QtCore.QThread.__init__(self)
         self.data = data
         self.files = files
         self.channel = channel
+        self.cancelled = threading.Event()
+        self.owner = ("loading", next(_load_ids))
 
     def run(self):
         """
@@ -62,7 +100,121 @@ class Task(QtCore.QThread):
         the :class:`src.neodata.NeoData` object.
         
         """
-        self.data.load(self.files, self.channel)
+        try:
+            blocks = self.data.read_channel(self.files, self.channel, self.cancelled, self.progress.emit, self.owner)
+        except Exception as error:
+            # e.g. an unreadable or missing session file
+            if not self.cancelled.is_set():
+                self.failed.emit(self.channel, str(error) or type(error).__name__)
+            return
+        if blocks is None:
+            return
+        if self.cancelled.is_set():
+            self.data.release_channel(self.owner)
+        else:
+            self.loaded.emit(self.channel, blocks)
+
+    def cancel(self):
+        """
+        Abandons the loading. The thread stops after the current session.
+        
+        """
+        self.cancelled.set()
+
+
+class IngestTask(QtCore.QThread):
+    """
+    A thread that caches all channels of the given files.
+    
+    **Arguments**
+        
+        *data* (:class:`src.neodata.NeoData`):
+            Is needed because it has the ingestion routine.
+        *files* (list of string):
+            The list containing the file paths.
+                
+    """
+
+    ingested = QtCore.pyqtSignal()
+    """
+    Signal that is emitted when all channels have been cached.
+    
+    """
+
+    failed = QtCore.pyqtSignal(str)
+    """
+    Signal that is emitted with the error message
+    if some of the channels could not be cached.
+    
+    """
+
+    def __init__(self, data, files):
+        """
+        **Properties**
+        
+            *data* (:class:`src.neodata.NeoData`):
+                Is needed because it has the ingestion routine.
+            *files* (list of string):
+                The list containing the file paths.
+        
+        """
+        QtCore.QThread.__init__(self)
+        self.data = data
+        self.files = files
+
+    def run(self):
+        """
+        Runs the ingestion routine of 
+        the :class:`src.neodata.NeoData` object.
+        
+        """
+        try:
+            self.data.ingest(self.files)
+        except Exception as error:
+            self.failed.emit(str(error) or type(error).__name__)
+            return
+        self.ingested.emit()
+
+
+class PrefetchTask(QtCore.QThread):
+    """
+    A thread that prefetches the channels which are likely to be loaded next.
+    
+    **Arguments**
+        
+        *data* (:class:`src.neodata.NeoData`):
+            Is needed because it has the prefetching routine.
+        *files* (list of string):
+            The list containing the file paths.
+        *channels* (list of integer):
+            The channels that should be prefetched.
+                
+    """
+
+    def __init__(self, data, files, channels):
+        """
+        **Properties**
+        
+            *data* (:class:`src.neodata.NeoData`):
+                Is needed because it has the prefetching routine.
+            *files* (list of string):
+                The list containing the file paths.
+            *channels* (list of integer):
+                The channels that should be prefetched.
+        
+        """
+        QtCore.QThread.__init__(self)
+        self.data = data
+        self.files = files
+        self.channels = channels
+
+    def run(self):
+        """
+        Runs the prefetching routine of 
+        the :class:`src.neodata.NeoData` object.
+        
+        """
+        self.data.prefetch(self.files, self.channels)
 
 
 class MyStorage(Storage, QtCore.QObject):
@@ -77,6 +229,9 @@ class MyStorage(Storage, QtCore.QObject):
             The path to the main program. It has to end with the top-level directory swan.
         *cache_dir* (string):
             The default path of the cache directory.
+        *cache_budget* (integer or None):
+            The maximum size of the cache directory in bytes.
+            Default: None (no limit).
         
     """
 
@@ -86,7 +241,35 @@ class MyStorage(Storage, QtCore.QObject):
     
     """
 
-    def __init__(self, program_dir, cache_dir):
+    ingested = QtCore.pyqtSignal()
+    """
+    Signal that is emitted when all channels of the project have been cached.
+    
+    """
+
+    ingest_failed = QtCore.pyqtSignal(str)
+    """
+    Signal that is emitted with the error message when some
+    channels of the project could not be cached.
+    
+    """
+
+    channel_loaded = QtCore.pyqtSignal(int, int, int)
+    """
+    Signal that is emitted when a channel has been loaded. It contains
+    the channel, the number of unit rows and the number of sessions.
+    
+    """
+
+    channel_failed = QtCore.pyqtSignal(int, str)
+    """
+    Signal that is emitted when a channel could not be loaded. It contains
+    the channel and the error message. The channel that was loaded before
+    stays loaded.
+    
+    """
+
+    def __init__(self, program_dir, cache_dir, cache_budget=None):
         """
         **Properties**
         
@@ -98,12 +281,24 @@ class MyStorage(Storage, QtCore.QObject):
                 The path to the main program. It has to end with the top-level directory swan.
             *_cache_dir* (string):
                 The path to the cache directory.
+            *_cache_budget* (integer or None):
+                The maximum size of the cache directory in bytes.
             *_copy_i* (integer):
                 An integer that is used to create the project name.
                 If the default project name already exists, it will be changed by using
                 this attribute.
             *_loading* (boolean):
                 Whether or not something is loading at the moment.
+            *_load_task* (:class:`Task` or None):
+                The thread that loads the channel which will be shown next.
+            *_load_tasks* (list of :class:`Task`):
+                The loading threads that have been started.
+                Cancelled ones are kept until they have stopped.
+            *_ingest_task* (:class:`IngestTask` or None):
+                The thread that caches all channels in the background.
+            *_prefetch_tasks* (list of :class:`PrefetchTask`):
+                The threads that prefetch the next likely channels.
+                Older ones are kept until they have stopped.
         
         """
         super(MyStorage, self).__init__()
@@ -114,8 +309,13 @@ class MyStorage(Storage, QtCore.QObject):
         self._PNAME = "swan"
         self._program_dir = program_dir
         self._cache_dir = cache_dir
+        self._cache_budget = cache_budget
         self._copy_i = 1
         self._loading = False
+        self._load_task = None
+        self._load_tasks = []
+        self._ingest_task = None
+        self._prefetch_tasks = []
         # }
 
         self.store("channel", 1)
@@ -137,6 +337,32 @@ class MyStorage(Storage, QtCore.QObject):
         except:
             pass
 
+    def set_cache_budget(self, cache_budget):
+        """
+        Lets you change the maximum size of the cache directory.
+        
+        **Arguments**
+    
+            *cache_budget* (integer or None):
+                The new maximum size in bytes.
+        
+        """
+        self._cache_budget = cache_budget
+        try:
+            self.get_data().set_cache_budget(cache_budget)
+        except:
+            pass
+
+    def get_cache_usage(self):
+        """
+        Returns the size of the cache directory.
+        
+            **Returns**: integer
+                The size in bytes.
+        
+        """
+        return CacheManager(self._cache_dir).usage()
+
     def load_project(self, prodir, proname, channel, files=None):
         """
         Creates or loads a new project.
@@ -168,6 +394,9 @@ class MyStorage(Storage, QtCore.QObject):
         if not loadFiles and len(files) == 0:
             return False
 
+        # the channel of the old project must not be shown anymore
+        self.cancel_loading()
+
         # if something goes wrong, you can back to the old project
         tmp = self._project
 
@@ -209,7 +438,7 @@ class MyStorage(Storage, QtCore.QObject):
                 pass
 
             # creating the important NeoData object
-            neodata = NeoData(self._cache_dir)
+            neodata = NeoData(self._cache_dir, cache_budget=self._cache_budget)
             neodata.progress.connect(self.setProgress)
             self.store("data", neodata)
 
@@ -527,44 +756,177 @@ class MyStorage(Storage, QtCore.QObject):
 
     def load_channel(self, channel):
         """
-        Loads a channel.
+        Starts loading a channel and returns immediately.
+        
+        A load that is still running is cancelled, so only the
+        channel that was requested last will be shown.
+        The :attr:`channel_loaded` signal is emitted when the
+        channel has been loaded.
         
         **Arguments**
         
             *channel* (integer):
                 The channel that should be loaded.
         
-            **Returns**: tuple of integer
-                The number of unit rows and the number of sessions.
-        
         """
-        self.set_channel(channel)
-        data = self.get("data")
-        files = self.get("files")
+        self.cancel_loading()
 
-        # loading with a thread
-        t = Task(data, files, channel)
-        t.start()
-        while t.isRunning():
-            self._loading = t.isRunning()
-            QtGui.QApplication.processEvents()
-        self._loading = t.isRunning()
+        task = Task(self.get("data"), self.get("files"), channel)
+        task.loaded.connect(partial(self._on_loaded, task))
+        task.failed.connect(partial(self._on_failed, task))
+        task.progress.connect(partial(self._on_progress, task))
+        self._load_task = task
+        self._load_tasks = [t for t in self._load_tasks if t.isRunning()] + [task]
+        self._loading = True
+        task.start()
 
-        vum_all = self.get("vum_all")
-        name = "vum" + str(channel)
+    def cancel_loading(self):
+        """
+        Cancels the running load. Its result will be ignored.
+        
+        """
+        if self._load_task is not None:
+            self._load_task.cancel()
+            self._load_task.progress.disconnect()
+            self._load_task = None
+        self._loading = False
 
-        vumap = VirtualUnitMap()
+    def _on_loaded(self, task, channel, blocks):
+        """
+        This method is called in the main thread if a :class:`Task` has read a channel.
+        
+        Replaces the loaded blocks, sets the channel and 
+        the mapping and emits the :attr:`channel_loaded` signal.
+        
+        **Arguments**
+        
+            *task* (:class:`Task`):
+                The thread that has read the channel.
+            *channel* (integer):
+                The loaded channel.
+            *blocks* (list of :class:`neo.core.block.Block`):
+                The read blocks.
+        
+        """
+        if task is not self._load_task or task.cancelled.is_set():
+            # the blocks were read before the task was cancelled
+            task.data.release_channel(task.owner)
+            return
+        self._load_task = None
 
-        # load a mapping or set the default one
         try:
-            vum = vum_all[name]
-            vumap.set_map(data.total_units_per_block, vum)
-        except KeyError:
-            vumap.set_initial_map(data)
+            data = task.data
+            try:
+                data.set_blocks(blocks, task.files, channel, task.owner)
+            except ValueError as error:
+                # the blocks of the channel can not be shown together
+                self._loading = False
+                self.channel_failed.emit(channel, str(error))
+                return
+            self.set_channel(channel)
+
+            vum_all = self.get("vum_all")
+            name = "vum" + str(channel)
+
+            vumap = VirtualUnitMap()
+
+            # load a mapping or set the default one
+            try:
+                vum = vum_all[name]
+                vumap.set_map(data.total_units_per_block, vum)
+            except KeyError:
+                vumap.set_initial_map(data)
+
+            self.store("vum", vumap)
+        finally:
+            self._loading = False
+
+        self.channel_loaded.emit(channel, sum(data.total_units_per_block), len(vumap.mapping))
+
+    def _on_progress(self, task, i):
+        """
+        This method is called in the main thread if a :class:`Task` has read a session.
+        
+        Emits the :attr:`progress` signal unless the task was cancelled,
+        because its signals may still be queued.
+        
+        **Arguments**
+        
+            *task* (:class:`Task`):
+                The thread that is reading the channel.
+            *i* (integer):
+                The loading progress.
+        
+        """
+        if task is self._load_task and not task.cancelled.is_set():
+            self.progress.emit(i)
+
+    def _on_failed(self, task, channel, message):
+        """
+        This method is called in the main thread if a :class:`Task` could not read a channel.
+        
+        Emits the :attr:`channel_failed` signal.
+        
+        **Arguments**
+        
+            *task* (:class:`Task`):
+                The thread that has tried to read the channel.
+            *channel* (integer):
+                The channel.
+            *message* (string):
+                The error message.
+        
+        """
+        if task is not self._load_task or task.cancelled.is_set():
+            return
+        self._load_task = None
+        self._loading = False
+        self.channel_failed.emit(channel, message)
 
-        self.store("vum", vumap)
+    def ingest(self):
+        """
+        Starts caching all channels of the project in the background.
+        
+        Every file is read only once, see :func:`src.neodata.NeoData.ingest`.
+        The :attr:`ingested` signal is emitted when the caching is done,
+        the :attr:`ingest_failed` signal if some channels could not be cached.
+        
+        """
+        if self.is_ingesting():
+            return
+        task = IngestTask(self.get_data(), self.get("files"))
+        task.setPriority(QtCore.QThread.LowPriority)
+        task.ingested.connect(self.ingested.emit)
+        task.failed.connect(self.ingest_failed.emit)
+        self._ingest_task = task
+        task.start()
 
-        return sum(data.total_units_per_block), len(vumap.mapping)
+    def is_ingesting(self):
+        """
+        Getter for the ingestion information.
+        
+            **Returns**: boolean
+                If all channels are being cached at the moment.
+        
+        """
+        return self._ingest_task is not None and self._ingest_task.isRunning()
+
+    def prefetch(self, channels):
+        """
+        Starts prefetching the given channels in the background.
+        
+        See :func:`src.neodata.NeoData.prefetch`.
+        
+        **Arguments**
+        
+            *channels* (list of integer):
+                The channels in the order of their likelihood to be loaded next.
+        
+        """
+        # a new run stops the previous one by itself
+        task = PrefetchTask(self.get_data(), self.get("files"), channels)
+        self._prefetch_tasks = [t for t in self._prefetch_tasks if t.isRunning()] + [task]
+        task.start(QtCore.QThread.IdlePriority)
 
     def read_file(self):
         """
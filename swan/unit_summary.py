@@ -0,0 +1,234 @@
+"""
+Created on Oct 18, 2026
+
+@author: SWAN authors and contributors
+
+In this module you can find the :class:`UnitSummary` which holds the
+per-unit values the views need most often.
+
+The summaries are computed once when a cache entry is written
+(see :class:`swan.columnar_io.ColumnarIO`), so that changing the channel
+does not need to go through all waveforms and spikes again.
+"""
+# system imports
+import numpy as np
+import quantities as pq
+from scipy.signal import butter, filtfilt
+
+RATE_PROFILE = {"order": 4, "Wn": 0.008, "bins": 4000}
+"""
+The parameters of the rate profile that is stored in the summaries.
+
+"""
+
+DENSITY_BINS = 64
+"""
+The number of amplitude bins of the waveform density that is stored in the summaries.
+
+"""
+
+
+def rate_profile(times, order=4, Wn=0.008, bins=4000):
+    """
+    Computes the low-pass filtered spike count histogram of a spike train.
+
+    **Arguments**
+
+        *times* (numpy array):
+            The spike times.
+        *order* (integer):
+            The order of the butterworth filter.
+            Default: 4.
+        *Wn* (float):
+            The critical frequency of the butterworth filter.
+            Default: 0.008.
+        *bins* (integer):
+            The number of bins of the histogram.
+            Default: 4000.
+
+        **Returns**: numpy array of shape (bins,)
+            The rate profile.
+
+    """
+    b, a = butter(order, Wn)
+    hist, bin_edges = np.histogram(times, bins=bins)
+    return filtfilt(b, a, hist)
+
+
+def waveform_moments(waveforms, chunk_bytes=2 ** 24):
+    """
+    Computes the mean, the standard deviation and the extremes of waveforms
+    in chunks of spikes.
+
+    The chunks are combined with the parallel variant of Welford's algorithm,
+    so at most a few chunks of float64 temporaries are allocated at a time.
+    For memory mapped waveforms only one chunk is paged in at a time.
+
+    **Arguments**
+
+        *waveforms* (numpy array of shape (spikes, channels, samples)):
+            The waveforms.
+        *chunk_bytes* (integer):
+            The size in bytes of one chunk converted to float64.
+            Default: 16 MB.
+
+        **Returns**: tuple
+            The mean and the standard deviation of shape (channels, samples)
+            and an array containing the minimum and the maximum.
+
+    """
+    n = len(waveforms)
+    shape = waveforms.shape[1:]
+    if n == 0:
+        return np.full(shape, np.nan), np.full(shape, np.nan), np.array([np.nan, np.nan])
+
+    step = max(1, chunk_bytes // (8 * max(1, int(np.prod(shape)))))
+    count = 0
+    mean = np.zeros(shape)
+    m2 = np.zeros(shape)
+    extremes = np.array([np.inf, -np.inf])
+    for start in range(0, n, step):
+        # always a copy, the chunk is centered in place
+        chunk = np.array(waveforms[start:start + step], dtype=np.float64)
+        k = len(chunk)
+        extremes[0] = min(extremes[0], chunk.min())
+        extremes[1] = max(extremes[1], chunk.max())
+        chunk_mean = chunk.mean(axis=0)
+        chunk -= chunk_mean
+        chunk_m2 = np.einsum("i...,i...->...", chunk, chunk)
+        delta = chunk_mean - mean
+        total = count + k
+        mean += delta * (k / total)
+        m2 += chunk_m2 + delta ** 2 * (count * k / total)
+        count = total
+    return mean, np.sqrt(m2 / count), extremes
+
+
+def waveform_density(waveforms, extremes, bins=DENSITY_BINS, chunk_bytes=2 ** 24):
+    """
+    Computes the histogram of the waveforms of the first channel
+    over time and amplitude.
+
+    Every sample of every waveform is assigned to its amplitude bin and all
+    of them are counted with one :func:`numpy.bincount` per chunk of spikes.
+
+    **Arguments**
+
+        *waveforms* (numpy array of shape (spikes, channels, samples)):
+            The waveforms.
+        *extremes* (numpy array of shape (2,)):
+            The minimum and the maximum of the waveforms,
+            which are the borders of the amplitude bins.
+        *bins* (integer):
+            The number of amplitude bins.
+            Default: :data:`DENSITY_BINS`.
+        *chunk_bytes* (integer):
+            The size in bytes of one chunk converted to float64.
+            Default: 16 MB.
+
+        **Returns**: numpy array of shape (samples, bins)
+            The number of waveforms in every time and amplitude bin.
+
+    """
+    samples = waveforms.shape[-1]
+    counts = np.zeros(samples * bins, dtype=np.int64)
+    low, high = extremes
+    if len(waveforms) == 0 or not np.isfinite(low) or not np.isfinite(high):
+        return counts.reshape(samples, bins).astype(np.uint32)
+
+    width = (high - low) / bins if high > low else 1.0
+    offsets = np.arange(samples) * bins
+    step = max(1, chunk_bytes // (8 * samples))
+    for start in range(0, len(waveforms), step):
+        chunk = np.asarray(waveforms[start:start + step, 0], dtype=np.float64)
+        index = np.clip(((chunk - low) / width).astype(np.int64), 0, bins - 1)
+        counts += np.bincount((index + offsets).ravel(), minlength=samples * bins)
+    return counts.reshape(samples, bins).astype(np.uint32)
+
+
+def intervals(train):
+    """
+    Computes the inter-spike intervals of a spike train.
+
+    **Arguments**
+
+        *train* (:class:`neo.core.spiketrain.SpikeTrain`):
+            The spike train.
+
+        **Returns**: numpy array
+            The intervals between the sorted spike times in seconds.
+
+    """
+    vek = train.copy().rescale(pq.s)
+    vek.sort()
+    d = vek[1:] - vek[:len(vek) - 1]
+    return d.magnitude
+
+
+class UnitSummary(object):
+    """
+    The summary of the spike train of one unit.
+
+    **Arguments**
+
+        *mean* (numpy array of shape (channels, samples)):
+            The average waveform.
+        *std* (numpy array of shape (channels, samples)):
+            The standard deviation of the waveforms.
+        *extremes* (numpy array of shape (2,)):
+            The minimum and the maximum of all waveforms.
+        *isi* (numpy array):
+            The inter-spike intervals in seconds.
+        *rate_profile* (numpy array):
+            The rate profile computed with the parameters in :data:`RATE_PROFILE`.
+        *density* (numpy array of shape (samples, bins) or None):
+            The waveform density, see :func:`waveform_density`.
+            Default: None.
+
+    """
+
+    def __init__(self, mean, std, extremes, isi, rate_profile, density=None):
+        """
+        **Properties**
+
+            *mean* (numpy array of shape (channels, samples)):
+                The average waveform.
+            *std* (numpy array of shape (channels, samples)):
+                The standard deviation of the waveforms.
+            *minimum* (float):
+                The minimum of all waveforms.
+            *maximum* (float):
+                The maximum of all waveforms.
+            *isi* (numpy array):
+                The inter-spike intervals in seconds.
+            *rate_profile* (numpy array):
+                The rate profile computed with the parameters in :data:`RATE_PROFILE`.
+            *density* (numpy array of shape (samples, bins) or None):
+                The waveform density between *minimum* and *maximum*.
+
+        """
+        self.mean = mean
+        self.std = std
+        self.minimum, self.maximum = extremes
+        self.isi = isi
+        self.rate_profile = rate_profile
+        self.density = density
+
+    @classmethod
+    def compute(cls, train):
+        """
+        Computes the summary of a spike train.
+
+        **Arguments**
+
+            *train* (:class:`neo.core.spiketrain.SpikeTrain`):
+                The spike train. It must have waveforms.
+
+            **Returns**: :class:`UnitSummary`
+                The summary.
+
+        """
+        waveforms = train.waveforms.magnitude
+        mean, std, extremes = waveform_moments(waveforms)
+        return cls(mean, std, extremes, np.asarray(intervals(train), dtype=np.float64),
+                   rate_profile(train.magnitude, **RATE_PROFILE), waveform_density(waveforms, extremes))
@@ -13,6 +13,63 @@ import numpy as np
 from swan.gui.isi_options_ui import IsiOptionsUi
 
 
+def histogram_sorted(values, bins):
+    """
+    Computes a histogram like :func:`numpy.histogram` for sorted values.
+    
+    Only the bin edges are searched in the values, so the cost does not
+    depend on the number of values.
+    
+    **Arguments**
+    
+        *values* (numpy array):
+            The sorted values.
+        *bins* (numpy array):
+            The monotonically increasing bin edges.
+    
+        **Returns**: numpy array
+            The counts per bin. The last bin includes its right edge.
+    
+    """
+    if len(bins) < 2:
+        return np.zeros(0, dtype=np.intp)
+    positions = np.searchsorted(values, bins, side="left")
+    positions[-1] = np.searchsorted(values, bins[-1], side="right")
+    return np.diff(positions)
+
+
+def pooled_histograms(groups, bins):
+    """
+    Computes the histograms of groups of sorted arrays all at once.
+    
+    The counts of every array are found with :func:`histogram_sorted`.
+    They are summed per group with a single :func:`numpy.bincount`
+    on the combined (group, bin) indices.
+    
+    **Arguments**
+    
+        *groups* (list of list of numpy array):
+            The sorted arrays of every group.
+        *bins* (numpy array):
+            The monotonically increasing bin edges.
+    
+        **Returns**: tuple
+            The counts of shape (groups, bins - 1) and the number of values per group.
+    
+    """
+    n_bins = max(len(bins) - 1, 0)
+    owners = np.repeat(np.arange(len(groups)), [len(group) for group in groups])
+    arrays = [array for group in groups for array in group]
+    if not arrays:
+        return np.zeros((len(groups), n_bins)), np.zeros(len(groups))
+
+    counts = np.vstack([histogram_sorted(array, bins) for array in arrays]).reshape(len(arrays), n_bins)
+    indices = owners[:, np.newaxis] * n_bins + np.arange(n_bins)
+    pooled = np.bincount(indices.ravel(), weights=counts.ravel(), minlength=len(groups) * n_bins)
+    totals = np.bincount(owners, weights=[len(array) for array in arrays], minlength=len(groups))
+    return pooled.reshape(len(groups), n_bins), totals
+
+
 class PgWidgetISI(PyQtWidget2d):
     """
     A class with only one plot that shows simple 2d data.
@@ -25,6 +82,8 @@ class PgWidgetISI(PyQtWidget2d):
         
             *_axes* (:class:`matplotlib.axes.Axes`):
                 The 2d plot for this widget.
+            *isi_cache* (dictionary):
+                Maps the ids of the units to the units and their sorted intervals.
         
         """
         PyQtWidget2d.__init__(self, *args, **kwargs)
@@ -37,6 +96,8 @@ class PgWidgetISI(PyQtWidget2d):
         self.plot_item.enableAutoRange()
         self.histograms = []
         self.datas = {}
+        self.isi_cache = {}
+        self._channel_data = None
 
         self.bin_max = 500
         self.bin_step = 2
@@ -206,6 +267,36 @@ class PgWidgetISI(PyQtWidget2d):
         self.histograms.append(self.make_plot(x=x, y=y, color=color, unit_id=unit_id, session=session,
                                               clickable=clickable, stepMode=self.step_mode))
 
+    def get_intervals(self, data, unit):
+        """
+        Returns the sorted inter-spike intervals of a unit.
+        
+        They are sorted only once per unit and cached until another channel is loaded.
+        
+        **Arguments**
+        
+            *data* (:class:`src.neodata.NeoData`):
+                Is needed to get the intervals.
+            *unit* (:class:`neo.core.unit.Unit`):
+                The unit.
+        
+            **Returns**: numpy array
+                The sorted inter-spike intervals in seconds.
+        
+        """
+        entry = self.isi_cache.get(id(unit))
+        if entry is None or entry[0] is not unit:
+            entry = (unit, np.sort(data.get_data("units", unit)[0]))
+            self.isi_cache[id(unit)] = entry
+        return entry[1]
+
+    def get_bin_edges(self):
+        """
+        Returns the bin edges of the histograms in seconds.
+        
+        """
+        return np.arange(0., self.bin_max / 1000., self.bin_step / 1000.)
+
     def do_plot(self, vum, data):
         """
         Plots data for every layer and every visible unit.
@@ -227,80 +318,64 @@ class PgWidgetISI(PyQtWidget2d):
             layer = self.toolbar.get_checked_layers()[0]
 
             active = vum.get_active()
+            if data.channel_data is not self._channel_data:
+                # the intervals of another channel are not needed anymore
+                self._channel_data = data.channel_data
+                self.isi_cache.clear()
 
             if layer == "pooled":
                 clickable = False
                 intervals = {}
                 for session in range(len(active)):
                     for unit_id in range(len(active[session])):
-                        if unit_id not in intervals:
-                            intervals[unit_id] = []
                         if active[session][unit_id]:
                             runit = vum.get_realunit(session, unit_id, data)
-                            d = data.get_data("sessions", runit)
-                            intervals[unit_id].extend(d)
+                            intervals.setdefault(unit_id, []).append(self.get_intervals(data, runit))
                             col = vum.get_colour(unit_id)
-                            self.datas[unit_id] = [np.sort(intervals[unit_id]), col, unit_id, session, clickable]
-
-                if intervals:
-                    for key in self.datas.keys():
-                        y = np.histogram(self.datas[key][0],
-                                         bins=np.arange(0., self.bin_max / 1000., self.bin_step / 1000.))
-                        tmp = y[1]
-                        if self.step_mode:
-                            tmp = tmp[:]
-                        else:
-                            tmp = tmp[:-1]
-                        self.plot_histogram(x=tmp, y=y[0] / (1.0 * len(self.datas[key][0])), color=self.datas[key][1],
-                                            unit_id=self.datas[key][2], session=self.datas[key][3],
-                                            clickable=self.datas[key][4])
-                self.set_x_label("Inter-spike Interval", "s")
-                self.set_y_label("Normalized Percentage of Interval Counts")
-                self.set_plot_title("Inter-spike Interval Histograms")
+                            self.datas[unit_id] = [intervals[unit_id], col, unit_id, session, clickable]
             elif layer == "individual":
                 for session in range(len(active)):
                     for unit_id in range(len(active[session])):
                         if active[session][unit_id]:
                             runit = vum.get_realunit(session, unit_id, data)
-                            datas = data.get_data("units", runit)
+                            datas = [self.get_intervals(data, runit)]
                             col = vum.get_colour(unit_id)
                             clickable = True
                             self.datas["{}{}".format(session, unit_id)] = [datas, col, unit_id, session, clickable]
-                            for d in datas:
-                                y = np.histogram(d, bins=np.arange(0., self.bin_max / 1000., self.bin_step / 1000.))
-                                tmp = y[1]
-                                if self.step_mode:
-                                    tmp = tmp[:]
-                                else:
-                                    tmp = tmp[:-1]
-                                self.plot_histogram(x=tmp, y=y[0] / (1.0 * len(d)), color=col, unit_id=unit_id,
-                                                    session=session, clickable=clickable)
-                self.set_x_label("Inter-spike Interval", "s")
-                self.set_y_label("Normalized Percentage of Interval Counts")
-                self.set_plot_title("Inter-spike Interval Histograms")
-            self.connect_plots()
+            self.update()
 
     def update(self):
+        """
+        Plots the histograms of the intervals in :attr:`datas`.
+        
+        The intervals are sorted, so the counts are the differences of the
+        positions of the bin edges in them. Changing the bins does not
+        need to go through the intervals again.
+        
+        The intervals of all sessions of an entry are pooled into one histogram,
+        see :func:`pooled_histograms`.
+        
+        """
         self.clear_()
-        for key in self.datas:
+        bins = self.get_bin_edges()
+        keys = list(self.datas.keys())
+        counts, totals = pooled_histograms([self.datas[key][0] for key in keys], bins)
+        tmp = bins
+        if self.step_mode:
+            tmp = tmp[:]
+        else:
+            tmp = tmp[:-1]
+        for key, y, total in zip(keys, counts, totals):
             datas = self.datas[key]
-            data = datas[0]
             col = datas[1]
             unit_id = datas[2]
             session = datas[3]
             clickable = datas[4]
-            for d in data:
-                y = np.histogram(d, bins=np.arange(0., self.bin_max / 1000., self.bin_step / 1000.))
-                tmp = y[1]
-                if self.step_mode:
-                    tmp = tmp[:]
-                else:
-                    tmp = tmp[:-1]
-                self.plot_histogram(x=tmp, y=y[0] / (1.0 * len(d)), color=col,
-                                    unit_id=unit_id, session=session, clickable=clickable)
-                self.set_x_label("Inter-spike Interval", "s")
-                self.set_y_label("Normalized Percentage of Interval Counts")
-                self.set_plot_title("Inter-spike Interval Histograms")
+            self.plot_histogram(x=tmp, y=y / (1.0 * total), color=col,
+                                unit_id=unit_id, session=session, clickable=clickable)
+        self.set_x_label("Inter-spike Interval", "s")
+        self.set_y_label("Normalized Percentage of Interval Counts")
+        self.set_plot_title("Inter-spike Interval Histograms")
         self.connect_plots()
 
     def connect_plots(self):
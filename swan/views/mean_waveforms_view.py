@@ -7,25 +7,63 @@ In this module you can find the :class:`pgWidget2d` which inherits
 from :class:`src.mypgwidget.PyQtWidget2d`.
 
 It is extended by a 2d plot and the plotting methods.
+
+The mean waveforms of all units with the same colour are drawn as one
+curve item and their standard deviation bands as one filled path,
+so the number of graphics items does not grow with the number of units.
 """
 from swan.widgets.mypgwidget import PyQtWidget2d
-from numpy import arange
+import numpy as np
+import pyqtgraph as pg
+from pyqtgraph.Qt import QtCore, QtGui, QtWidgets
 from quantities import V
 
 
+class MeanCurve(object):
+    """
+    A reference to the mean waveform of one unit in a batched curve item.
+
+    It is emitted with :attr:`PgWidget2d.sig_clicked` in place of a plot item
+    and has the same *opts* entries that are used to find the unit.
+
+    **Arguments**
+
+        *session* (integer):
+            The session index.
+        *unit_id* (integer):
+            The global unit id.
+
+    """
+
+    def __init__(self, session, unit_id):
+        self.opts = {"session": session, "unit_id": unit_id, "clickable": True}
+
+
 class PgWidget2d(PyQtWidget2d):
     """
     A class with only one plot that shows simple 2d data.
-    
+
     """
 
     def __init__(self):
         """
         **Properties**
-        
+
             *_axes* (:class:`matplotlib.axes.Axes`):
                 The 2d plot for this widget.
-        
+            *_means* (list of :class:`pyqtgraph.PlotDataItem`):
+                The mean waveform items, one per colour.
+            *_stds* (list of :class:`QtWidgets.QGraphicsPathItem`):
+                The standard deviation bands, one per colour.
+            *_keys* (list of tuple):
+                The (session, global unit id) of every row of *_mean_matrix*.
+            *_index* (dictionary):
+                Maps (session, global unit id) to the row in *_mean_matrix*.
+            *_mean_matrix* (numpy array of shape (units, samples) or None):
+                The plotted mean waveforms in V, used for hit-testing.
+            *_highlighted* (dictionary):
+                Maps (session, global unit id) to the items highlighting selected units.
+
         """
         PyQtWidget2d.__init__(self)
 
@@ -40,7 +78,18 @@ class PgWidget2d(PyQtWidget2d):
         self._means = []
         self._stds = []
 
+        self._x = None
+        self._keys = []
+        self._colours = []
+        self._index = {}
+        self._mean_matrix = None
+        self._highlighted = {}
+        self._scales = {}
+
         self.fill_alpha = 50
+        self.click_width = 5
+
+        self.pg_canvas.scene().sigMouseClicked.connect(self.on_scene_clicked)
 
         self.show_grid()
 
@@ -51,84 +100,132 @@ class PgWidget2d(PyQtWidget2d):
         color_with_alpha = color + (self.fill_alpha,)
         return self.create_filled_curve_item(y1=y1, y2=y2, color=color_with_alpha)
 
-    def plot_mean(self, x, y, color, unit_id, session, clickable=False):
+    def to_volts(self, quantity):
         """
-        Plot mean waveforms to the plot.
-        
+        Returns the magnitude of a quantity array in V.
+
+        The conversion factor is computed once per unit,
+        so the arrays are not rescaled one by one.
+
         **Arguments**
-        
-            *y* (iterable object):
-                The data that should be plotted.
+
+            *quantity* (:class:`quantities.Quantity`):
+                The array with units of voltage.
+
+            **Returns**: numpy array
+                The magnitude in V.
+
+        """
+        key = quantity.dimensionality.string
+        if key not in self._scales:
+            self._scales[key] = float((1.0 * quantity.units).rescale(V).magnitude)
+        return quantity.magnitude * self._scales[key]
+
+    def plot_means(self, x, ys, color):
+        """
+        Plots the mean waveforms of units with the same colour as one curve.
+
+        **Arguments**
+
+            *x* (numpy array of shape (samples,)):
+                The time points.
+            *ys* (numpy array of shape (units, samples)):
+                The mean waveforms.
             *color* (tuple of integer):
-                The color of the line.
-            *name* (string):
-                The name of the curve. Of the form "ij",
-                where i is the session and j is the unit.
-                Useful in recognizing the plot.
-            *clickable* (bool):
-                Whether the item should respond to mouseclicks.
-        
+                The color of the lines.
+
         """
-        self._means.append(self.make_plot(x=x, y=y, color=color, unit_id=unit_id, session=session, clickable=clickable))
+        n = len(ys)
+        # the curves are separated by NaN, so they are not connected
+        xs = np.empty((n, len(x) + 1))
+        xs[:, :-1] = x
+        xs[:, -1] = np.nan
+        values = np.empty((n, len(x) + 1))
+        values[:, :-1] = ys
+        values[:, -1] = np.nan
+        self._means.append(self.make_plot(x=xs.ravel(), y=values.ravel(), color=color, connect="finite"))
 
-    def plot_std(self, xs, ys, color):
+    def plot_stds(self, x, lower, upper, color):
         """
-        Plots data to the plot.
-        
+        Plots the standard deviation bands of units with the same colour as one filled path.
+
         **Arguments**
-        
-            *y* (iterable object):
-                The data that should be plotted.
+
+            *x* (numpy array of shape (samples,)):
+                The time points.
+            *lower* (numpy array of shape (units, samples)):
+                The lower borders of the bands.
+            *upper* (numpy array of shape (units, samples)):
+                The upper borders of the bands.
             *color* (tuple of integer):
-                The color of the line.
-        
+                The color of the bands.
+
         """
-        curve1 = self.create_curve(x=xs, y=ys[0], color=color, clickable=False)
-        curve2 = self.create_curve(x=xs, y=ys[1], color=color, clickable=False)
-        self._stds.append(self.create_filled_curve(y1=curve1, y2=curve2, color=color))
+        n = len(lower)
+        # one closed polygon per unit: along the upper border and back along the lower one
+        xs = np.tile(np.concatenate([x, x[::-1]]), n)
+        ys = np.concatenate([upper, lower[:, ::-1]], axis=1).ravel()
+        connect = np.ones((n, 2 * len(x)), dtype=bool)
+        connect[:, -1] = False
+        path = pg.arrayToQPath(xs, ys, connect=connect.ravel())
+        # overlapping bands of the same colour are not cut out of each other
+        path.setFillRule(QtCore.Qt.WindingFill)
+
+        item = QtWidgets.QGraphicsPathItem(path)
+        item.setPen(QtGui.QPen(QtCore.Qt.NoPen))
+        item.setBrush(pg.mkBrush(color + (self.fill_alpha,)))
+        self._stds.append(item)
 
     def do_plot(self, vum, data):
         """
         Plots data for every layer and every visible unit.
-        
+
         **Arguments**
-        
+
             *vum* (:class:`src.virtualunitmap.VirtualUnitMap`):
                 Is needed to get the unit indexes.
             *data* (:class:`src.neodata.NeoData`):
                 Is needed to get the units.
             *layers* (list of string):
                 The layers that are visible.
-        
+
         """
         self.clear_plots()
         if self.toolbar.activate_button.current_state:
 
             layers = self.toolbar.get_checked_layers()
+            for layer in layers:
+                if layer not in ("average", "standard deviation"):
+                    raise Exception("Invalid layer requested!")
             active = vum.get_active()
 
+            means = []
+            stds = []
             for session in range(len(active)):
                 for unit_id in range(len(active[session])):
                     if active[session][unit_id]:
-                        for layer in layers:
-                            if layer == "standard deviation":
-                                runit = vum.get_realunit(session, unit_id, data)
-                                datas = data.get_data(layer, runit)
-                                col = vum.get_colour(unit_id)
-                                xs = arange(data.get_wave_length()) * 1 / data.sampling_rate.magnitude
-                                ys = datas.rescale(V)
-                                self.plot_std(xs=xs, ys=ys, color=col)
-
-                            elif layer == "average":
-                                runit = vum.get_realunit(session, unit_id, data)
-                                datas = data.get_data(layer, runit)
-                                col = vum.get_colour(unit_id)
-                                x = arange(data.get_wave_length()) * 1 / data.sampling_rate.magnitude
-                                y = datas.rescale(V)
-                                self.plot_mean(x=x, y=y, color=col, unit_id=unit_id, session=session, clickable=True)
-
-                            else:
-                                raise Exception("Invalid layer requested!")
+                        runit = vum.get_realunit(session, unit_id, data)
+                        self._index[(session, unit_id)] = len(self._keys)
+                        self._keys.append((session, unit_id))
+                        self._colours.append(tuple(vum.get_colour(unit_id)))
+                        if "average" in layers:
+                            means.append(self.to_volts(data.get_data("average", runit)))
+                        if "standard deviation" in layers:
+                            stds.append(self.to_volts(data.get_data("standard deviation", runit)))
+
+            self._x = np.arange(data.get_wave_length()) * 1 / data.sampling_rate.magnitude
+            groups = {}
+            for i, colour in enumerate(self._colours):
+                groups.setdefault(colour, []).append(i)
+
+            if means:
+                self._mean_matrix = np.array(means)
+                for colour, rows in groups.items():
+                    self.plot_means(x=self._x, ys=self._mean_matrix[rows], color=colour)
+            if stds:
+                stds = np.array(stds)
+                for colour, rows in groups.items():
+                    self.plot_stds(x=self._x, lower=stds[rows, 0], upper=stds[rows, 1], color=colour)
 
             self.set_x_label("Time", "s")
             self.set_y_label("Voltage", "V")
@@ -137,16 +234,95 @@ class PgWidget2d(PyQtWidget2d):
             if self._stds:
                 for std in self._stds:
                     self.plot_item.addItem(std)
-            self.connect_plots()
 
-    def connect_plots(self):
-        for item in self._means:
-            item.curve.setClickable(True, width=5)
-            item.sigClicked.connect(self.get_item)
+    def find_curve(self, x, y):
+        """
+        Finds the mean waveform next to a point.
+
+        **Arguments**
+
+            *x* (float):
+                The time of the point.
+            *y* (float):
+                The voltage of the point.
+
+            **Returns**: tuple or None
+                The (session, global unit id) of the nearest curve or None
+                if no curve is within :attr:`click_width` pixels.
+
+        """
+        if self._mean_matrix is None or len(self._x) < 2:
+            return None
+        px, py = self.plot_item.vb.viewPixelSize()
+        if px == 0 or py == 0:
+            return None
+
+        # the segments around the point in pixels, for all curves at once
+        j = int(np.clip(np.searchsorted(self._x, x), 1, len(self._x) - 1))
+        columns = np.arange(max(j - 2, 0), min(j + 2, len(self._x)))
+        xs = (self._x[columns] - x) / px
+        ys = (self._mean_matrix[:, columns] - y) / py
+        x0, x1 = xs[:-1], xs[1:]
+        y0, y1 = ys[:, :-1], ys[:, 1:]
+        dx, dy = x1 - x0, y1 - y0
+        length = dx ** 2 + dy ** 2
+        t = np.clip(-(x0 * dx + y0 * dy) / np.where(length > 0, length, 1.0), 0.0, 1.0)
+        distances = np.hypot(x0 + t * dx, y0 + t * dy).min(axis=1)
+
+        i = int(np.nanargmin(distances)) if np.isfinite(distances).any() else None
+        if i is None or distances[i] > self.click_width:
+            return None
+        return self._keys[i]
+
+    def on_scene_clicked(self, event):
+        """
+        This method is called if you click into the plot.
+
+        Emits :attr:`sig_clicked` with a :class:`MeanCurve`
+        if a mean waveform was clicked.
+
+        """
+        if event.button() != QtCore.Qt.LeftButton or event.isAccepted():
+            return
+        vb = self.plot_item.vb
+        if not vb.sceneBoundingRect().contains(event.scenePos()):
+            return
+        point = vb.mapSceneToView(event.scenePos())
+        key = self.find_curve(point.x(), point.y())
+        if key is not None:
+            event.accept()
+            self.get_item(MeanCurve(*key))
+
+    @QtCore.pyqtSlot(object, bool)
+    def highlight_curve_from_plot(self, plot, select):
+        key = tuple(plot.pos)
+        i = self._index.get(key)
+        if i is None or self._mean_matrix is None:
+            return
+
+        if select:
+            if key not in self._highlighted:
+                curve = self.make_plot(x=self._x, y=self._mean_matrix[i], color=self._colours[i])
+                curve.setShadowPen('w', width=3)
+                self._highlighted[key] = curve
+                self.selected_curves.append(curve)
+
+        elif not select:
+            curve = self._highlighted.pop(key, None)
+            if curve is not None:
+                self.pg_canvas.removeItem(curve)
+                if curve in self.selected_curves:
+                    self.selected_curves.remove(curve)
 
     def clear_plots(self):
         self._means = []
         for item in self._stds:
             self.pg_canvas.removeItem(item)
         self._stds = []
+        self._x = None
+        self._keys = []
+        self._colours = []
+        self._index = {}
+        self._mean_matrix = None
+        self._highlighted = {}
         self.clear_all()
@@ -174,11 +174,11 @@ class PgWidgetPCA(PyQtWidget3d):
             total_length += len(unit)
             length_vector.append(total_length)
 
-        waves = zeros((total_length, self.wave_length))
+        # compact float32 waveforms are not widened
+        waves = zeros((total_length, self.wave_length), dtype=session[0].dtype if session else float)
 
         for u, unit in enumerate(session):
-            for wf, wave in enumerate(unit):
-                waves[wf + length_vector[u]] = wave
+            waves[length_vector[u]:length_vector[u + 1]] = unit
 
         return waves, length_vector
 
@@ -9,15 +9,19 @@ from :class:`src.mypgwidget.PyQtWidget2d`.
 It is extended by a 2d plot and the plotting methods.
 """
 # system imports
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+
 import numpy as np
 import quantities as pq
-from neo import SpikeTrain
-from elephant.statistics import instantaneous_rate
-from elephant.kernels import GaussianKernel
-from pyqtgraph.Qt import QtWidgets, QtCore
+from pyqtgraph.Qt import QtCore
 
 # swan-specific imports
 from swan.widgets.mypgwidget import PyQtWidget2d
+from swan.psth import compute_psths
 from swan.gui.rate_profile_options_ui import RpOptionsUi
 
 
@@ -33,6 +37,22 @@ class PgWidgetRateProfile(PyQtWidget2d):
         
             *_axes* (:class:`matplotlib.axes.Axes`):
                 The 2d plot for this widget.
+            *psth_cache* (:class:`collections.OrderedDict`):
+                Maps the parameters returned by :func:`get_parameters`
+                to the rate profiles of the units for all event labels.
+            *psth_cache_size* (integer):
+                The number of parameter sets that are kept in the cache.
+            *_worker* (:class:`RateProfileWorker` or None):
+                The worker that computes the missing profiles.
+            *_workers* (list of :class:`RateProfileWorker`):
+                The workers that have been started.
+                Cancelled ones are kept until they have stopped.
+            *_render_timer* (:class:`QtCore.QTimer`):
+                Redraws the profiles while they arrive, at most every 50 ms.
+            *_hidden* (dictionary):
+                Maps (session, global unit id) to the entries like in :attr:`datas`
+                and the neo units of the hidden units of the channel.
+                Their profiles are computed in the background after the visible ones.
         
         """
         PyQtWidget2d.__init__(self, *args, **kwargs)
@@ -45,6 +65,17 @@ class PgWidgetRateProfile(PyQtWidget2d):
         self.plot_item.enableAutoRange()
         self.rate_profiles = []
         self.datas = {}
+        self.units = {}
+        self.psth_cache = OrderedDict()
+        self.psth_cache_size = 4
+        self._channel_data = None
+        self._worker = None
+        self._workers = []
+        self._render_timer = QtCore.QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(50)
+        self._render_timer.timeout.connect(self.render)
+        self._hidden = {}
 
         self.time_pre = -1000
         self.time_post = 1500
@@ -222,68 +253,6 @@ class PgWidgetRateProfile(PyQtWidget2d):
 
         return raster_trig
 
-    def compute_psth_from_raster(self, array_raster_trig, timerange, minimum_spikes=10, border_correction=0.0):
-        """
-
-        :param array_raster_trig:
-        :param timerange:
-        :param minimum_spikes:
-        :param border_correction:
-        :return:
-        """
-
-        out = dict()
-        if len(array_raster_trig) < 1:
-            print('PSTH not computed due to lack of spikes.')
-            out["values"] = np.array([])
-            out["times"] = []
-            return out
-
-        raster_trig = np.sort(np.hstack(array_raster_trig))
-        if len(raster_trig) <= minimum_spikes:
-            print('PSTH not computed due to lack of spikes.')
-            out["values"] = np.array([])
-            out["times"] = []
-            return out
-
-        rate_estimate, psth_times = self.calc_rate_estimate(raster_trig, timerange,
-                                                            sampling_period=self.sampling_period,
-                                                            kernel_width=self.kernel_width,
-                                                            border_correction=border_correction)
-        psth_trig = rate_estimate / float(len(array_raster_trig))
-        psth_trig = np.array(psth_trig)[:, 0]
-
-        return psth_times, psth_trig
-
-    @staticmethod
-    def calc_rate_estimate(spike_times, timerange, sampling_period,
-                           kernel_width, border_correction):
-        """
-        :param spike_times: array of spike times
-        :param timerange: tuple or list of times between which to calculate PSTH
-        :param sampling_period: sampling period for calculating PSTH
-        :param kernel_width: width of kernel (in ms) used for PSTH
-        :param border_correction: time window around edges to use to negate border effects in PSTH
-
-        :return rate_estimate: array containing the time scale of the rate estimate
-        :return kernel_width: array containing the values of the rate estimate
-        """
-        t_start = timerange[0] - border_correction
-        t_stop = timerange[1] + border_correction
-        mask = (spike_times >= t_start) & (spike_times <= t_stop)
-        spiketrain = spike_times[mask].copy()
-        if len(spiketrain) < 2:
-            times = np.linspace(t_start, t_stop, int((t_stop - t_start) * 1000 / sampling_period),
-                                endpoint=False)
-            rate = np.zeros_like(times)
-            return rate, times
-
-        spike_train = SpikeTrain(spiketrain * pq.ms, t_start=t_start * pq.ms, t_stop=t_stop * pq.ms)
-        rate_estimate = instantaneous_rate(spike_train, sampling_period=sampling_period * pq.ms,
-                                           kernel=GaussianKernel(kernel_width * pq.ms))
-        rate_estimate = rate_estimate.time_slice(t_start=timerange[0] * pq.ms, t_stop=timerange[1] * pq.ms)
-        return rate_estimate.rescale('Hz').magnitude, rate_estimate.times.rescale('s').magnitude
-
     def compute_psth(self, spiketrain, trigger, timerange, minimum_spikes, border_correction):
         """
         Calculates the peri-stimulus time histogram for the given spiketrain around the given event time stamps.
@@ -297,46 +266,25 @@ class PgWidgetRateProfile(PyQtWidget2d):
         :return psth_times: Array of times (in seconds)
         :return psth_trig: Array of values corresponding to psth_times (in Herz)
         """
+        return self.compute_psths([spiketrain], [trigger], timerange, minimum_spikes, border_correction)[0]
 
-        if len(spiketrain) < minimum_spikes:
-            # raise(ValueError, "The spiketrain contains fewer than 2 spikes.")
-            # print("The spiketrain contains fewer than 2 spikes. Returning empty list.")
-            return [], []
-
-        # choose saccades within the period of activity
-        trig_unit = trigger[(trigger >= spiketrain[0]) & (trigger <= spiketrain[-1])]
-
-        if len(trig_unit) < 1:
-            # print('-- No neural activity during this block for this neuronID')
-            return [], []
-
-        # extract spike times around saccade and fixation
-        raster_trig_list = []  # spikes around trig
-        for i_trig, t_trig in enumerate(trig_unit):
-            mask_trig = (spiketrain >= (t_trig + timerange[0] - border_correction)) & \
-                        (spiketrain <= (t_trig + timerange[1] + border_correction))
-            spikes = spiketrain[mask_trig] - t_trig
-            raster_trig_list.append(spikes)
-
-        if len(raster_trig_list) < 1:
-            return [], []
-
-        raster_trig = np.sort(np.hstack(raster_trig_list))
-
-        if len(raster_trig) <= minimum_spikes:
-            return [], []
+    def compute_psths(self, spiketrains, triggers, timerange, minimum_spikes, border_correction):
+        """
+        Calculates the peri-stimulus time histograms for many spiketrains in one batch.
 
-        rate_estimate, psth_times = self.calc_rate_estimate(raster_trig, timerange,
-                                                            sampling_period=self.sampling_period,
-                                                            kernel_width=self.kernel_width,
-                                                            border_correction=border_correction)
-        if rate_estimate.size == psth_times.size == 0:
-            return [], []
-        else:
-            psth_trig = rate_estimate / float(len(raster_trig_list))
-            psth_trig = np.array(psth_trig)[:, 0]
+        :param spiketrains: List of arrays of spike times in units of milliseconds
+        :param triggers: List of arrays of event timestamps in units of milliseconds, one per spiketrain
+        :param timerange: List or tuple containing tPre and tPost values with which to calculate the PSTHs
+        :param minimum_spikes: Minimum spikes required in a spiketrain (and around trigger) to calculate its PSTH
+        :param border_correction: Time (in milliseconds) to be used to correct for edge effects in PSTH
 
-            return psth_times, psth_trig
+        :return: List of tuples of psth_times (in seconds) and psth_trig (in Herz), one per spiketrain
+        """
+        return compute_psths(spiketrains, triggers, timerange,
+                             sampling_period=self.sampling_period,
+                             kernel_width=self.kernel_width,
+                             border_correction=border_correction,
+                             minimum_spikes=minimum_spikes)
 
     def plot_profile(self, x, y, color, unit_id, session, clickable=False):
         """
@@ -369,11 +317,17 @@ class PgWidgetRateProfile(PyQtWidget2d):
         
         """
         self.datas = {}
+        self.units = {}
+        self._hidden = {}
 
         if self.toolbar.activate_button.current_state:
 
-            layer = self.toolbar.get_checked_layers()[0]
             active = vum.get_active()
+            if data.channel_data is not self._channel_data:
+                # the profiles of another channel are not needed anymore
+                self._channel_data = data.channel_data
+                self.cancel_worker()
+                self.psth_cache.clear()
             self.events = data.get_events_dict()
 
             self.populate_event_list()
@@ -385,81 +339,203 @@ class PgWidgetRateProfile(PyQtWidget2d):
                         spiketrain = data.get_data("spiketrain", unit)
                         col = vum.get_colour(global_unit_id)
                         self.datas[(session, global_unit_id)] = [spiketrain, col, True]
+                        self.units[(session, global_unit_id)] = unit
+                    elif vum.get_mapping()[session][global_unit_id] > 0:
+                        # hidden units are precomputed, so that showing them is instant
+                        unit = vum.get_realunit(session, global_unit_id, data)
+                        spiketrain = data.get_data("spiketrain", unit)
+                        col = vum.get_colour(global_unit_id)
+                        self._hidden[(session, global_unit_id)] = ([spiketrain, col, True], unit)
 
-            if self.trigger_event in self.events.keys():
-                paramaters = {
-                    'trigger_event': self.trigger_event,
-                    'bcm': self.border_correction_multiplier,
-                    'kernel_width': self.kernel_width,
-                    't_pre': self.time_pre,
-                    't_post': self.time_post
-                }
-                profiles = dict()
-
-                worker = RateProfileWorker(self.datas, profiles, self.events, paramaters, self.compute_psth)
-                worker.start()
-                while worker.isRunning():
-                    self._processing = worker.isRunning()
-                    self.rate_profile_settings.errorLabel.setText('Processing...')
-                    QtWidgets.QApplication.processEvents()
-                self._processing = worker.isRunning()
-                self.rate_profile_settings.errorLabel.setText('')
-
-                self.clear_()
-                if layer == "individual":
-                    for key in profiles:
-                        self.plot_profile(x=profiles[key][0], y=profiles[key][1],
-                                          color=self.datas[key][1],
-                                          unit_id=key[1],
-                                          session=key[0],
-                                          clickable=self.datas[key][2])
-
-                elif layer == "pooled":
-                    pooled_profiles = {}
-                    for key in profiles:
-                        session, global_unit_id = key
-                        if len(profiles[key][0]) > 0 and len(profiles[key][1]) > 0:
-                            if pooled_profiles.get(global_unit_id, None) is None:
-                                pooled_profiles[global_unit_id] = profiles[key] + [self.datas[key][1]]
-                            else:
-                                pooled_profiles[global_unit_id][1] += profiles[key][1]
-
-                    for key in pooled_profiles:
-                        self.plot_profile(x=pooled_profiles[key][0], y=pooled_profiles[key][1],
-                                          color=pooled_profiles[key][2],
-                                          unit_id=key,
-                                          session=-1,
-                                          clickable=False)
-
-                self.create_vertical_line(xval=0)
-                self.set_x_label("Time", "s")
-                self.set_y_label("Frequency", "Hz")
-                self.set_plot_title("Rate Profiles around trigger {}".format(self.trigger_event))
-                self.connect_plots()
+            self.update_plot()
 
         else:
+            self.cancel_worker()
             self.clear_()
 
-    def update_plot(self):
-        layer = self.toolbar.get_checked_layers()[0]
+    def get_parameters(self):
+        """
+        Returns the parameters the rate profiles depend on.
+        
+            **Returns**: tuple
+                The time before and after the trigger, the sampling period,
+                the kernel width and the border correction multiplier.
+        
+        """
+        return (self.time_pre, self.time_post, self.sampling_period,
+                self.kernel_width, self.border_correction_multiplier)
 
+    def get_profiles(self):
+        """
+        Returns the cached rate profiles of the visible units for all event labels.
+        
+        The profiles are cached per unit for the current parameters.
+        The profiles that are not cached yet are computed for every event
+        label by a :class:`RateProfileWorker` in the background. They are
+        plotted as soon as they arrive, see :func:`on_profile_ready`.
+        After the visible units, the worker computes the hidden units of the
+        channel, so that changing the visibility only renders, too.
+        
+            **Returns**: dictionary
+                Maps (session, global unit id) to a dictionary which maps
+                the event labels to the times and the values of the profile.
+        
+        """
+        parameters = self.get_parameters()
+        cache = self.psth_cache.pop(parameters, {})
+        self.psth_cache[parameters] = cache
+        while len(self.psth_cache) > self.psth_cache_size:
+            self.psth_cache.popitem(last=False)
+
+        # the visible units come first, so that they are computed first
+        units = dict(self.units)
+        datas = dict(self.datas)
+        for key, (entry, unit) in self._hidden.items():
+            units[key] = unit
+            datas[key] = entry
+
+        missing = {}
+        for key, unit in units.items():
+            entry = cache.get(id(unit))
+            if entry is None or entry[0] is not unit:
+                missing[key] = datas[key]
+
+        worker = self._worker
+        if worker is not None and worker.cache is cache and \
+                all(worker.units.get(key) is units[key] for key in missing):
+            # the running worker computes everything that is missing
+            missing = {}
+
+        if missing and self.events:
+            self.start_worker(missing, {key: units[key] for key in missing}, cache)
+
+        return {key: cache[id(unit)][1] for key, unit in self.units.items() if id(unit) in cache}
+
+    def start_worker(self, datas, units, cache):
+        """
+        Cancels the running worker and starts a new one.
+        
+        **Arguments**
+        
+            *datas* (dictionary):
+                The entries like in :attr:`datas` of the units to compute
+                in the order they should be computed.
+            *units* (dictionary):
+                The neo units of the units to compute.
+            *cache* (dictionary):
+                The cache of the current parameters the profiles are stored in.
+        
+        """
+        self.cancel_worker()
         paramaters = {
-            'trigger_event': self.trigger_event,
+            'trigger_events': sorted(self.events.keys()),
             'bcm': self.border_correction_multiplier,
             'kernel_width': self.kernel_width,
             't_pre': self.time_pre,
             't_post': self.time_post
         }
-        profiles = dict()
-
-        worker = RateProfileWorker(self.datas, profiles, self.events, paramaters, self.compute_psth)
+        compute_function = partial(compute_psths, sampling_period=self.sampling_period,
+                                   kernel_width=self.kernel_width)
+        worker = RateProfileWorker(datas, self.events, paramaters, compute_function, cache)
+        worker.units = units
+        worker.profile_ready.connect(partial(self.on_profile_ready, worker))
+        worker.failed.connect(partial(self.on_worker_failed, worker))
+        worker.finished.connect(partial(self.on_worker_finished, worker))
+        self._worker = worker
+        self._workers = [w for w in self._workers if w.isRunning()] + [worker]
+        self._processing = True
+        self.rate_profile_settings.errorLabel.setText('Processing...')
         worker.start()
-        while worker.isRunning():
-            self._processing = worker.isRunning()
-            self.rate_profile_settings.errorLabel.setText('Processing...')
-            QtWidgets.QApplication.processEvents()
-        self._processing = worker.isRunning()
+
+    def cancel_worker(self):
+        """
+        Cancels the running worker. Its remaining profiles will be ignored.
+        
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._processing = False
+
+    def on_profile_ready(self, worker, key, profiles):
+        """
+        This method is called if a worker has computed the profiles of a unit.
+        
+        Stores the profiles in the cache and schedules a redraw if the unit is visible.
+        
+        **Arguments**
+        
+            *worker* (:class:`RateProfileWorker`):
+                The worker that computed the profiles.
+            *key* (tuple of integer):
+                The session and the global unit id.
+            *profiles* (dictionary):
+                Maps the event labels to the times and the values of the profile.
+        
+        """
+        if worker is not self._worker or worker.cancelled.is_set():
+            return
+        unit = worker.units[key]
+        worker.cache[id(unit)] = (unit, profiles)
+        if key in self.units and self.units[key] is unit and not self._render_timer.isActive():
+            self._render_timer.start()
+
+    def on_worker_failed(self, worker, message):
+        """
+        This method is called if a worker could not compute some profiles.
+        
+        Shows the error and the profiles that have been computed.
+        
+        **Arguments**
+        
+            *worker* (:class:`RateProfileWorker`):
+                The worker that failed.
+            *message* (string):
+                The error message.
+        
+        """
+        if worker is not self._worker:
+            return
+        self._worker = None
+        self._processing = False
+        self.rate_profile_settings.errorLabel.setText('Error: ' + message)
+        self._render_timer.stop()
+        self.render()
+
+    def on_worker_finished(self, worker):
+        """
+        This method is called if a worker has stopped.
+        
+        **Arguments**
+        
+            *worker* (:class:`RateProfileWorker`):
+                The worker that has stopped.
+        
+        """
+        if worker is not self._worker:
+            return
+        self._worker = None
+        self._processing = False
         self.rate_profile_settings.errorLabel.setText('')
+        self._render_timer.stop()
+        self.render()
+
+    def update_plot(self):
+        self.get_profiles()
+        self.render()
+
+    def render(self):
+        """
+        Plots the cached rate profiles of the visible units around the current trigger event.
+        
+        """
+        layer = self.toolbar.get_checked_layers()[0]
+        parameters = self.get_parameters()
+        cache = self.psth_cache.get(parameters, {})
+        all_profiles = {key: cache[id(unit)][1] for key, unit in self.units.items()
+                        if id(unit) in cache and cache[id(unit)][0] is unit}
+        profiles = {key: list(all_profiles[key][self.trigger_event]) for key in all_profiles
+                    if self.trigger_event in all_profiles[key]}
 
         self.clear_()
         if layer == "individual":
@@ -476,7 +552,9 @@ class PgWidgetRateProfile(PyQtWidget2d):
                 session, global_unit_id = key
                 if len(profiles[key][0]) > 0 and len(profiles[key][1]) > 0:
                     if pooled_profiles.get(global_unit_id, None) is None:
-                        pooled_profiles[global_unit_id] = profiles[key] + [self.datas[key][1]]  # set y-values for gid
+                        # copy the y-values, the cached profiles must not change
+                        pooled_profiles[global_unit_id] = [profiles[key][0], np.array(profiles[key][1]),
+                                                           self.datas[key][1]]  # set y-values for gid
                     else:
                         pooled_profiles[global_unit_id][1] += profiles[key][1]  # increment y-values for gid
 
@@ -487,6 +565,9 @@ class PgWidgetRateProfile(PyQtWidget2d):
                                   session=-1,
                                   clickable=False)
 
+        if self.trigger_event not in self.events:
+            return
+
         self.create_vertical_line(xval=0)
         self.set_x_label("Time", "s")
         self.set_y_label("Frequency", "Hz")
@@ -519,30 +600,145 @@ class PgWidgetRateProfile(PyQtWidget2d):
 
 
 class RateProfileWorker(QtCore.QThread):
+    """
+    A thread that computes the rate profiles of units for all event labels.
+    
+    The units are split into chunks which are computed concurrently
+    by a pool of threads. The profiles of every unit are emitted
+    with :attr:`profile_ready` as soon as its chunk is done.
+    If a chunk fails, :attr:`failed` is emitted and the thread stops.
+    
+    **Arguments**
+    
+        *data_dictionary* (dictionary):
+            Maps (session, global unit id) to the spike train, the colour
+            and whether the unit is clickable.
+        *event_dictionary* (dictionary):
+            Maps the event labels to the event times per session in ms.
+        *param_dictionary* (dictionary):
+            The event labels and the parameters of the profiles.
+        *compute_function* (function):
+            Computes the profiles of many spike trains in one batch,
+            see :func:`swan.psth.compute_psths`.
+        *cache* (dictionary or None):
+            The cache the receiver of :attr:`profile_ready` stores
+            the profiles in. The worker does not access it.
+            Default: None.
+        *max_workers* (integer or None):
+            The number of threads. If it is None, the number of CPUs is used.
+            Default: None.
+    
+    """
+
+    profile_ready = QtCore.pyqtSignal(object, object)
+    """
+    Signal that is emitted with the key of a unit and a dictionary
+    which maps the event labels to the times and the values of its profile.
+    
+    """
 
-    def __init__(self, data_dictionary, output_dictionary, event_dictionary, param_dictionary, compute_function):
+    failed = QtCore.pyqtSignal(str)
+    """
+    Signal that is emitted with the error message if a chunk could not be
+    computed and the computation was not cancelled.
+    
+    """
 
+    def __init__(self, data_dictionary, event_dictionary, param_dictionary, compute_function, cache=None,
+                 max_workers=None):
+        """
+        **Properties**
+        
+            *cache* (dictionary or None):
+                The cache the profiles are stored in by the receiver
+                of :attr:`profile_ready`.
+            *cancelled* (:class:`threading.Event`):
+                Is set if the computation should be abandoned.
+            *units* (dictionary):
+                Maps the keys to the neo units the profiles belong to.
+        
+        """
         QtCore.QThread.__init__(self)
         self.data_dictionary = data_dictionary
-        self.output_dictionary = output_dictionary
         self.event_dictionary = event_dictionary
         self.parameters = param_dictionary
         self.compute_function = compute_function
+        self.cache = cache
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.cancelled = threading.Event()
+        self.units = {}
 
     def run(self):
-        for key in self.data_dictionary.keys():
-            session, global_unit_id = key[0], key[1]
-            try:
-                event_times = self.event_dictionary[self.parameters['trigger_event']][session][0][0]
-            except IndexError:
-                event_times = np.array([]) * pq.ms
-            unit_data = self.data_dictionary[key]
-            spiketrain, color, clickable = unit_data
-
-            times, values = self.compute_function(
-                spiketrain=spiketrain.rescale(pq.ms).magnitude, trigger=event_times.rescale(pq.ms).magnitude,
-                timerange=[self.parameters['t_pre'], self.parameters['t_post']], minimum_spikes=10,
-                border_correction=self.parameters['bcm'] * self.parameters['kernel_width']
-            )
-
-            self.output_dictionary[key] = [times, values]
+        keys = list(self.data_dictionary.keys())
+        # a few chunks per thread, so that the first profiles arrive early
+        size = max(1, -(-len(keys) // (4 * self.max_workers)))
+        chunks = [keys[i:i + size] for i in range(0, len(keys), size)]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self.compute_chunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                if self.cancelled.is_set():
+                    break
+                try:
+                    results = future.result()
+                except Exception as error:
+                    self.failed.emit(str(error) or type(error).__name__)
+                    # the remaining chunks are not needed anymore
+                    for pending in futures:
+                        pending.cancel()
+                    return
+                for key, profiles in results:
+                    self.profile_ready.emit(key, profiles)
+            if self.cancelled.is_set():
+                for future in futures:
+                    future.cancel()
+
+    def compute_chunk(self, keys):
+        """
+        Computes the profiles of some units for all event labels in one batch.
+        
+        **Arguments**
+        
+            *keys* (list of tuple):
+                The keys of the units in :attr:`data_dictionary`.
+        
+            **Returns**: list of tuple
+                The key and the profiles of every unit.
+        
+        """
+        if self.cancelled.is_set():
+            return []
+
+        pairs = []
+        spiketrains = []
+        triggers = []
+        for key in keys:
+            session = key[0]
+            spiketrain, color, clickable = self.data_dictionary[key]
+            spiketrain = spiketrain.rescale(pq.ms).magnitude
+            for trigger_event in self.parameters['trigger_events']:
+                try:
+                    event_times = self.event_dictionary[trigger_event][session]
+                except IndexError:
+                    event_times = np.array([])
+                pairs.append((key, trigger_event))
+                spiketrains.append(spiketrain)
+                triggers.append(event_times)
+
+        results = self.compute_function(
+            spiketrains=spiketrains, triggers=triggers,
+            timerange=[self.parameters['t_pre'], self.parameters['t_post']], minimum_spikes=10,
+            border_correction=self.parameters['bcm'] * self.parameters['kernel_width']
+        )
+
+        profiles = {key: {} for key in keys}
+        for (key, trigger_event), (times, values) in zip(pairs, results):
+            profiles[key][trigger_event] = [times, values]
+        return [(key, profiles[key]) for key in keys]
+
+    def cancel(self):
+        """
+        Abandons the computation. The thread stops after the running chunks.
+        
+        """
+        self.cancelled.set()
@@ -63,9 +63,7 @@ class VirtualUnitMap(object):
             count = 1
             for global_unit_id in range(maximum_units):
                 try:
-                    unit_description = data.blocks[session].channel_indexes[0].units[global_unit_id].description.split()
-
-                    if "unclassified" in unit_description or "noise" in unit_description:
+                    if not data.channel_data.is_real(session, global_unit_id):
                         mapping[session].append(0)
                     else:
                         mapping[session].append(count)
@@ -136,12 +134,7 @@ class VirtualUnitMap(object):
         
         """
         virtual_unit = self.mapping[session_index][unit_index]
-        if "unclassified" not in data.blocks[session_index].channel_indexes[0].units[0].description.split():
-            real_unit = data.blocks[session_index].channel_indexes[0].units[virtual_unit - 1]
-        else:
-            real_unit = data.blocks[session_index].channel_indexes[0].units[virtual_unit]
-        # real_unit = data.blocks[session_index].channel_indexes[0].units[virtual_unit]
-        return real_unit
+        return data.channel_data.get_realunit(session_index, virtual_unit)
 
     def swap(self, session_index, first_unit_index, second_unit_index):
         """
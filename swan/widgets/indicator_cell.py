@@ -84,6 +84,31 @@ class IndicatorWidget(QtWidgets.QWidget):
 
         self.set_background(self.default_background)
 
+    def reset(self, text, position):
+        """
+        Prepares the indicator to be reused for another row or column.
+        
+        **Arguments**
+        
+            *text* (string):
+                The text of the indicator.
+            *position* (integer):
+                The row of a unit indicator or the column of a session indicator.
+        
+        """
+        if self.indicator_type == 'unit':
+            self.row = position
+        elif self.indicator_type == 'session':
+            self.col = position
+        self.pos = (self.col, self.row)
+        self.display_text.setText(text)
+        self.selected = True
+        self.responsive = True
+        self.in_focus = False
+        self.default_background = self.backgrounds["selected"]
+        self.set_background(self.default_background)
+        self.colour_strip.hide()
+
     def change_size(self, width, height):
         """
         Resizes the plot by the given steps.
@@ -125,12 +150,12 @@ class IndicatorWidget(QtWidgets.QWidget):
 
     def set_font_size(self):
         if self.indicator_type == 'pivot':
-            self.display_font.setPointSize(0.13 * min(self.size().height(), self.size().width()))
+            self.display_font.setPointSize(int(0.13 * min(self.size().height(), self.size().width())))
             self.display_font.setBold(True)
         elif self.indicator_type == 'unit':
-            self.display_font.setPointSize(0.19 * min(self.size().height(), self.size().width()))
+            self.display_font.setPointSize(int(0.19 * min(self.size().height(), self.size().width())))
         elif self.indicator_type == 'session':
-            self.display_font.setPointSize(0.18 * min(self.size().height(), self.size().width()))
+            self.display_font.setPointSize(int(0.18 * min(self.size().height(), self.size().width())))
         self.display_text.setFont(self.display_font)
 
     def toggle_colour_strip(self, colour):
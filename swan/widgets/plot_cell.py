@@ -0,0 +1,745 @@
+"""
+Created on Oct 18, 2026
+
+@author: SWAN authors and contributors
+
+In this module you can find the :class:`PlotCell` which holds the state
+of one cell of the overview grid.
+
+The grid only creates widgets for the cells that are visible in its
+scroll area, see :class:`swan.widgets.plot_grid.MyPlotContent`.
+A cell keeps its data, selection, visibility and tool tip while it is
+scrolled out of view, and is drawn again by whatever widget it is bound
+to next.
+
+The :class:`PlotCellGrid` holds the cells of the whole grid and their
+selection, independent of how the cells are drawn.
+"""
+from datetime import datetime
+
+from pyqtgraph.Qt import QtCore
+from swan.widgets.thumbnail_cache import ThumbnailCache, render_thumbnail
+
+
+class PlotCell(object):
+    """
+    The state of one cell of the overview grid.
+
+    **Arguments**
+
+        *pos* (tuple of integer):
+            The position of the cell.
+            Format: (session, global unit id)
+
+    """
+
+    def __init__(self, pos):
+        """
+        **Properties**
+
+            *pos* (tuple of integer):
+                The position of the cell.
+                Format: (session, global unit id)
+            *selected* (boolean):
+                Whether the cell is selected.
+            *disabled* (boolean):
+                Whether the cell has been hidden by its row or column indicator.
+            *inhibited_by_row* (boolean):
+                Whether the row indicator of the cell is deselected.
+            *inhibited_by_col* (boolean):
+                Whether the column indicator of the cell is deselected.
+            *to_be_updated* (boolean):
+                Whether the data of the cell has to be fetched again.
+            *has_plot* (boolean):
+                Whether the cell shows a mean waveform.
+            *data* (numpy array or None):
+                The mean waveform of the cell.
+            *density* (tuple or None):
+                The waveform density drawn under the mean waveform and
+                its amplitude range, see :func:`swan.unit_summary.waveform_density`.
+            *default_pen_colour* (tuple of integer or None):
+                The colour of the mean waveform.
+            *tooltip* (string):
+                The tool tip of the cell.
+            *source* (tuple or None):
+                The source key of the session file, the channel and the index
+                of the real unit shown by the cell, see
+                :class:`swan.widgets.thumbnail_cache.ThumbnailCache`.
+            *widget* (:class:`swan.widgets.plot_widget.MyPlotWidget` or None):
+                The widget that shows the cell or None if it is not visible.
+
+        """
+        self.pos = pos
+        self.selected = False
+        self.disabled = False
+        self.inhibited_by_row = False
+        self.inhibited_by_col = False
+        self.to_be_updated = True
+        self.has_plot = False
+        self.data = None
+        self.density = None
+        self.default_pen_colour = None
+        self.tooltip = ""
+        self.source = None
+        self.widget = None
+
+    def set_data(self, data, colour, source=None, density=None):
+        """
+        Sets the mean waveform of the cell and redraws it if it is visible.
+
+        **Arguments**
+
+            *data* (numpy array or None):
+                The mean waveform or None if the cell is empty.
+            *colour* (tuple of integer):
+                The colour of the unit.
+            *source* (tuple or None):
+                The source of the unit or None if it is not known.
+                If it is given without data, the cell shows the cached
+                thumbnail of the unit until the data is set.
+                Default: None.
+            *density* (tuple or None):
+                The waveform density and its amplitude range
+                or None if no density is drawn.
+                Default: None.
+
+        """
+        self.data = data
+        self.density = density
+        self.default_pen_colour = colour
+        self.source = source
+        self.has_plot = data is not None
+        if self.widget is not None:
+            self.widget.redraw()
+
+    def clear_(self):
+        """
+        Removes the mean waveform of the cell.
+
+        """
+        self.set_data(None, self.default_pen_colour)
+
+    def set_for_update(self):
+        self.to_be_updated = True
+
+    def set_as_updated(self):
+        self.to_be_updated = False
+
+    def change_background(self, change):
+        """
+        Shows whether the cell is selected.
+
+        **Arguments**
+
+            *change* (boolean):
+                Whether or not the cell's bg should be changed to
+                a selected state.
+
+        """
+        if self.widget is not None:
+            self.widget.change_background(change)
+
+    def set_disabled(self, disabled):
+        """
+        Hides or shows the cell's data.
+
+        **Arguments**
+
+            *disabled* (boolean):
+                Whether the cell is disabled.
+
+        """
+        self.disabled = disabled
+        if self.widget is not None:
+            self.widget.redraw()
+
+    def toolTip(self):
+        return self.tooltip
+
+    def set_tooltip(self, tooltip):
+        """
+        Sets a tool tip for this cell.
+
+        **Arguments**
+
+            tooltip (string):
+                The tool tip to set.
+
+        """
+        self.tooltip = tooltip
+        if self.widget is not None:
+            self.widget.set_tooltip(tooltip)
+
+
+class PlotCellGrid(object):
+    """
+    The cells of the overview grid, their selection and their visibility.
+
+    This class holds everything about the grid that does not depend on how
+    the cells are drawn. It is used together with a Qt class that defines the
+    signals *plot_selected*, *indicator_toggle* and *visibility_toggle* and
+    the methods *update_colour_strips*, *change_size*, *set_yranges* and
+    *set_indicators_responsive*,
+    see :class:`swan.widgets.plot_grid.MyPlotContent` and
+    :class:`swan.widgets.tiled_plot_grid.TiledPlotContent`.
+
+    """
+
+    def init_cells(self):
+        """
+        **Properties**
+
+            *_shape* (tuple of integer):
+                The shape of the plot grid.
+                Format: (rows, cols)
+            *_plots* (list of :class:`PlotCell`):
+                The cells in a list for iterating over them.
+            *_selected* (list of :class:`PlotCell`):
+                A list containing the selected cells.
+            *_rows* (dictionary):
+                A dictionary containing the row as key and a list
+                of cells as value for the cells in that row.
+            *_cols* (dictionary):
+                A dictionary containing the column as key and a list
+                of cells as value for the cells in that column.
+            *_yrange* (tuple of float):
+                The y range all plots should have.
+            *_xrange* (tuple of float or None):
+                The x range all plots should have.
+            *_dates* (list of :class:`datetime.datetime` or None):
+                The dates of the sessions.
+            *_sources* (list of string):
+                The source keys of the session files of the plotted data.
+            *_channel* (integer or None):
+                The channel of the plotted data.
+            *thumbnails* (:class:`swan.widgets.thumbnail_cache.ThumbnailCache`):
+                The cache of the rendered mean waveforms.
+            *_persisted* (tuple or None):
+                The y range and the thumbnail size of the saved layout.
+                Only thumbnails drawn with them are written to the disk,
+                the others are only kept in memory.
+            *show_density* (boolean):
+                Whether the waveform densities are drawn under the mean waveforms.
+            *_preview* (boolean):
+                Whether the grid shows the thumbnails of a channel that is still
+                loading, see :func:`show_layout`. Its cells can not be selected
+                and its rows and columns can not be hidden then.
+
+        """
+        self._shape = (0, 0)
+        self._plots = []
+        self._selected = []
+        self._rows = {}
+        self._cols = {}
+        self._yrange = (-0.001, 0.0006)
+        self._xrange = None
+        self._second_select = None
+        self._preview = False
+        self._width = 60
+        self._height = 45
+        self._constant_dimension = 75
+        self._spacing = 1
+        self._dates = None
+        self._sources = []
+        self._channel = None
+        self.thumbnails = ThumbnailCache()
+        self._persisted = None
+        self.show_density = True
+
+    def make_cells(self, rows, cols, dates=None):
+        """
+        Creates the cells of a grid of the given shape.
+
+        **Arguments**
+
+            *rows* (integer):
+                The number of rows of the grid.
+            *cols* (integer):
+                The number of columns of the grid.
+            *dates* (list of :class:`datetime.datetime` or None):
+                The dates of the sessions.
+                Default: None.
+
+        """
+        self._shape = (rows, cols)
+        self._dates = dates
+        self._preview = False
+        self._plots = []
+        self._rows = {}
+        self._cols = {}
+        for session_id in range(cols):
+            self._cols[session_id] = []
+        for unit_id in range(rows):
+            self._rows[unit_id] = []
+            for session_id in range(cols):
+                cell = PlotCell((session_id, unit_id))
+                self._plots.append(cell)
+                self._rows[unit_id].append(cell)
+                self._cols[session_id].append(cell)
+
+    def cell_origin(self, row, col):
+        """
+        Returns the position of the top left corner of a cell in the grid.
+
+        **Arguments**
+
+            *row* (integer):
+                The row index.
+            *col* (integer):
+                The column index.
+
+            **Returns**: tuple of integer
+                The x and y coordinates in pixels.
+
+        """
+        offset = self._constant_dimension + self._spacing
+        return (offset + col * (self._width + self._spacing),
+                offset + row * (self._height + self._spacing))
+
+    def row_colour(self, row):
+        """
+        Returns the colour of the unit in a row.
+
+        **Arguments**
+
+            *row* (integer):
+                The row index.
+
+            **Returns**: tuple of integer or None
+                The colour of the first cell of the row that has a plot
+                or None if no cell of the row has a plot.
+
+        """
+        cell = next((c for c in self._rows.get(row, []) if c.has_plot), None)
+        return cell.default_pen_colour if cell is not None else None
+
+    def indicator_toggled(self, indicator):
+        """
+        Hides or shows the cells of a row or column.
+
+        **Arguments**
+
+            *indicator* (object):
+                The row or column indicator before it changes its state.
+                It has the attributes *row*, *col*, *indicator_type* and *selected*.
+
+        """
+        if self._preview:
+            return
+        row = indicator.row
+        col = indicator.col
+        indicator_type = indicator.indicator_type
+        if indicator_type == 'unit':
+            cells = self._rows.get(row, [])
+        elif indicator_type == 'session':
+            cells = self._cols.get(col, [])
+        else:
+            cells = []
+
+        for cell in cells:
+            if not indicator.selected:
+                if indicator_type == 'session':
+                    self.enable_cell(cell, "col")
+                elif indicator_type == 'unit':
+                    self.enable_cell(cell, "row")
+            else:
+                self.disable_cell(cell)
+                if indicator_type == 'session':
+                    cell.inhibited_by_col = True
+                elif indicator_type == 'unit':
+                    cell.inhibited_by_row = True
+        self.indicator_toggle.emit()
+
+    def disable_cell(self, cell):
+        """
+        Hides the data of a cell and deselects it.
+
+        **Arguments**
+
+            *cell* (:class:`PlotCell`):
+                The cell.
+
+        """
+        if cell.selected:
+            self.select_plot(cell, False)
+        cell.set_disabled(True)
+        self.visibility_toggle.emit(cell.pos[0], cell.pos[1], False)
+
+    def enable_cell(self, cell, which):
+        """
+        Shows the data of a cell again if neither its row nor its column is deselected.
+
+        **Arguments**
+
+            *cell* (:class:`PlotCell`):
+                The cell.
+            *which* (string):
+                Which inhibition is lifted: "row", "col" or "all".
+
+        """
+        if which == "row":
+            cell.inhibited_by_row = False
+        elif which == "col":
+            cell.inhibited_by_col = False
+        elif which == "all":
+            cell.inhibited_by_row = False
+            cell.inhibited_by_col = False
+
+        if not cell.inhibited_by_row and not cell.inhibited_by_col:
+            cell.set_disabled(False)
+            self.visibility_toggle.emit(cell.pos[0], cell.pos[1], True)
+
+    def toggle_plot_visibility(self, session_id, unit_id, visible):
+        self.visibility_toggle.emit(session_id, unit_id, visible)
+
+    def clear_cells(self):
+        """
+        Removes the data of all cells and shows them again.
+
+        """
+        for p in self._plots:
+            p.clear_()
+            self.enable_cell(p, "all")
+
+    def do_plot(self, vum, data):
+        """
+        Plots data on all plots.
+
+        Only the data of the cells is updated here.
+        The cells are drawn when they are visible.
+
+        **Arguments**
+
+            *vum* (:class:`src.virtualunitmap.VirtualUnitMap`):
+                Is needed to get the mapping.
+            *data* (:class:`src.neodata.NeoData`):
+                Is needed to get the data.
+
+        """
+        active = vum.get_active()
+        self._xrange = (0., data.get_wave_length())
+        self._sources = list(data.source_keys)
+        self._channel = data.channel
+        for session in range(len(active)):
+            for global_unit_id in range(len(active[session])):
+                cell = self.find_plot(global_unit_id, session)
+                if cell.to_be_updated:
+                    pen_colour = vum.get_colour(global_unit_id)
+                    if active[session][global_unit_id]:
+                        unit = vum.get_realunit(session, global_unit_id, data)
+                        mean_waveform = data.get_data("average", unit)
+                        density = data.get_data("density", unit) if self.show_density else None
+                        cell.set_data(mean_waveform.magnitude, pen_colour, self.unit_source(data, session, unit),
+                                      density)
+                    else:
+                        cell.set_data(None, pen_colour)
+                    cell.to_be_updated = False
+        self.update_colour_strips()
+        if self._sources:
+            self.thumbnails.put_layout(self._sources, self._channel, self.get_layout())
+            self._persisted = (tuple(self._yrange), tuple(self.thumbnail_size()))
+
+    def unit_source(self, data, session, unit):
+        """
+        Returns the source of a unit, which identifies its thumbnails.
+
+        **Arguments**
+
+            *data* (:class:`src.neodata.NeoData`):
+                The data of the channel.
+            *session* (integer):
+                The session index.
+            *unit* (:class:`neo.core.unit.Unit`):
+                The real unit.
+
+            **Returns**: tuple or None
+                The source key of the session file, the channel and the index
+                of the unit or None if the session file is not known.
+
+        """
+        if session >= len(self._sources):
+            return None
+        record = data.channel_data.get_record(unit)
+        if record is None:
+            return None
+        return self._sources[session], self._channel, record.index
+
+    def set_thumbnail_cache(self, thumbnails):
+        """
+        Sets the cache of the rendered mean waveforms.
+
+        **Arguments**
+
+            *thumbnails* (:class:`swan.widgets.thumbnail_cache.ThumbnailCache`):
+                The cache.
+
+        """
+        self.thumbnails = thumbnails
+
+    def thumbnail_size(self):
+        """
+        Returns the size of the thumbnails of the cells.
+
+            **Returns**: tuple of integer
+                The width and the height in pixels.
+
+        """
+        return self._width, self._height
+
+    def get_thumbnail(self, cell, curve=None):
+        """
+        Returns the thumbnail of a cell for the current y range and cell size.
+
+        It is rendered and cached if the cell has data, but no thumbnail yet.
+        It is only written to the disk if it fits the saved layout, so
+        expanding or zooming the grid does not fill the thumbnail directory.
+
+        **Arguments**
+
+            *cell* (:class:`PlotCell`):
+                The cell.
+            *curve* (numpy array or None):
+                The mean waveform of the cell.
+                Default: None (the data of the cell).
+
+            **Returns**: :class:`PyQt5.QtGui.QBitmap` or None
+                The thumbnail or None if the cell has neither data
+                nor a cached thumbnail.
+
+        """
+        curve = cell.data if curve is None else curve
+        size = self.thumbnail_size()
+        if cell.source is None:
+            if curve is None:
+                return None
+            return render_thumbnail(curve, self._xrange, self._yrange, size)
+        key = self.thumbnails.make_key(cell.source, self._yrange, size)
+        bitmap = self.thumbnails.get(key)
+        if bitmap is None and curve is not None:
+            bitmap = render_thumbnail(curve, self._xrange, self._yrange, size)
+            self.thumbnails.put(key, bitmap, persist=self._persisted == (tuple(self._yrange), tuple(size)))
+        return bitmap
+
+    def get_layout(self):
+        """
+        Returns what is needed to paint the grid from the thumbnails.
+
+            **Returns**: dictionary
+                The shape, the session dates, the ranges and the
+                thumbnail size of the grid, and the position, source and
+                colour of every cell that shows a unit.
+
+        """
+        return {
+            "shape": list(self._shape),
+            "dates": [date.isoformat() for date in self._dates] if self._dates is not None else None,
+            "yrange": [float(self._yrange[0]), float(self._yrange[1])],
+            "xrange": [float(x) for x in self._xrange] if self._xrange is not None else None,
+            "cells": [[cell.pos[0], cell.pos[1], list(cell.source), [int(c) for c in cell.default_pen_colour]]
+                      for cell in self._plots if cell.has_plot and cell.source is not None],
+        }
+
+    def show_layout(self, layout):
+        """
+        Creates a grid from a layout and shows the cached thumbnails
+        of its cells, while the data of the channel is not loaded yet.
+
+        The selection and the visibility still refer to the previous
+        channel then, so they can not be changed until the next
+        grid is made with :func:`make_plots`.
+
+        **Arguments**
+
+            *layout* (dictionary):
+                The layout, see :func:`get_layout`.
+
+        """
+        rows, cols = layout["shape"]
+        dates = [datetime.fromisoformat(date) for date in layout["dates"]] if layout["dates"] else None
+        self.make_plots(rows, cols, dates)
+        if layout["xrange"] is not None:
+            self.set_xranges(*layout["xrange"])
+        self.set_yranges(*layout["yrange"])
+        for session, unit_id, source, colour in layout["cells"]:
+            if unit_id < rows and session < cols:
+                self.find_plot(unit_id, session).set_data(None, tuple(colour), tuple(source))
+        self._preview = True
+        self.set_indicators_responsive(False)
+
+    def set_all_for_update(self):
+        for plot in self._plots:
+            plot.to_be_updated = True
+
+    def find_plot(self, global_unit_id, session_id):
+        """
+        Finds a plot at a given position.
+
+        **Arguments**
+
+            *global_unit_id* (integer):
+                The row index.
+            *session_id* (integer):
+                The column index.
+
+            **Returns**: :class:`PlotCell`
+                The cell at position (global_unit_id, session_id).
+
+        """
+        return self._rows[global_unit_id][session_id]
+
+    @QtCore.pyqtSlot(object)
+    def highlight_plot(self, item):
+        if item.opts['clickable']:
+            unit_id = item.opts['unit_id']
+            session = item.opts['session']
+
+            p = self.find_plot(unit_id, session)
+            self.select_plot(p, not p.selected)
+
+    def select_plot(self, plot, select):
+        """
+        Selects or deselects a plot on the grid.
+
+        If nothing is selected, the plot will be selected.
+        Second selection is only allowed if the plot is in the same column
+        as the other one and if not two are already selected.
+
+        **Arguments**
+
+            *plot* (:class:`PlotCell`):
+                The plot to (de)select.
+            *select* (boolean):
+                Whether or not the plot should be selected.
+
+        """
+        if self._preview:
+            return
+        if select:
+            if len(self._selected) == 1 and self._selected[0].pos[0] == plot.pos[0]:
+                self._selected.append(plot)
+                plot.change_background(select)
+                plot.selected = select
+                self._second_select = plot
+                self.plot_selected.emit(plot, select)
+
+            elif not self._selected:
+                self._selected.append(plot)
+                plot.change_background(select)
+                plot.selected = select
+                self._second_select = None
+                self.plot_selected.emit(plot, select)
+
+            elif self._second_select is not None and self._selected[0].pos[0] == plot.pos[0]:
+                self._selected.remove(self._second_select)
+                self._second_select.change_background(not select)
+                self._second_select.selected = not select
+                self.plot_selected.emit(self._second_select, not select)
+                self._second_select = plot
+
+                self._selected.append(plot)
+                plot.change_background(select)
+                plot.selected = select
+                self.plot_selected.emit(plot, select)
+
+        elif plot in self._selected:
+            self._selected.remove(plot)
+            plot.change_background(select)
+            plot.selected = select
+            self.plot_selected.emit(plot, select)
+
+    def reset_selection(self):
+        """
+        Resets the selection.
+
+        """
+        for p in self._selected:
+            p.selected = False
+            p.change_background(False)
+        self._selected = []
+
+    def get_selection(self):
+        """
+            **Returns**: list of :class:`PlotCell`
+                The selected plots.
+
+        """
+        return self._selected
+
+    def zoom_in(self, step=25.0):
+        """
+        Zooms in the plots.
+
+        **Arguments**
+
+            *step* (float):
+                The zoom step percentage.
+                Default: 25.0 percent.
+
+        """
+        self.change_size(step)
+
+    def zoom_out(self, step=25.0):
+        """
+        Zooms out the plots.
+
+        **Arguments**
+
+            *step* (float):
+                The zoom step percentage.
+                Default: 25.0 percent.
+
+        """
+        self.change_size(-step)
+
+    def expand(self, step=150):
+        """
+        Increases the y range of the plots.
+
+        **Arguments**
+
+            *step* (integer):
+                The expand step.
+                Default: 150 pixels.
+
+        """
+        self.set_yranges(self._yrange[0] - step, self._yrange[1] + step)
+
+    def collapse(self, step=150):
+        """
+        Decreases the y range of the plots.
+
+        **Arguments**
+
+            *step* (integer):
+                The collapse step.
+                Default: 150 pixels.
+
+        """
+        self.set_yranges(self._yrange[0] + step, self._yrange[1] - step)
+
+    def set_tooltips(self, tooltips):
+        """
+        Sets tool tips for all plots.
+
+        **Arguments**
+
+            *tooltips* (dictionary):
+                A dictionary containing for each column of the grid
+                a list of string containing the tool tips for that column.
+
+        """
+        for col in self._cols.keys():
+            tips = tooltips[col]
+            plots = self._cols[col]
+            for t, plot in zip(tips, plots):
+                plot.set_tooltip(t)
+
+    def swap_tooltips(self, p1, p2):
+        """
+        Swaps the tooltips for two plots that have been swapped.
+        """
+        tip1 = p1.toolTip()
+        tip2 = p2.toolTip()
+
+        p1.set_tooltip(tip2)
+        p2.set_tooltip(tip1)
@@ -8,12 +8,17 @@ a :class:`PyQt5.QtGui.QScrollArea` with some additions.
 
 More important is the :class:`MyPlotContent`.
 It shows an overview of many :class:`src.myplotwidget.MyPlotWidget`
-and manages them.
+and manages them. Alternatively, the overview can be drawn by a
+:class:`swan.widgets.tiled_plot_grid.TiledPlotContent`, see :meth:`MyPlotGrid.set_tiled`.
 """
-from pyqtgraph.Qt import QtCore, QtGui, QtWidgets
+from contextlib import contextmanager
+
+from pyqtgraph.Qt import QtCore, QtWidgets
+from pyqtgraph import mkColor
 from swan.widgets.plot_widget import MyPlotWidget
+from swan.widgets.plot_cell import PlotCellGrid
 from swan.widgets.indicator_cell import IndicatorWidget
-from numpy.random import choice
+from swan.widgets.tiled_plot_grid import TiledPlotContent
 
 
 class MyPlotGrid(QtWidgets.QWidget):
@@ -39,12 +44,49 @@ class MyPlotGrid(QtWidgets.QWidget):
     def minimumSizeHint(self) -> QtCore.QSize:
         return QtCore.QSize(600, 400)
 
+    def set_tiled(self, tiled):
+        """
+        Chooses how the overview is drawn.
+        
+        Has to be called before the signals of :attr:`child` are connected,
+        because the content is replaced.
+        
+        **Arguments**
+        
+            *tiled* (boolean):
+                Whether the overview is drawn as tiles in one graphics scene
+                (:class:`swan.widgets.tiled_plot_grid.TiledPlotContent`)
+                or with one widget per visible cell (:class:`MyPlotContent`).
+        
+        """
+        if tiled == isinstance(self.child, TiledPlotContent):
+            return
+        if tiled:
+            self.child = TiledPlotContent(self)
+            self.scroll_area.hide()
+            self.main_grid_layout.replaceWidget(self.scroll_area, self.child)
+        else:
+            self.main_grid_layout.replaceWidget(self.child, self.scroll_area)
+            self.child.setParent(None)
+            self.child = MyPlotContent(self)
+            self.scroll_area.setWidget(self.child)
+            self.scroll_area.show()
+
+    def resizeEvent(self, event):
+        QtWidgets.QWidget.resizeEvent(self, event)
+        self.child.update_visible()
+
 
-class MyPlotContent(QtWidgets.QWidget):
+class MyPlotContent(QtWidgets.QWidget, PlotCellGrid):
     """
     A class that manages :class:`src.myplotwidget.MyPlotWidget` 
     objects in a grid.
     
+    The state of every cell is kept in a :class:`swan.widgets.plot_cell.PlotCell`.
+    Widgets are only created for the cells inside the viewport of the
+    scroll area and are reused for other cells when the grid is scrolled,
+    so the number of widgets does not depend on the size of the grid.
+    
     The *args* and *kwargs* are passed to :class:`PyQt5.QtWidgets.QWidget`.
     
     """
@@ -57,53 +99,98 @@ class MyPlotContent(QtWidgets.QWidget):
         """
         **Properties**
         
-            *_shape* (tuple of integer):
-                The shape of the plot grid.
-                Format: (rows, cols)
-            *_plots* (list of :class:`src.myplotwidget.MyPlotWidget`):
-                The plots in a list for iterating over them.
-            *_selected* (list of :class:`MyPlotWidget`):
-                A list containing the selected plots.
-            *_rows* (dictionary):
-                A dictionary containing the row as key and a list
-                of plots as value for the plots in that row.
-            *_cols* (dictionary):
-                A dictionary containing the column as key and a list
-                of plots as value for the plots in that column.
-            *_yrange* (tuple of float):
-                The y range all plots should have. 
+            *_bound* (dictionary):
+                Maps the positions of the visible cells to their widgets.
+            *_pool* (list of :class:`src.myplotwidget.MyPlotWidget`):
+                The widgets that do not show a cell at the moment.
+            *_indicator_pool* (dictionary):
+                Maps 'unit' and 'session' to the hidden indicators
+                that are reused by the next grid.
+            *_batch_depth* (integer):
+                The number of open :meth:`batch` blocks.
+            *_visible_dirty* (boolean):
+                Whether the visible cells have changed during a batch.
+            *_overscan* (integer):
+                The number of rows and columns around the viewport
+                that get widgets, so that scrolling does not show empty cells.
+        
+        The cells and their selection are described in
+        :meth:`swan.widgets.plot_cell.PlotCellGrid.init_cells`.
         
         """
         QtWidgets.QWidget.__init__(self, *args, **kwargs)
-        self.grid_layout = QtWidgets.QGridLayout(self)
+        self.init_cells()
 
-        self._shape = None
-        self._plots = []
         self._indicators = []
-        self._selected = []
-        self._rows = {}
-        self._cols = {}
-        self._yrange = (-0.001, 0.0006)
-        self._xrange = (0, 0)
-        self._second_select = None
-        self._width = 60
-        self._height = 45
-        self._constant_dimension = 75
-
-        self._plot_gray = QtGui.QColor(180, 180, 180, 85)
+        self._unit_indicators = []
+        self._session_indicators = []
+        self._pivot_indicator = None
 
-        self.sample_waveform_number = 500
+        self._bound = {}
+        self._pool = []
+        self._indicator_pool = {'unit': [], 'session': []}
+        self._overscan = 1
+        self._batch_depth = 0
+        self._visible_dirty = False
 
-        self.grid_layout.setColumnStretch(1000, 1000)
-        self.grid_layout.setRowStretch(1000, 1000)
+    @contextmanager
+    def batch(self):
+        """
+        Suspends the updates of the grid while it is changed.
+        
+        The grid is repainted once at the end instead of after every
+        moved or resized widget, and the widgets are bound to the visible
+        cells once when the batch is closed. Batches can be nested.
+        
+        """
+        self._batch_depth += 1
+        if self._batch_depth == 1:
+            self.setUpdatesEnabled(False)
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                if self._visible_dirty:
+                    self.update_visible()
+                self.setUpdatesEnabled(True)
 
-        self.grid_layout.setHorizontalSpacing(1)
-        self.grid_layout.setVerticalSpacing(1)
+    def take_indicator(self, text, indicator_type, position):
+        """
+        Returns an indicator for a row or column, from the pool if possible.
+        
+        **Arguments**
+        
+            *text* (string):
+                The text of the indicator.
+            *indicator_type* (string):
+                The type of the indicator: 'unit' or 'session'.
+            *position* (integer):
+                The row of a unit indicator or the column of a session indicator.
+        
+            **Returns**: :class:`swan.widgets.indicator_cell.IndicatorWidget`
+                The indicator.
+        
+        """
+        pool = self._indicator_pool[indicator_type]
+        if pool:
+            iw = pool.pop()
+            iw.reset(text, position)
+        else:
+            iw = IndicatorWidget(
+                text, indicator_type=indicator_type, position=position,
+                width=self._width, height=self._height, const_dim=self._constant_dimension, parent=self
+            )
+            iw.select_indicator.connect(self.indicator_toggled)
+        self._indicators.append(iw)
+        return iw
 
     def make_plots(self, rows, cols, dates=None):
         """
         Creates a plot grid of the given shape.
         
+        The plot widgets and the indicators of the previous grid are reused.
+        
         **Arguments**
         
             *rows* (integer):
@@ -112,322 +199,231 @@ class MyPlotContent(QtWidgets.QWidget):
                 The number of columns of the grid.
         
         """
-        self.delete_plots()
-        self._shape = (rows, cols)
-        self._plots = []
-        self._indicators = []
-        self._rows = {}
-        self._cols = {}
+        with self.batch():
+            self.delete_plots()
+            self.make_cells(rows, cols, dates)
+            self._indicators = []
 
-        pivot_indicator = IndicatorWidget("Sessions (dd.mm.yy)\n\u2192\n\n\u2193 Units",
-                                          indicator_type='pivot', position=None,
-                                          width=self._width, height=self._height,
-                                          const_dim=self._constant_dimension)
-        pivot_indicator.responsive = False
-        self.grid_layout.addWidget(pivot_indicator, 0, 0, QtCore.Qt.AlignTop | QtCore.Qt.AlignLeft)
+            if self._pivot_indicator is None:
+                self._pivot_indicator = IndicatorWidget("Sessions (dd.mm.yy)\n\u2192\n\n\u2193 Units",
+                                                        indicator_type='pivot', position=None,
+                                                        width=self._width, height=self._height,
+                                                        const_dim=self._constant_dimension, parent=self)
+                self._pivot_indicator.responsive = False
 
-        for global_unit_id in range(rows):
-            iw = IndicatorWidget(
-                str(global_unit_id + 1), indicator_type='unit', position=global_unit_id,
-                width=self._width, height=self._height, const_dim=self._constant_dimension
-            )
-            self._indicators.append(iw)
-            iw.select_indicator.connect(self.indicator_toggled)
-            self.grid_layout.addWidget(iw, global_unit_id + 1, 0, QtCore.Qt.AlignTop | QtCore.Qt.AlignLeft)
+            self._unit_indicators = [self.take_indicator(str(global_unit_id + 1), 'unit', global_unit_id)
+                                     for global_unit_id in range(rows)]
 
-        for session_id in range(cols):
             if dates is not None:
-                iw = IndicatorWidget(
-                    str(session_id + 1) + " (" + str(dates[session_id].strftime("%d.%m.%y")) + ")",
-                    indicator_type='session', position=session_id,
-                    width=self._width, height=self._height, const_dim=self._constant_dimension
-                )
+                texts = [str(session_id + 1) + " (" + str(dates[session_id].strftime("%d.%m.%y")) + ")"
+                         for session_id in range(cols)]
             else:
-                iw = IndicatorWidget(
-                    str(session_id), indicator_type='session', position=session_id,
-                    width=self._width, height=self._height, const_dim=self._constant_dimension
-                )
-            self._indicators.append(iw)
-            iw.select_indicator.connect(self.indicator_toggled)
-            self.grid_layout.addWidget(iw, 0, session_id + 1, QtCore.Qt.AlignTop | QtCore.Qt.AlignLeft)
-
-        for unit_id in range(rows):
-            self._rows[unit_id] = []
-            for session_id in range(cols):
-                if session_id not in self._cols:
-                    self._cols[session_id] = []
-                plot_widget = MyPlotWidget(width=self._width, height=self._height)
-                self._plots.append(plot_widget)
+                texts = [str(session_id) for session_id in range(cols)]
+            self._session_indicators = [self.take_indicator(text, 'session', session_id)
+                                        for session_id, text in enumerate(texts)]
 
-                plot_widget.pos = (session_id, unit_id)
-
-                self._rows[unit_id].append(plot_widget)
-                self._cols[session_id].append(plot_widget)
-
-                plot_widget.select_plot.connect(self.select_plot)
-                plot_widget.colour_strip_toggle.connect(self.toggle_indicator_colour)
-                plot_widget.visibility_toggle.connect(self.toggle_plot_visibility)
-
-                self.grid_layout.addWidget(plot_widget, unit_id + 1, session_id + 1,
-                                           QtCore.Qt.AlignTop | QtCore.Qt.AlignLeft)
+            self.layout_grid()
+            for indicator in [self._pivot_indicator] + self._indicators:
+                indicator.show()
 
         return self._plots
 
-    @QtCore.pyqtSlot(object, int)
-    def toggle_indicator_colour(self, colour, i):
-        iw = next((x for x in self._indicators if x.row == i))
-        if any(plot.has_plot for plot in self._rows[i]):
-            iw.toggle_colour_strip(colour)
-        else:
-            iw.toggle_colour_strip(None)
-
-    @QtCore.pyqtSlot(object)
-    def indicator_toggled(self, indicator):
-        row = indicator.row
-        col = indicator.col
-        indicator_type = indicator.indicator_type
-        if indicator_type == 'unit':
-            plot_widgets = [pw for pw in self._plots if pw.pos[1] == row]
-        elif indicator_type == 'session':
-            plot_widgets = [pw for pw in self._plots if pw.pos[0] == col]
-        else:
-            plot_widgets = []
-
-        for pw in plot_widgets:
-            if not indicator.selected:
-                if indicator_type == 'session':
-                    pw.enable("col")
-                elif indicator_type == 'unit':
-                    pw.enable("row")
-            else:
-                pw.disable()
-                if indicator_type == 'session':
-                    pw.inhibited_by_col = True
-                elif indicator_type == 'unit':
-                    pw.inhibited_by_row = True
-        self.indicator_toggle.emit()
-
-    def toggle_plot_visibility(self, session_id, unit_id, visible):
-        self.visibility_toggle.emit(session_id, unit_id, visible)
-
-    def delete_plots(self):
-        """
-        Deletes all plots.
-        
-        """
-        for p in self._plots:
-            p.close()
-        for i in self._indicators:
-            i.close()
-
-    def clear_plots(self):
-        """
-        Clears all plots.
-        
-        """
-        for p in self._plots:
-            p.clear_()
-            p.enable("all")
-        for i in self._indicators:
-            i.colourStrip.hide()
-            if not i.selected:
-                i._bg = i.bgs["selected"]
-                i.set_background(i._bg)
-                i.selected = True
-
-    def do_plot(self, vum, data):
+    def set_indicators_responsive(self, responsive):
         """
-        Plots data on all plots.
-        
-        **Arguments**
-        
-            *vum* (:class:`src.virtualunitmap.VirtualUnitMap`):
-                Is needed to get the mapping.
-            *data* (:class:`src.neodata.NeoData`):
-                Is needed to get the data.
-        
-        """
-        active = vum.get_active()
-        for session in range(len(active)):
-            for global_unit_id in range(len(active[session])):
-                plot_widget = self.find_plot(global_unit_id, session)
-                if plot_widget.to_be_updated:
-                    plot_widget.clear_()
-                    pen_colour = vum.get_colour(global_unit_id)
-                    plot_widget.default_pen_colour = pen_colour
-                    if active[session][global_unit_id]:
-                        unit = vum.get_realunit(session, global_unit_id, data)
-                        mean_waveform = data.get_data("average", unit)
-                        # all_waveforms = data.get_data("all", unit)
-                        # try:
-                        #     plot_widget.plot_many(all_waveforms[choice(all_waveforms.shape[0],
-                        #                                                size=self.sample_waveform_number,
-                        #                                                replace=False)],
-                        #                           self._plot_gray)
-                        # except ValueError:
-                        #     plot_widget.plot_many(all_waveforms, self._plot_gray)
-                        plot_widget.plot(mean_waveform.magnitude, pen_colour)
-                        plot_widget.hasPlot = True
-                        plot_widget.toggle_colour_strip(pen_colour)
-                        plot_widget.plot_widget.setXRange(0., data.get_wave_length(), padding=None, update=True)
-                    else:
-                        plot_widget.toggle_colour_strip(pen_colour)
-                    plot_widget.to_be_updated = False
-
-    def set_all_for_update(self):
-        for plot in self._plots:
-            plot.to_be_updated = True
-
-    def find_plot(self, global_unit_id, session_id):
-        """
-        Finds a plot at a given position.
+        Lets the row and column indicators react to clicks or not.
         
         **Arguments**
         
-            *global_unit_id* (integer):
-                The row index.
-            *session_id* (integer):
-                The column index.
-        
-            **Returns**: :class:`src.myplotwidget.MyPlotWidget`
-                The plot at position (global_unit_id, session_id).
+            *responsive* (boolean):
+                Whether the indicators can be toggled.
         
         """
-        return self._rows[global_unit_id][session_id]
-
-    @QtCore.pyqtSlot(object)
-    def highlight_plot(self, item):
-        if item.opts['clickable']:
-            unit_id = item.opts['unit_id']
-            session = item.opts['session']
-
-            p = self.find_plot(unit_id, session)
-            self.select_plot(p, not p.selected)
+        for indicator in self._indicators:
+            indicator.responsive = responsive
+
+    def layout_grid(self):
+        """
+        Places the indicators, sets the size of the grid and
+        updates the widgets of the visible cells.
+        
+        """
+        rows, cols = self._shape
+        if self._pivot_indicator is not None:
+            self._pivot_indicator.move(0, 0)
+        for iw in self._unit_indicators:
+            iw.setFixedSize(self._constant_dimension, self._height)
+            iw.set_font_size()
+            iw.move(0, self.cell_origin(iw.row, 0)[1])
+        for iw in self._session_indicators:
+            iw.setFixedSize(self._width, self._constant_dimension)
+            iw.set_font_size()
+            iw.move(self.cell_origin(0, iw.col)[0], 0)
+
+        width, height = self.cell_origin(rows, cols)
+        self.setFixedSize(width, height)
+        for widget in self._bound.values():
+            widget.setFixedSize(self._width, self._height)
+            widget.move(*self.cell_origin(widget.pos[1], widget.pos[0]))
+        self.update_visible()
+
+    def visible_range(self):
+        """
+        Returns the rows and columns inside the viewport of the scroll area.
+        
+            **Returns**: tuple of range
+                The visible rows and columns.
+        
+        """
+        rows, cols = self._shape
+        rect = self.visibleRegion().boundingRect()
+        if rect.isEmpty() or rows == 0 or cols == 0:
+            return range(0), range(0)
+        offset = self._constant_dimension + self._spacing
+        row_step = self._height + self._spacing
+        col_step = self._width + self._spacing
+        first_row = max((rect.top() - offset) // row_step - self._overscan, 0)
+        last_row = min((rect.bottom() - offset) // row_step + self._overscan, rows - 1)
+        first_col = max((rect.left() - offset) // col_step - self._overscan, 0)
+        last_col = min((rect.right() - offset) // col_step + self._overscan, cols - 1)
+        return range(first_row, last_row + 1), range(first_col, last_col + 1)
+
+    def update_visible(self):
+        """
+        Binds widgets to the visible cells and releases the widgets
+        of the cells that have been scrolled out of view.
+        
+        Inside a :meth:`batch` this is done when the batch is closed.
+        
+        """
+        if self._batch_depth:
+            self._visible_dirty = True
+            return
+        self._visible_dirty = False
+        rows, cols = self.visible_range()
+        visible = {(col, row) for row in rows for col in cols}
+
+        for pos in list(self._bound.keys()):
+            if pos not in visible:
+                widget = self._bound.pop(pos)
+                widget.unbind()
+                self._pool.append(widget)
+
+        for session_id, unit_id in visible:
+            if (session_id, unit_id) in self._bound:
+                continue
+            if self._pool:
+                widget = self._pool.pop()
+            else:
+                widget = MyPlotWidget(width=self._width, height=self._height)
+                widget.setParent(self)
+                widget.thumbnail_provider = self.get_thumbnail
+                widget.select_plot.connect(self.select_plot)
+            widget.setFixedSize(self._width, self._height)
+            widget.move(*self.cell_origin(unit_id, session_id))
+            widget.bind(self._rows[unit_id][session_id])
+            self.apply_ranges(widget)
+            self._bound[(session_id, unit_id)] = widget
+            widget.show()
 
-    def select_plot(self, plot, select):
+    def apply_ranges(self, widget):
         """
-        Selects or deselects a plot on the grid.
-        
-        If nothing is selected, the plot will be selected.
-        Second selection is only allowed if the plot is in the same column 
-        as the other one and if not two are already selected.
+        Sets the x and y range of the grid on a widget.
         
         **Arguments**
         
-            *plot* (:class:`src.myplotwidget.MyPlotWidget`):
-                The plot to (de)select.
-            *select* (boolean):
-                Whether or not the plot should be selected.
+            *widget* (:class:`src.myplotwidget.MyPlotWidget`):
+                The widget.
         
         """
-        if select:
-            if len(self._selected) == 1 and self._selected[0].pos[0] == plot.pos[0]:
-                self._selected.append(plot)
-                plot.change_background(select)
-                plot.selected = select
-                self._second_select = plot
-                self.plot_selected.emit(plot, select)
-
-            elif not self._selected:
-                self._selected.append(plot)
-                plot.change_background(select)
-                plot.selected = select
-                self._second_select = None
-                self.plot_selected.emit(plot, select)
-
-            elif self._second_select is not None and self._selected[0].pos[0] == plot.pos[0]:
-                self._selected.remove(self._second_select)
-                self._second_select.change_background(not select)
-                self._second_select.selected = not select
-                self.plot_selected.emit(self._second_select, not select)
-                self._second_select = plot
-
-                self._selected.append(plot)
-                plot.change_background(select)
-                plot.selected = select
-                self.plot_selected.emit(plot, select)
+        widget.plot_widget.setYRange(self._yrange[0], self._yrange[1], padding=None, update=True)
+        if self._xrange is not None:
+            widget.plot_widget.setXRange(self._xrange[0], self._xrange[1], padding=None, update=True)
 
-        elif plot in self._selected:
-            self._selected.remove(plot)
-            plot.change_background(select)
-            plot.selected = select
-            self.plot_selected.emit(plot, select)
+    def showEvent(self, event):
+        QtWidgets.QWidget.showEvent(self, event)
+        self.update_visible()
 
-    def reset_selection(self):
-        """
-        Resets the selection.
-        
-        """
-        for p in self._selected:
-            p.selected = False
-            p.change_background(False)
-        self._selected = []
+    def moveEvent(self, event):
+        # the scroll area moves this widget when it is scrolled
+        QtWidgets.QWidget.moveEvent(self, event)
+        self.update_visible()
 
-    def get_selection(self):
+    def update_colour_strips(self):
         """
-            **Returns**: list of :class:`src.myplotwidget.MyPlotWidget`
-                The selected plots.
+        Shows the colour of the unit next to every row that has a plot.
         
         """
-        return self._selected
+        for iw in self._unit_indicators:
+            colour = self.row_colour(iw.row)
+            iw.toggle_colour_strip(mkColor(colour) if colour is not None else None)
 
-    def zoom_in(self, step=25.0):
+    def delete_plots(self):
         """
-        Zooms in the plots.
+        Deletes all plots.
         
-        **Arguments**
-        
-            *step* (float):
-                The zoom step percentage.
-                Default: 25.0 percent.
+        The widgets of the cells and the indicators are hidden
+        and kept for the next grid.
         
         """
-        for plot in self._plots:
-            plot.change_size(width=step, height=step)
-        for indicator in self._indicators:
-            indicator.change_size(width=step, height=step)
+        for widget in self._bound.values():
+            widget.unbind()
+            self._pool.append(widget)
+        self._bound = {}
+        if self._pivot_indicator is not None:
+            self._pivot_indicator.hide()
+        for i in self._indicators:
+            i.hide()
+            self._indicator_pool[i.indicator_type].append(i)
+        self._indicators = []
+        self._unit_indicators = []
+        self._session_indicators = []
 
-    def zoom_out(self, step=25.0):
+    def clear_plots(self):
         """
-        Zooms out the plots.
-
-        **Arguments**
-        
-            *step* (float):
-                The zoom step percentage.
-                Default: 25.0 percent.
+        Clears all plots.
         
         """
-        for plot in self._plots:
-            plot.change_size(width=-step, height=-step)
-        for indicator in self._indicators:
-            indicator.change_size(width=-step, height=-step)
+        self.clear_cells()
+        for i in self._indicators:
+            i.colour_strip.hide()
+            if not i.selected:
+                i.default_background = i.backgrounds["selected"]
+                i.set_background(i.default_background)
+                i.selected = True
 
-    def expand(self, step=150):
+    def do_plot(self, vum, data):
         """
-        Increases the y range of the plots.
-
-        **Arguments**
+        Plots data on all plots.
         
-            *step* (integer):
-                The expand step.
-                Default: 150 pixels.
+        See :meth:`swan.widgets.plot_cell.PlotCellGrid.do_plot`.
+        The x range of the visible widgets is set to the new wave length
+        and the thumbnails of the visible cells are cached, so this part
+        of the grid can be shown before the data is loaded next time.
         
         """
-        self.set_yranges(self._yrange[0] - step, self._yrange[1] + step)
+        PlotCellGrid.do_plot(self, vum, data)
+        for widget in self._bound.values():
+            self.apply_ranges(widget)
+            if widget.cell.data is not None:
+                self.get_thumbnail(widget.cell)
 
-    def collapse(self, step=150):
+    def change_size(self, step):
         """
-        Decreases the y range of the plots.
+        Resizes all cells by the given step.
         
         **Arguments**
         
-            *step* (integer):
-                The collapse step.
-                Default: 150 pixels.        
+            *step* (float):
+                The change step percentage for the width.
+                The height is three quarters of the width.
         
         """
-        self.set_yranges(self._yrange[0] + step, self._yrange[1] - step)
+        width = int(self._width + self._width * (step / 100.0))
+        height = int((3. / 4.) * width)
+        if width > 0 and height > 0:
+            self._width, self._height = width, height
+            with self.batch():
+                self.layout_grid()
 
     def set_yranges(self, min0, max0):
         """
@@ -442,8 +438,8 @@ class MyPlotContent(QtWidgets.QWidget):
         
         """
         self._yrange = (min0, max0)
-        for plot in self._plots:
-            plot.plot_widget.setYRange(min0, max0, padding=None, update=True)
+        for widget in self._bound.values():
+            widget.plot_widget.setYRange(min0, max0, padding=None, update=True)
 
     def set_xranges(self, min0, max0):
         """
@@ -458,32 +454,5 @@ class MyPlotContent(QtWidgets.QWidget):
         
         """
         self._xrange = (min0, max0)
-        for plot in self._plots:
-            plot.plot_widget.setXRange(min0, max0, padding=None, update=True)
-
-    def set_tooltips(self, tooltips):
-        """
-        Sets tool tips for all plots.
-        
-        **Arguments**
-        
-            *tooltips* (dictionary):
-                A dictionary containing for each column of the grid
-                a list of string containing the tool tips for that column.
-        
-        """
-        for col in self._cols.keys():
-            tips = tooltips[col]
-            plots = self._cols[col]
-            for t, plot in zip(tips, plots):
-                plot.set_tooltip(t)
-
-    def swap_tooltips(self, p1, p2):
-        """
-        Swaps the tooltips for two plots that have been swapped.
-        """
-        tip1 = p1.toolTip()
-        tip2 = p2.toolTip()
-
-        p1.set_tooltip(tip2)
-        p2.set_tooltip(tip1)
+        for widget in self._bound.values():
+            widget.plot_widget.setXRange(min0, max0, padding=None, update=True)
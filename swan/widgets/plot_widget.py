@@ -7,7 +7,8 @@ In this module you can find the :class:`MyPlotWidget`. It inherits
 from :class:`pyqtgraph.PlotWidget`.
 
 This widget is used by :class:`src.myplotgrid.MyPlotContent` to show
-many of these widgets in a nice overview.
+many of these widgets in a nice overview. Each widget shows one
+:class:`swan.widgets.plot_cell.PlotCell` at a time.
 """
 from pyqtgraph.Qt import QtCore, QtGui, QtWidgets
 import pyqtgraph as pg
@@ -15,6 +16,36 @@ from pyqtgraph import PlotWidget, mkColor, mkPen, arrayToQPath
 import numpy as np
 
 
+def density_image(counts, colour=(180, 180, 180), opacity=170):
+    """
+    Converts a waveform density into an image with the density as alpha.
+    
+    **Arguments**
+    
+        *counts* (numpy array of shape (samples, bins)):
+            The number of waveforms per time and amplitude bin,
+            see :func:`swan.unit_summary.waveform_density`.
+        *colour* (tuple of integer):
+            The colour of the image.
+            Default: light gray.
+        *opacity* (integer):
+            The alpha of the densest bin.
+            Default: 170.
+    
+        **Returns**: numpy array of shape (samples, bins, 4)
+            The RGBA image.
+    
+    """
+    counts = np.asarray(counts, dtype=np.float64)
+    image = np.zeros(counts.shape + (4,), dtype=np.uint8)
+    image[..., :3] = colour
+    peak = counts.max() if counts.size else 0.
+    if peak > 0:
+        # logarithmic, so that rare waveforms stay visible next to the dense core
+        image[..., 3] = np.log1p(counts) / np.log1p(peak) * opacity
+    return image
+
+
 class MyPlotWidget(QtWidgets.QWidget):
     """
     Pyqtgraph's PlotWidget extended to have a fast and simple one 
@@ -26,39 +57,48 @@ class MyPlotWidget(QtWidgets.QWidget):
     """
 
     select_plot = QtCore.pyqtSignal("PyQt_PyObject", bool)
-    colour_strip_toggle = QtCore.pyqtSignal(object, int)
-    visibility_toggle = QtCore.pyqtSignal(int, int, bool)
     """
-    Signal to emit if this plot is selected by clicking on it.
+    Signal to emit with the :class:`swan.widgets.plot_cell.PlotCell`
+    shown by this widget if it is selected by clicking on it.
     
     """
 
     def __init__(self, width=200, height=150, *args, **kwargs):
-
+        """
+        **Properties**
+        
+            *cell* (:class:`swan.widgets.plot_cell.PlotCell` or None):
+                The cell this widget shows. The widget is reused for
+                other cells when the grid is scrolled.
+            *thumbnail_provider* (function or None):
+                Returns the cached thumbnail of a cell, see
+                :meth:`swan.widgets.plot_cell.PlotCellGrid.get_thumbnail`.
+                It is used to show a cell before its data has been loaded.
+        
+        """
         QtWidgets.QWidget.__init__(self, *args, **kwargs)
         self.central_layout = QtWidgets.QGridLayout()
         self.plot_widget = PlotWidget(*args, **kwargs)
 
+        self.thumbnail_label = QtWidgets.QLabel(self)
+        self.thumbnail_label.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents, True)
+        self.thumbnail_label.hide()
+
         self.setup()
 
         # attributes and properties
         self.plot_item = self.plot_widget.getPlotItem()
         self.plot_item.disableAutoRange()
 
-        self.selected = False
+        self.cell = None
+        self.thumbnail_provider = None
         self.in_focus = False
-        self.disabled = False
-        self.inhibited_by_row = False
-        self.inhibited_by_col = False
-        self.to_be_updated = True
-        self.has_plot = False
         self.default_size = (width, height)
         self.pos = (0, 0)
         self.default_pens = []
         self.data_items = []
 
         # setting the palette
-        self.default_pen_colour = None
         self.backgrounds = {"normal": mkColor('k'),
                             "selected": mkColor(0.2),
                             "disabled": mkColor(0.25),
@@ -68,6 +108,96 @@ class MyPlotWidget(QtWidgets.QWidget):
 
         self.setFixedSize(self.default_size[0], self.default_size[1])
 
+    @property
+    def selected(self):
+        return self.cell is not None and self.cell.selected
+
+    @property
+    def disabled(self):
+        return self.cell is None or self.cell.disabled
+
+    def bind(self, cell):
+        """
+        Shows a cell with this widget.
+        
+        **Arguments**
+        
+            *cell* (:class:`swan.widgets.plot_cell.PlotCell`):
+                The cell to show.
+        
+        """
+        if self.cell is not None and self.cell.widget is self:
+            self.cell.widget = None
+        self.cell = cell
+        cell.widget = self
+        self.pos = cell.pos
+        self.in_focus = False
+        # the font of the tool tips is global, it was set with the first tool tip
+        self.setToolTip(cell.tooltip)
+        self.redraw()
+
+    def unbind(self):
+        """
+        Releases the cell shown by this widget and hides it.
+        
+        """
+        if self.cell is not None and self.cell.widget is self:
+            self.cell.widget = None
+        self.cell = None
+        self.clear_()
+        self.hide()
+
+    def redraw(self):
+        """
+        Draws the data and the state of the bound cell.
+        
+        """
+        self.clear_()
+        cell = self.cell
+        if cell is None:
+            return
+        if cell.data is not None:
+            if cell.density is not None and not cell.disabled:
+                self.plot_density(*cell.density)
+            self.plot(cell.data, cell.default_pen_colour)
+        elif cell.source is not None and self.thumbnail_provider is not None:
+            self.show_thumbnail(self.thumbnail_provider(cell))
+        if cell.disabled:
+            self.plot_widget.setBackground(self.backgrounds["disabled"])
+            for data_item in self.data_items:
+                data_item.setPen(self.disPen)
+        else:
+            self.change_background(cell.selected)
+
+    def show_thumbnail(self, bitmap):
+        """
+        Shows a thumbnail in place of the plot.
+        
+        **Arguments**
+        
+            *bitmap* (:class:`PyQt5.QtGui.QBitmap` or None):
+                The thumbnail of the cell. It is drawn with the colour of the cell.
+        
+        """
+        if bitmap is None or self.cell is None:
+            self.thumbnail_label.hide()
+            return
+        pixmap = QtGui.QPixmap(self.size())
+        pixmap.fill(self.background)
+        painter = QtGui.QPainter(pixmap)
+        painter.setPen(mkColor(self.cell.default_pen_colour))
+        painter.drawPixmap(pixmap.rect(), bitmap, bitmap.rect())
+        painter.end()
+        self.thumbnail_label.setPixmap(pixmap)
+        self.thumbnail_label.setGeometry(self.rect())
+        self.thumbnail_label.show()
+        self.thumbnail_label.raise_()
+
+    def resizeEvent(self, event):
+        QtWidgets.QWidget.resizeEvent(self, event)
+        if self.thumbnail_label.isVisible():
+            self.show_thumbnail(self.thumbnail_provider(self.cell))
+
     def setup(self):
 
         self.central_layout.setSpacing(0)
@@ -102,6 +232,27 @@ class MyPlotWidget(QtWidgets.QWidget):
         self.default_pens.append(mkColor(color))
         self.data_items.append(plot)
 
+    def plot_density(self, counts, extremes):
+        """
+        Plots a waveform density as one image under the mean waveform.
+        
+        **Arguments**
+        
+            *counts* (numpy array of shape (samples, bins)):
+                The number of waveforms per time and amplitude bin.
+            *extremes* (numpy array of shape (2,)):
+                The amplitude range of the bins.
+        
+        """
+        low, high = extremes
+        if not np.isfinite(low) or not np.isfinite(high) or high <= low:
+            return
+        image = pg.ImageItem(density_image(counts), axisOrder="col-major")
+        # the samples are centered on their bins like the points of the mean waveform
+        image.setRect(QtCore.QRectF(-0.5, low, counts.shape[0], high - low))
+        image.setZValue(-1)
+        self.plot_item.addItem(image)
+
     def plot_many(self, ys, color='w'):
         """
         Plots data on the PlotItem.
@@ -162,7 +313,7 @@ class MyPlotWidget(QtWidgets.QWidget):
         self.plot_item.clear()
         self.data_items.clear()
         self.default_pens.clear()
-        self.has_plot = False
+        self.thumbnail_label.hide()
 
     def set_tooltip(self, tooltip):
         """
@@ -177,41 +328,6 @@ class MyPlotWidget(QtWidgets.QWidget):
         self.setToolTip(tooltip)
         QtWidgets.QToolTip.setFont(QtGui.QFont('Arial', 9))
 
-    def toggle_colour_strip(self, col):
-        colour = mkColor(col)
-        self.colour_strip_toggle.emit(colour, self.pos[1])
-
-    def set_for_update(self):
-        self.to_be_updated = True
-
-    def set_as_updated(self):
-        self.to_be_updated = False
-
-    def disable(self):
-        if self.selected:
-            self.select_plot.emit(self, not self.selected)
-        self.disabled = True
-        self.visibility_toggle.emit(self.pos[0], self.pos[1], False)
-        self.plot_widget.setBackground(self.backgrounds["disabled"])
-        for data_item in self.data_items:
-            data_item.setPen(self.disPen)
-
-    def enable(self, which):
-        if which == "row":
-            self.inhibited_by_row = False
-        elif which == "col":
-            self.inhibited_by_col = False
-        elif which == "all":
-            self.inhibited_by_row = False
-            self.inhibited_by_col = False
-
-        if not self.inhibited_by_row and not self.inhibited_by_col:
-            self.disabled = False
-            self.visibility_toggle.emit(self.pos[0], self.pos[1], True)
-            self.plot_widget.setBackground(self.backgrounds["normal"])
-            for dataItem in self.data_items:
-                dataItem.setPen(mkColor(self.default_pen_colour), width=2)
-
     def close(self):
         self.plot_widget.close()
         self.setParent(None)
@@ -229,7 +345,7 @@ class MyPlotWidget(QtWidgets.QWidget):
         
         """
         if event.button() == QtCore.Qt.LeftButton and not self.disabled:
-            self.select_plot.emit(self, not self.selected)
+            self.select_plot.emit(self.cell, not self.selected)
             PlotWidget.mousePressEvent(self.plot_widget, event)
             event.accept()
         else:
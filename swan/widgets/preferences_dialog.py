@@ -28,10 +28,12 @@ class Preferences_Dialog(QtWidgets.QDialog):
     ======================  ======================  ======================
     Default project name    defaultProName          File name
     Cache location          cacheDir                Existing directory
+    Cache size limit        cacheSize               0 - 10000 (GB)
     Zoom in step            zinStep                 1 - 200
     Zoom out step           zoutStep                1 - 200
     Expand step             expandStep              1 - 500
     Collapse step           collapseStep            1 - 500
+    Tiled overview          tiledOverview           True or False
     ======================  ======================  ======================
 
     .. warning::
@@ -46,12 +48,15 @@ class Preferences_Dialog(QtWidgets.QDialog):
         *PREFS* (dictionary):
             The default preferences given as (key, value) pares.
             These are needed to restore the defaults.
+        *cache_usage* (integer):
+            The current size of the cache directory in bytes.
+            Default: 0.
     
     The *args* and *kwargs* are passed to :class:`PyQt5.QtWidgets.QDialog`.
     
     """
 
-    def __init__(self, preferences, PREFS, *args, **kwargs):
+    def __init__(self, preferences, PREFS, cache_usage=0, *args, **kwargs):
         """
         **Properties**
         
@@ -80,11 +85,14 @@ class Preferences_Dialog(QtWidgets.QDialog):
         self.ui.projectNameEdit.textChanged.connect(self.checkName)
         self.ui.cacheDirEdit.textChanged.connect(self.checkCache)
         self.ui.cacheDirBtn.clicked.connect(self.onCacheDir)
+        self.ui.cacheSizeEdit.textChanged.connect(self.checkCacheSize)
+        self.ui.cacheUsageLabel.setText("{0:.2f} GB".format(cache_usage / 2 ** 30))
         #option: Overview
         self.ui.zinStepEdit.textChanged.connect(self.checkZoomInStep)
         self.ui.zoutStepEdit.textChanged.connect(self.checkZoomOutStep)
         self.ui.expandStepEdit.textChanged.connect(self.checkExpandStep)
         self.ui.collapseStepEdit.textChanged.connect(self.checkCollapseStep)
+        self.ui.tiledOverviewCheck.toggled.connect(self.checkTiledOverview)
         
         self.setup()
     
@@ -160,6 +168,38 @@ class Preferences_Dialog(QtWidgets.QDialog):
         """
         self._preferences["cacheDir"] = str(dirname)
         
+    def checkCacheSize(self, size):
+        """
+        Checks if the cache size limit is correct.
+        If so, the limit will be set.
+        
+        **Arguments**
+        
+            *size* (:class:`PyQt4.QtCore.QString`):
+                The current input value for the cache size limit in GB.
+        
+        """
+        try:
+            size = float(size)
+            if size < 0 or size > 10000:
+                raise ValueError
+            self._preferences["cacheSize"] = size
+            self.ui.errorLabel.setText("")
+        except ValueError:
+            self.ui.errorLabel.setText("There are wrong input values")
+        
+    def checkTiledOverview(self, checked):
+        """
+        Sets whether the overview is drawn as one scene.
+        
+        **Arguments**
+        
+            *checked* (boolean):
+                The current state of the check box.
+        
+        """
+        self._preferences["tiledOverview"] = bool(checked)
+        
     def onCacheDir(self):
         """
         This method is called if you click on *browse...* next to the
@@ -302,6 +342,9 @@ class Preferences_Dialog(QtWidgets.QDialog):
             if str(self.ui.errorLabel.text()):
                 return
             self.checkCache(self.ui.cacheDirEdit.text())
+            if str(self.ui.errorLabel.text()):
+                return
+            self.checkCacheSize(self.ui.cacheSizeEdit.text())
             if str(self.ui.errorLabel.text()):
                 return
             self.checkZoomInStep(self.ui.zinStepEdit.text())
@@ -347,11 +390,13 @@ class Preferences_Dialog(QtWidgets.QDialog):
         #option: general
         self.ui.projectNameEdit.setText(pref["projectName"])
         self.ui.cacheDirEdit.setText(pref["cacheDir"])
+        self.ui.cacheSizeEdit.setText(str(pref["cacheSize"]))
         #option: overview
         self.ui.zinStepEdit.setText(str(pref["zinStep"]))
         self.ui.zoutStepEdit.setText(str(pref["zoutStep"]))
         self.ui.expandStepEdit.setText(str(pref["expandStep"]))
         self.ui.collapseStepEdit.setText(str(pref["collapseStep"]))
+        self.ui.tiledOverviewCheck.setChecked(bool(pref["tiledOverview"]))
         
     def get_preferences(self):
         """
@@ -20,7 +20,7 @@ class SelectorWidget(QtWidgets.QWidget):
     
     """
     
-    doChannel = QtCore.pyqtSignal(int, int)
+    doChannel = QtCore.pyqtSignal(int)
     """
     Signal to emit if there was a channel selection.
     
@@ -139,6 +139,38 @@ class SelectorWidget(QtWidgets.QWidget):
             return match[0]
         return None
 
+    def get_likely_channels(self, channel):
+        """
+        Returns the channels that are likely to be selected after the given one.
+        
+        These are the next selectable channel by channel id
+        followed by the neighbours of the channel in the grid.
+        Both are taken from the items of the grid, so they follow
+        the connector map set with :func:`set_channels`.
+        
+        **Arguments**
+        
+            *channel* (integer):
+                The channel id of the current item.
+                
+            **Returns**: list of integer
+                The channel ids of the selectable items.
+        
+        """
+        item = self.get_item(channel)
+        if item is None:
+            return []
+        later = [s.channel for s in self._items if s.selectable and s.channel > channel]
+        channels = [min(later)] if later else []
+
+        row, col = item.pos
+        items = {s.pos: s for s in self._items}
+        for pos in [(row, col - 1), (row - 1, col), (row + 1, col), (row, col + 1)]:
+            neighbour = items.get(pos)
+            if neighbour is not None and neighbour.selectable and neighbour.channel not in channels:
+                channels.append(neighbour.channel)
+        return channels
+
     def select_channel(self, item, channel):
         """
         Selects a channel and emits the doChannel signal
@@ -154,12 +186,11 @@ class SelectorWidget(QtWidgets.QWidget):
         """
         self.lastchannel = self.currentchannel
         self.currentchannel = channel
-        lastchannel = self.lastchannel
         self.reset_sel()
         self._sel = item
         for selector_item in self._dirty_items:
             selector_item.repaint()
-        self.doChannel.emit(channel, lastchannel)
+        self.doChannel.emit(channel)
         
     def select_only(self, channel):
         """
@@ -0,0 +1,350 @@
+"""
+Created on Oct 18, 2026
+
+@author: SWAN authors and contributors
+
+In this module you can find the :class:`ThumbnailCache` which keeps the
+rendered mean waveforms of the overview grid.
+
+A thumbnail is a :class:`PyQt5.QtGui.QBitmap` of one cell that only
+contains the curve. It is drawn with the pen colour of the row, so it does
+not depend on the colour and can be reused after two units have been swapped.
+Thumbnails are kept in memory. Those drawn with the y range and size of
+the saved layout of a channel are also written to a directory next to the
+data cache by a background thread. When a channel is opened again, the
+grid can be painted from the layout before the data has been loaded.
+"""
+# system imports
+import hashlib
+import json
+import os
+import queue
+import threading
+from collections import OrderedDict
+from os.path import exists, getmtime, join
+
+import numpy as np
+from pyqtgraph import arrayToQPath
+from pyqtgraph.Qt import QtCore, QtGui
+
+# swan-specific imports
+from swan.cache_manager import THUMBNAIL_DIR
+
+
+def render_thumbnail(curve, xrange, yrange, size, pen_width=2):
+    """
+    Renders a mean waveform into a bitmap.
+
+    **Arguments**
+
+        *curve* (numpy array):
+            The mean waveform.
+        *xrange* (tuple of float or None):
+            The x range of the cell in samples.
+            If it is None, the whole curve is shown.
+        *yrange* (tuple of float):
+            The y range of the cell.
+        *size* (tuple of integer):
+            The width and the height of the bitmap in pixels.
+        *pen_width* (integer):
+            The width of the curve in pixels.
+            Default: 2.
+
+        **Returns**: :class:`PyQt5.QtGui.QBitmap`
+            The bitmap with the set bits on the curve.
+
+    """
+    width, height = size
+    bitmap = QtGui.QBitmap(width, height)
+    bitmap.fill(QtCore.Qt.color0)
+    curve = np.asarray(curve, dtype=np.float64).ravel()
+    xmin, xmax = xrange if xrange is not None else (0., len(curve) - 1.)
+    ymin, ymax = yrange
+    if len(curve) < 2 or xmax == xmin or ymax == ymin:
+        return bitmap
+
+    xs = (np.arange(len(curve)) - xmin) / (xmax - xmin) * width
+    ys = (ymax - curve) / (ymax - ymin) * height
+    painter = QtGui.QPainter(bitmap)
+    pen = QtGui.QPen(QtCore.Qt.color1)
+    pen.setWidth(pen_width)
+    painter.setPen(pen)
+    painter.drawPath(arrayToQPath(xs, ys))
+    painter.end()
+    return bitmap
+
+
+class ThumbnailCache(object):
+    """
+    A memory and disk cache of the thumbnails of the overview grid.
+
+    A thumbnail is identified by the source of its unit and the way it is
+    drawn, see :func:`make_key`.
+
+    **Arguments**
+
+        *cache_dir* (string or None):
+            The data cache directory. The thumbnails are stored in its
+            subdirectory *thumbnails*. If it is None, they are only kept in memory.
+            Default: None.
+        *max_items* (integer):
+            The maximum number of thumbnails kept in memory.
+            Default: 8192.
+        *max_files* (integer):
+            The maximum number of files in the thumbnail directory.
+            The oldest ones are removed when the directory is set
+            and whenever there are more.
+            Default: 20000.
+
+    """
+
+    def __init__(self, cache_dir=None, max_items=8192, max_files=20000):
+        """
+        **Properties**
+
+            *directory* (string or None):
+                The directory of the thumbnails.
+            *_items* (:class:`collections.OrderedDict`):
+                The thumbnails in memory, the least recently used first.
+            *_layouts* (dictionary):
+                The layouts written last, to avoid writing them again.
+            *_files* (integer):
+                The number of files in the thumbnail directory.
+            *_queue* (:class:`queue.Queue`):
+                The thumbnails waiting to be written by the writer thread.
+            *_writer* (:class:`threading.Thread` or None):
+                The thread that writes the thumbnails.
+            *_lock* (:class:`threading.Lock`):
+                Guards the directory and the number of files,
+                which are shared with the writer thread.
+
+        """
+        self.max_items = max_items
+        self.max_files = max_files
+        self.directory = None
+        self._items = OrderedDict()
+        self._layouts = {}
+        self._files = 0
+        self._queue = queue.Queue()
+        self._writer = None
+        self._lock = threading.Lock()
+        self.set_cache_dir(cache_dir)
+
+    def set_cache_dir(self, cache_dir):
+        """
+        Sets the directory of the thumbnails and removes the oldest
+        files if there are too many.
+
+        **Arguments**
+
+            *cache_dir* (string or None):
+                The data cache directory.
+
+        """
+        with self._lock:
+            self.directory = join(cache_dir, THUMBNAIL_DIR) if cache_dir else None
+            self._layouts = {}
+            self._files = 0
+            if self.directory is not None and exists(self.directory):
+                self._files = len(os.listdir(self.directory))
+                self._prune()
+
+    def _prune(self):
+        """
+        Removes the oldest files of the thumbnail directory if there
+        are more than *max_files*. A quarter of them is removed at once,
+        so that the directory is not listed after every write.
+
+        It has to be called with the lock held.
+
+        """
+        if self._files <= self.max_files:
+            return
+        paths = [join(self.directory, name) for name in os.listdir(self.directory)]
+        paths.sort(key=lambda path: getmtime(path) if exists(path) else 0)
+        remove = len(paths) - self.max_files * 3 // 4
+        for path in paths[:max(remove, 0)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._files = len(os.listdir(self.directory))
+
+    @staticmethod
+    def make_key(source, yrange, size):
+        """
+        Returns the key of a thumbnail.
+
+        **Arguments**
+
+            *source* (tuple):
+                The source key of the session file, the channel and the
+                index of the real unit.
+            *yrange* (tuple of float):
+                The y range of the cell.
+            *size* (tuple of integer):
+                The width and the height of the cell in pixels.
+
+            **Returns**: tuple
+                The key.
+
+        """
+        return tuple(source) + (float(yrange[0]), float(yrange[1]), int(size[0]), int(size[1]))
+
+    def _path(self, kind, key):
+        digest = hashlib.sha1(json.dumps(list(key)).encode()).hexdigest()
+        return join(self.directory, kind + "_" + digest)
+
+    def get(self, key):
+        """
+        Returns a thumbnail from memory or from the disk.
+
+        **Arguments**
+
+            *key* (tuple):
+                The key of the thumbnail, see :func:`make_key`.
+
+            **Returns**: :class:`PyQt5.QtGui.QBitmap` or None
+                The thumbnail or None if it is not cached.
+
+        """
+        bitmap = self._items.get(key)
+        if bitmap is not None:
+            self._items.move_to_end(key)
+            return bitmap
+        if self.directory is None:
+            return None
+        path = self._path("thumb", key) + ".png"
+        if not exists(path):
+            return None
+        image = QtGui.QImage(path)
+        if image.isNull():
+            return None
+        bitmap = QtGui.QBitmap.fromImage(image)
+        self._remember(key, bitmap)
+        return bitmap
+
+    def put(self, key, bitmap, persist=True):
+        """
+        Stores a thumbnail in memory and, if asked to, on the disk.
+
+        The file is written by a background thread,
+        so painting is not slowed down by the disk.
+
+        **Arguments**
+
+            *key* (tuple):
+                The key of the thumbnail, see :func:`make_key`.
+            *bitmap* (:class:`PyQt5.QtGui.QBitmap`):
+                The thumbnail.
+            *persist* (boolean):
+                Whether the thumbnail should be written to the disk.
+                Default: True.
+
+        """
+        self._remember(key, bitmap)
+        if self.directory is None or not persist:
+            return
+        # pixmaps can only be used in the GUI thread, images everywhere
+        self._queue.put((self._path("thumb", key) + ".png", bitmap.toImage()))
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_files, name="ThumbnailWriter", daemon=True)
+            self._writer.start()
+
+    def _write_files(self):
+        """
+        Writes the queued thumbnails until the queue is empty.
+
+        """
+        while True:
+            try:
+                path, image = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                return
+            try:
+                with self._lock:
+                    if self.directory is None or not path.startswith(self.directory):
+                        continue
+                    os.makedirs(self.directory, exist_ok=True)
+                    if not exists(path):
+                        self._files += 1
+                    image.save(path, "PNG")
+                    self._prune()
+            except OSError:
+                pass
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """
+        Waits until all queued thumbnails have been written.
+
+        """
+        self._queue.join()
+
+    def _remember(self, key, bitmap):
+        self._items[key] = bitmap
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+    def get_layout(self, sources, channel):
+        """
+        Returns the layout of a channel that was plotted before.
+
+        **Arguments**
+
+            *sources* (list of string):
+                The source keys of the session files.
+            *channel* (integer):
+                The channel.
+
+            **Returns**: dictionary or None
+                The layout, see :meth:`swan.widgets.plot_cell.PlotCellGrid.get_layout`,
+                or None if the channel has not been plotted.
+
+        """
+        if self.directory is None:
+            return None
+        path = self._path("layout", list(sources) + [channel]) + ".json"
+        if not exists(path):
+            return None
+        try:
+            with open(path, "r") as fn:
+                return json.load(fn)
+        except (OSError, ValueError):
+            return None
+
+    def put_layout(self, sources, channel, layout):
+        """
+        Stores the layout of a channel on the disk.
+
+        **Arguments**
+
+            *sources* (list of string):
+                The source keys of the session files.
+            *channel* (integer):
+                The channel.
+            *layout* (dictionary):
+                The layout, see :meth:`swan.widgets.plot_cell.PlotCellGrid.get_layout`.
+
+        """
+        if self.directory is None:
+            return
+        path = self._path("layout", list(sources) + [channel]) + ".json"
+        if self._layouts.get(path) == layout:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "w") as fn:
+                json.dump(layout, fn)
+            self._layouts[path] = layout
+        except OSError:
+            pass
+
+    def clear(self):
+        """
+        Removes all thumbnails from memory.
+
+        """
+        self._items.clear()
@@ -0,0 +1,713 @@
+"""
+Created on Oct 18, 2026
+
+@author: SWAN authors and contributors
+
+In this module you can find the :class:`TiledPlotContent` which shows
+the overview grid in one :class:`PyQt5.QtWidgets.QGraphicsScene`.
+
+It has the same interface as :class:`swan.widgets.plot_grid.MyPlotContent`
+but does not use any widgets for the cells. The mean waveforms of all
+cells are kept in one packed array and the visible cells are drawn as
+tiles from their cached thumbnails by a single :class:`TileItem`.
+Changing the y range only repaints the tiles and zooming only changes
+the transformation of the view.
+"""
+import numpy as np
+from pyqtgraph.Qt import QtCore, QtGui, QtWidgets
+from pyqtgraph import mkColor
+from swan.widgets.plot_cell import PlotCellGrid
+from swan.widgets.plot_widget import density_image
+
+
+class TileHeader(object):
+    """
+    The state of a row or column indicator of the tiled grid.
+
+    It has the same attributes as :class:`swan.widgets.indicator_cell.IndicatorWidget`
+    that are used by :meth:`swan.widgets.plot_cell.PlotCellGrid.indicator_toggled`.
+
+    **Arguments**
+
+        *text* (string):
+            The text of the indicator.
+        *indicator_type* (string):
+            The type of the indicator: 'pivot', 'unit' or 'session'.
+        *position* (integer or None):
+            The row of a unit indicator or the column of a session indicator.
+
+    """
+
+    def __init__(self, text, indicator_type, position):
+        self.text = text
+        self.indicator_type = indicator_type
+        self.row = position if indicator_type == 'unit' else -1
+        self.col = position if indicator_type == 'session' else -1
+        self.pos = (self.col, self.row)
+        self.selected = True
+        self.responsive = indicator_type != 'pivot'
+        self.colour = None
+
+
+class CellTile(object):
+    """
+    Connects a :class:`swan.widgets.plot_cell.PlotCell` to the tiled grid.
+
+    It is set as the *widget* of the cell, so the changes of the cell
+    are copied into the packed curve array and its tile is repainted.
+
+    **Arguments**
+
+        *content* (:class:`TiledPlotContent`):
+            The grid that shows the cell.
+        *cell* (:class:`swan.widgets.plot_cell.PlotCell`):
+            The cell.
+
+    """
+
+    def __init__(self, content, cell):
+        self.content = content
+        self.cell = cell
+
+    def redraw(self):
+        self.content.store_curve(self.cell)
+
+    def change_background(self, change):
+        self.content.update_cell(self.cell)
+
+    def set_tooltip(self, tooltip):
+        pass
+
+
+class TileItem(QtWidgets.QGraphicsItem):
+    """
+    The graphics item that draws all cells and indicators of the tiled grid.
+
+    Only the part of the grid exposed in the view is drawn.
+
+    **Arguments**
+
+        *content* (:class:`TiledPlotContent`):
+            The grid to draw.
+
+    """
+
+    def __init__(self, content):
+        QtWidgets.QGraphicsItem.__init__(self)
+        self.content = content
+        self.setFlag(QtWidgets.QGraphicsItem.ItemUsesExtendedStyleOption, True)
+
+    def boundingRect(self):
+        return QtCore.QRectF(0, 0, *self.content.grid_size())
+
+    def paint(self, painter, option, widget=None):
+        self.content.paint_tiles(painter, option.exposedRect)
+
+
+class TiledPlotContent(QtWidgets.QGraphicsView, PlotCellGrid):
+    """
+    A class that shows the overview grid as tiles in one graphics scene.
+
+    It is an alternative to :class:`swan.widgets.plot_grid.MyPlotContent`
+    for large channels, because its cost does not depend on the number of cells.
+    The view scrolls itself, so it is not put into a scroll area.
+
+    The *args* and *kwargs* are passed to :class:`PyQt5.QtWidgets.QGraphicsView`.
+
+    """
+
+    plot_selected = QtCore.pyqtSignal(object, bool)
+    indicator_toggle = QtCore.pyqtSignal()
+    visibility_toggle = QtCore.pyqtSignal(int, int, bool)
+
+    def __init__(self, *args, **kwargs):
+        """
+        **Properties**
+
+            *_curves* (numpy array of shape (cells, samples) or None):
+                The mean waveforms of all cells, one row per cell in
+                the order of *_plots*.
+            *_colours* (numpy array of shape (cells, 3)):
+                The pen colours of all cells.
+            *_has_curve* (numpy array of boolean):
+                Whether a cell has a mean waveform.
+            *_density_images* (dictionary):
+                Maps the index of a cell to the image of its waveform density.
+            *_headers* (list of :class:`TileHeader`):
+                The pivot, unit and session indicators.
+            *_scale* (float):
+                The zoom factor of the view.
+            *_focus* (tuple of integer or None):
+                The (row, col) of the cell under the mouse.
+
+        The cells and their selection are described in
+        :meth:`swan.widgets.plot_cell.PlotCellGrid.init_cells`.
+
+        """
+        QtWidgets.QGraphicsView.__init__(self, *args, **kwargs)
+        self.init_cells()
+
+        self._curves = None
+        self._colours = np.zeros((0, 3), dtype=np.uint8)
+        self._has_curve = np.zeros(0, dtype=bool)
+        self._density_images = {}
+        self._headers = []
+        self._unit_headers = []
+        self._session_headers = []
+        self._scale = 1.0
+        self._focus = None
+
+        self.backgrounds = {"normal": mkColor('k'),
+                            "selected": mkColor(0.2),
+                            "disabled": mkColor(0.25),
+                            "in_focus": mkColor(0.1)}
+        self.header_backgrounds = {"deselected": mkColor(0.25), "selected": mkColor('k'), "inFocus": mkColor(0.1)}
+
+        self._scene = QtWidgets.QGraphicsScene(self)
+        self._item = TileItem(self)
+        self._scene.addItem(self._item)
+        self.setScene(self._scene)
+
+        self.setAlignment(QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop)
+        self.setTransformationAnchor(QtWidgets.QGraphicsView.NoAnchor)
+        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
+        self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOn)
+        self.setViewportUpdateMode(QtWidgets.QGraphicsView.MinimalViewportUpdate)
+        self.setMouseTracking(True)
+        self.setBackgroundBrush(self.palette().color(QtGui.QPalette.Window))
+
+    def thumbnail_size(self):
+        """
+        Returns the size of the thumbnails of the cells on the screen.
+
+            **Returns**: tuple of integer
+                The width and the height in pixels.
+
+        """
+        return int(round(self._width * self._scale)), int(round(self._height * self._scale))
+
+    def update_visible(self):
+        # all cells are drawn by the scene, there are no widgets to bind
+        pass
+
+    def grid_size(self):
+        """
+        Returns the size of the grid including the indicators.
+
+            **Returns**: tuple of integer
+                The width and the height in scene coordinates.
+
+        """
+        return self.cell_origin(*self._shape)
+
+    def make_plots(self, rows, cols, dates=None):
+        """
+        Creates a plot grid of the given shape.
+
+        **Arguments**
+
+            *rows* (integer):
+                The number of rows of the grid.
+            *cols* (integer):
+                The number of columns of the grid.
+            *dates* (list of :class:`datetime.datetime` or None):
+                The dates of the sessions.
+
+        """
+        self.delete_plots()
+        self._item.prepareGeometryChange()
+        self.make_cells(rows, cols, dates)
+        for cell in self._plots:
+            cell.widget = CellTile(self, cell)
+
+        self._curves = None
+        self._colours = np.zeros((rows * cols, 3), dtype=np.uint8)
+        self._has_curve = np.zeros(rows * cols, dtype=bool)
+        self._density_images = {}
+
+        self._unit_headers = [TileHeader(str(unit_id + 1), 'unit', unit_id) for unit_id in range(rows)]
+        if dates is not None:
+            texts = [str(session_id + 1) + " (" + str(dates[session_id].strftime("%d.%m.%y")) + ")"
+                     for session_id in range(cols)]
+        else:
+            texts = [str(session_id) for session_id in range(cols)]
+        self._session_headers = [TileHeader(text, 'session', session_id) for session_id, text in enumerate(texts)]
+        self._headers = ([TileHeader("Sessions (dd.mm.yy)\n→\n\n↓ Units", 'pivot', None)] +
+                         self._unit_headers + self._session_headers)
+
+        self._scene.setSceneRect(self._item.boundingRect())
+        self._item.update()
+        return self._plots
+
+    def set_indicators_responsive(self, responsive):
+        """
+        Lets the row and column headers react to clicks and hovering or not.
+
+        **Arguments**
+
+            *responsive* (boolean):
+                Whether the headers can be toggled.
+
+        """
+        for header in self._unit_headers + self._session_headers:
+            header.responsive = responsive
+        self._item.update()
+
+    def cell_index(self, cell):
+        """
+        Returns the row of a cell in the packed curve array.
+
+        **Arguments**
+
+            *cell* (:class:`swan.widgets.plot_cell.PlotCell`):
+                The cell.
+
+            **Returns**: integer
+                The index of the cell.
+
+        """
+        session_id, unit_id = cell.pos
+        return unit_id * self._shape[1] + session_id
+
+    def cell_rect(self, row, col):
+        """
+        Returns the rectangle of a cell in scene coordinates.
+
+        **Arguments**
+
+            *row* (integer):
+                The row index.
+            *col* (integer):
+                The column index.
+
+            **Returns**: :class:`PyQt5.QtCore.QRectF`
+                The rectangle of the cell.
+
+        """
+        x, y = self.cell_origin(row, col)
+        return QtCore.QRectF(x, y, self._width, self._height)
+
+    def focus_rect(self, focus):
+        """
+        Returns the rectangle of a cell or indicator that can have the focus.
+
+        **Arguments**
+
+            *focus* (tuple of integer or None):
+                The row and the column of a cell, or of an indicator
+                with -1 as the column of a unit or the row of a session.
+
+            **Returns**: :class:`PyQt5.QtCore.QRectF` or None
+                The rectangle in scene coordinates or None if *focus* is None.
+
+        """
+        if focus is None:
+            return None
+        row, col = focus
+        if col < 0:
+            return QtCore.QRectF(0, self.cell_origin(row, 0)[1], self._constant_dimension, self._height)
+        if row < 0:
+            return QtCore.QRectF(self.cell_origin(0, col)[0], 0, self._width, self._constant_dimension)
+        return self.cell_rect(row, col)
+
+    def update_cell(self, cell):
+        """
+        Repaints the tile of a cell.
+
+        **Arguments**
+
+            *cell* (:class:`swan.widgets.plot_cell.PlotCell`):
+                The cell.
+
+        """
+        self._item.update(self.cell_rect(cell.pos[1], cell.pos[0]))
+
+    def store_curve(self, cell):
+        """
+        Copies the mean waveform of a cell into the packed curve array
+        and repaints its tile.
+
+        **Arguments**
+
+            *cell* (:class:`swan.widgets.plot_cell.PlotCell`):
+                The cell.
+
+        """
+        i = self.cell_index(cell)
+        self._density_images.pop(i, None)
+        if cell.data is not None:
+            data = np.asarray(cell.data, dtype=np.float64).ravel()
+            if self._curves is None or self._curves.shape[1] != len(data):
+                self._curves = np.full((len(self._plots), len(data)), np.nan)
+                self._has_curve[:] = False
+            self._curves[i] = data
+            self._colours[i] = tuple(cell.default_pen_colour)[:3]
+            self._has_curve[i] = True
+        else:
+            self._has_curve[i] = False
+        self.update_cell(cell)
+
+    def density_tile(self, cell):
+        """
+        Returns the image of the waveform density of a cell.
+
+        **Arguments**
+
+            *cell* (:class:`swan.widgets.plot_cell.PlotCell`):
+                The cell.
+
+            **Returns**: :class:`PyQt5.QtGui.QImage`
+                The image with the highest amplitude in the top row.
+
+        """
+        i = self.cell_index(cell)
+        image = self._density_images.get(i)
+        if image is None:
+            rgba = np.ascontiguousarray(density_image(cell.density[0]).transpose(1, 0, 2)[::-1])
+            image = QtGui.QImage(rgba.data, rgba.shape[1], rgba.shape[0], rgba.strides[0],
+                                 QtGui.QImage.Format_RGBA8888).copy()
+            self._density_images[i] = image
+        return image
+
+    def paint_density(self, painter, cell):
+        """
+        Draws the waveform density of a cell into its tile.
+
+        **Arguments**
+
+            *painter* (:class:`PyQt5.QtGui.QPainter`):
+                The painter of the scene.
+            *cell* (:class:`swan.widgets.plot_cell.PlotCell`):
+                The cell.
+
+        """
+        counts, (low, high) = cell.density
+        samples = counts.shape[0]
+        xmin, xmax = self._xrange if self._xrange is not None else (0., samples - 1.)
+        ymin, ymax = self._yrange
+        if not np.isfinite(low) or not np.isfinite(high) or high <= low or xmax == xmin or ymax == ymin:
+            return
+        rect = self.cell_rect(cell.pos[1], cell.pos[0])
+        target = QtCore.QRectF(rect.x() + (-0.5 - xmin) / (xmax - xmin) * rect.width(),
+                               rect.y() + (ymax - high) / (ymax - ymin) * rect.height(),
+                               samples / (xmax - xmin) * rect.width(),
+                               (high - low) / (ymax - ymin) * rect.height())
+        painter.save()
+        painter.setClipRect(rect)
+        painter.drawImage(target, self.density_tile(cell))
+        painter.restore()
+
+    def visible_range(self, rect):
+        """
+        Returns the rows and columns of the cells inside a rectangle.
+
+        **Arguments**
+
+            *rect* (:class:`PyQt5.QtCore.QRectF`):
+                The rectangle in scene coordinates.
+
+            **Returns**: tuple of range
+                The rows and columns.
+
+        """
+        rows, cols = self._shape
+        if rect.isEmpty() or rows == 0 or cols == 0:
+            return range(0), range(0)
+        offset = self._constant_dimension + self._spacing
+        row_step = self._height + self._spacing
+        col_step = self._width + self._spacing
+        first_row = max(int((rect.top() - offset) // row_step), 0)
+        last_row = min(int((rect.bottom() - offset) // row_step), rows - 1)
+        first_col = max(int((rect.left() - offset) // col_step), 0)
+        last_col = min(int((rect.right() - offset) // col_step), cols - 1)
+        return range(first_row, last_row + 1), range(first_col, last_col + 1)
+
+    def item_at(self, point):
+        """
+        Finds the cell or indicator at a point of the scene.
+
+        **Arguments**
+
+            *point* (:class:`PyQt5.QtCore.QPointF`):
+                The point in scene coordinates.
+
+            **Returns**: :class:`swan.widgets.plot_cell.PlotCell`, :class:`TileHeader` or None
+                The cell or indicator at the point or None if the point
+                is between the cells or outside of the grid.
+
+        """
+        rows, cols = self._shape
+        x, y = point.x(), point.y()
+        offset = self._constant_dimension + self._spacing
+        if x < 0 or y < 0 or not self._headers:
+            return None
+        row = int((y - offset) // (self._height + self._spacing)) if y >= offset else -1
+        col = int((x - offset) // (self._width + self._spacing)) if x >= offset else -1
+        if row >= rows or col >= cols:
+            return None
+        if row >= 0 and y - offset - row * (self._height + self._spacing) >= self._height:
+            return None
+        if col >= 0 and x - offset - col * (self._width + self._spacing) >= self._width:
+            return None
+        if row < 0 and col < 0:
+            return self._headers[0] if x < self._constant_dimension and y < self._constant_dimension else None
+        if col < 0:
+            return self._unit_headers[row] if x < self._constant_dimension else None
+        if row < 0:
+            return self._session_headers[col] if y < self._constant_dimension else None
+        return self._rows[row][col]
+
+    def paint_tiles(self, painter, rect):
+        """
+        Draws the cells and the indicators inside a rectangle.
+
+        The mean waveforms of the visible cells are drawn from their
+        thumbnails, which are rendered from the packed curve array
+        when they are not cached yet, over their waveform densities.
+
+        **Arguments**
+
+            *painter* (:class:`PyQt5.QtGui.QPainter`):
+                The painter of the scene.
+            *rect* (:class:`PyQt5.QtCore.QRectF`):
+                The exposed rectangle in scene coordinates.
+
+        """
+        rows, cols = self.visible_range(rect)
+        self.paint_headers(painter, rect, rows, cols)
+        if not len(rows) or not len(cols):
+            return
+
+        backgrounds = {}
+        visible = []
+        for row in rows:
+            for col in cols:
+                cell = self._rows[row][col]
+                if cell.disabled:
+                    state = "disabled"
+                elif self._focus == (row, col):
+                    state = "in_focus"
+                elif cell.selected:
+                    state = "selected"
+                else:
+                    state = "normal"
+                backgrounds.setdefault(state, []).append(self.cell_rect(row, col))
+                if cell.source is not None or self._has_curve[row * self._shape[1] + col]:
+                    visible.append(cell)
+        painter.setPen(QtCore.Qt.NoPen)
+        for state, rects in backgrounds.items():
+            painter.setBrush(self.backgrounds[state])
+            painter.drawRects(rects)
+
+        # the thumbnails only contain the curves, they are drawn with the pen colour
+        for cell in visible:
+            if cell.density is not None and not cell.disabled:
+                self.paint_density(painter, cell)
+            i = self.cell_index(cell)
+            bitmap = self.get_thumbnail(cell, self._curves[i] if self._has_curve[i] else None)
+            if bitmap is None:
+                continue
+            painter.setPen(mkColor('k') if cell.disabled else mkColor(cell.default_pen_colour))
+            painter.drawPixmap(self.cell_rect(cell.pos[1], cell.pos[0]), bitmap, QtCore.QRectF(bitmap.rect()))
+
+    def paint_headers(self, painter, rect, rows, cols):
+        """
+        Draws the indicators inside a rectangle.
+
+        **Arguments**
+
+            *painter* (:class:`PyQt5.QtGui.QPainter`):
+                The painter of the scene.
+            *rect* (:class:`PyQt5.QtCore.QRectF`):
+                The exposed rectangle in scene coordinates.
+            *rows* (range):
+                The visible rows.
+            *cols* (range):
+                The visible columns.
+
+        """
+        if not self._headers:
+            return
+        const = self._constant_dimension
+        tiles = [(self._headers[0], QtCore.QRectF(0, 0, const, const))]
+        if rect.left() < const:
+            tiles += [(self._unit_headers[row], QtCore.QRectF(0, self.cell_origin(row, 0)[1], const, self._height))
+                      for row in rows]
+        if rect.top() < const:
+            tiles += [(self._session_headers[col], QtCore.QRectF(self.cell_origin(0, col)[0], 0, self._width, const))
+                      for col in cols]
+
+        text_colour = self.palette().color(QtGui.QPalette.WindowText)
+        font = QtGui.QFont(self.font())
+        for header, tile in tiles:
+            if not tile.intersects(rect):
+                continue
+            if header.responsive and self._focus == (header.row, header.col):
+                background = self.header_backgrounds["inFocus"]
+            elif header.selected:
+                background = self.header_backgrounds["selected"]
+            else:
+                background = self.header_backgrounds["deselected"]
+            painter.fillRect(tile, background)
+            if header.colour is not None:
+                strip = QtCore.QRectF(tile.right() - const / 10., tile.top(), const / 10., tile.height())
+                painter.fillRect(strip, mkColor(header.colour))
+
+            size = min(tile.width(), tile.height())
+            if header.indicator_type == 'pivot':
+                font.setPointSize(max(int(0.13 * size), 1))
+                font.setBold(True)
+            elif header.indicator_type == 'unit':
+                font.setPointSize(max(int(0.19 * size), 1))
+                font.setBold(False)
+            else:
+                font.setPointSize(max(int(0.18 * size), 1))
+                font.setBold(False)
+            painter.setFont(font)
+            painter.setPen(text_colour)
+            painter.drawText(tile, QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop | QtCore.Qt.TextWordWrap, header.text)
+
+    def update_colour_strips(self):
+        """
+        Shows the colour of the unit next to every row that has a plot.
+
+        """
+        for header in self._unit_headers:
+            header.colour = self.row_colour(header.row)
+        self._item.update(QtCore.QRectF(0, 0, self._constant_dimension, self.grid_size()[1]))
+
+    def delete_plots(self):
+        """
+        Deletes all plots.
+
+        """
+        for cell in self._plots:
+            cell.widget = None
+        self._focus = None
+        self._headers = []
+        self._unit_headers = []
+        self._session_headers = []
+
+    def clear_plots(self):
+        """
+        Clears all plots.
+
+        """
+        self.clear_cells()
+        for header in self._headers:
+            header.colour = None
+            if header.responsive:
+                header.selected = True
+        self._item.update()
+
+    def change_size(self, step):
+        """
+        Zooms the view by the given step.
+
+        **Arguments**
+
+            *step* (float):
+                The change step percentage for the width.
+
+        """
+        scale = self._scale + self._scale * (step / 100.0)
+        if int(self._width * scale) > 0 and int(self._height * scale) > 0:
+            self._scale = scale
+            self.setTransform(QtGui.QTransform.fromScale(scale, scale))
+
+    def set_yranges(self, min0, max0):
+        """
+        Sets the y ranges of all plots.
+
+        **Arguments**
+
+            *min0* (float):
+                The minimal y.
+            *max0* (float):
+                The maximal y.
+
+        """
+        self._yrange = (min0, max0)
+        self._item.update()
+
+    def set_xranges(self, min0, max0):
+        """
+        Sets the x ranges of all plots.
+
+        **Arguments**
+
+            *min0* (float):
+                The minimal x.
+            *max0* (float):
+                The maximal x.
+
+        """
+        self._xrange = (min0, max0)
+        self._item.update()
+
+    def set_focus(self, item):
+        """
+        Shows which cell or indicator is under the mouse.
+
+        **Arguments**
+
+            *item* (:class:`swan.widgets.plot_cell.PlotCell`, :class:`TileHeader` or None):
+                The cell or indicator under the mouse.
+
+        """
+        if isinstance(item, TileHeader):
+            focus = (item.row, item.col) if item.responsive else None
+        elif item is not None and not item.disabled:
+            focus = (item.pos[1], item.pos[0])
+        else:
+            focus = None
+        if focus != self._focus:
+            # only the tiles that lose and get the focus change
+            for rect in (self.focus_rect(self._focus), self.focus_rect(focus)):
+                if rect is not None:
+                    self._item.update(rect)
+            self._focus = focus
+
+    def mousePressEvent(self, event):
+        """
+        This method is called you click on the grid.
+
+        A click with the left mouse button selects or deselects a cell
+        or toggles an indicator.
+
+        **Arguments**
+
+            *event* (:class:`PyQt5.QtGui.QMouseEvent`)
+
+        """
+        if event.button() != QtCore.Qt.LeftButton:
+            event.ignore()
+            return
+        item = self.item_at(self.mapToScene(event.pos()))
+        if isinstance(item, TileHeader):
+            if item.responsive:
+                self.indicator_toggled(item)
+                item.selected = not item.selected
+                self._item.update()
+        elif item is not None and not item.disabled:
+            self.select_plot(item, not item.selected)
+        event.accept()
+
+    def mouseMoveEvent(self, event):
+        self.set_focus(self.item_at(self.mapToScene(event.pos())))
+        event.accept()
+
+    def leaveEvent(self, event):
+        self.set_focus(None)
+        QtWidgets.QGraphicsView.leaveEvent(self, event)
+
+    def viewportEvent(self, event):
+        if event.type() == QtCore.QEvent.ToolTip:
+            item = self.item_at(self.mapToScene(event.pos()))
+            if item is not None and not isinstance(item, TileHeader) and item.tooltip:
+                QtWidgets.QToolTip.showText(event.globalPos(), item.tooltip, self)
+            else:
+                QtWidgets.QToolTip.hideText()
+                event.ignore()
+            return True
+        return QtWidgets.QGraphicsView.viewportEvent(self, event)
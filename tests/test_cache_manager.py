@@ -0,0 +1,188 @@
+"""
+Created on Oct 18, 2026
+
+@author: SWAN authors and contributors
+
+Unit test module for the :class:`swan.cache_manager.CacheManager` class.
+"""
+import sys
+import tempfile
+import time
+from multiprocessing import get_context
+from os import makedirs, utime
+from os.path import pardir, join, realpath, abspath, exists
+from shutil import rmtree
+import unittest
+
+p = abspath(join(realpath(__file__), pardir, pardir))
+sys.path.insert(1, p)
+
+from swan.cache_manager import CacheManager, ORPHAN_AGE, THUMBNAIL_DIR
+
+
+def register_sessions(job):
+    # registers the entries of several sessions one by one, like an ingest
+    cache_dir, files = job
+    cache = CacheManager(cache_dir)
+    for filename in files:
+        cache.register({filename: [1]})
+
+
+class Test(unittest.TestCase):
+    """
+    Test class for testing :class:`swan.cache_manager.CacheManager`.
+
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache_dir = join(self.tmp, "cache")
+        makedirs(self.cache_dir)
+        self.files = []
+        for i in range(3):
+            filename = join(self.tmp, "session%d.nev" % i)
+            with open(filename, "wb") as fn:
+                fn.write(b"x" * (i + 1))
+            self.files.append(filename)
+        self.cache = CacheManager(self.cache_dir)
+
+    def tearDown(self):
+        rmtree(self.tmp, ignore_errors=True)
+
+    def make_entry(self, filename, channel, size=1000):
+        # an entry of the given size, as it would be written by ColumnarIO
+        name = join(self.cache_dir, self.cache.source_key(filename) + "_" + str(channel) + ".col")
+        makedirs(name)
+        with open(join(name, "data.npy"), "wb") as fn:
+            fn.write(b"0" * size)
+        return name
+
+    def register_all(self):
+        entries = []
+        for filename in self.files:
+            entries.append(self.make_entry(filename, 1))
+            self.cache.register({filename: [1]})
+            # the entries are evicted in the order of their last access
+            time.sleep(0.01)
+        return entries
+
+    def test01_SourceKey(self):
+        key = self.cache.source_key(self.files[0])
+        # the key is stable and differs between files
+        self.assertEqual(key, self.cache.source_key(self.files[0]))
+        self.assertNotEqual(key, self.cache.source_key(self.files[1]))
+        # a changed file gets a new key
+        with open(self.files[0], "ab") as fn:
+            fn.write(b"y")
+        self.assertNotEqual(key, self.cache.source_key(self.files[0]))
+
+    def test02_Usage(self):
+        self.register_all()
+        self.assertEqual(self.cache.usage(), 3000)
+        manifest = self.cache.read_manifest()
+        self.assertEqual(len(manifest["entries"]), 3)
+        self.assertEqual(len(manifest["sources"]), 3)
+
+    def test03_EvictLeastRecentlyUsed(self):
+        entries = self.register_all()
+        # accessing the first entry makes the second one the oldest
+        self.cache.register({self.files[0]: [1]})
+        self.cache.set_budget(2000)
+        self.assertTrue(exists(entries[0]))
+        self.assertFalse(exists(entries[1]))
+        self.assertTrue(exists(entries[2]))
+        self.assertEqual(self.cache.usage(), 2000)
+
+    def test04_RegisterProtectsUsedEntries(self):
+        entries = self.register_all()
+        self.cache.budget = 1000
+        self.cache.register({self.files[0]: [1]})
+        self.assertTrue(exists(entries[0]))
+        self.assertFalse(exists(entries[1]))
+        self.assertFalse(exists(entries[2]))
+
+    def test05_StaleEntriesAreRemoved(self):
+        entries = self.register_all()
+        with open(self.files[1], "ab") as fn:
+            fn.write(b"changed")
+        self.cache.source_key(self.files[1])
+        self.cache.register({self.files[1]: []})
+        self.assertFalse(exists(entries[1]))
+        self.assertEqual(self.cache.usage(), 2000)
+
+    def test06_EvictWhileLoaded(self):
+        entries = self.register_all()
+        # the first session is displayed, so its waveforms are read from its entry
+        self.cache.pin("loaded", {self.files[0]: [1]})
+        # a newer entry, e.g. written by an ingest, pushes the cache over its budget
+        self.cache.budget = 2000
+        entries.append(self.make_entry(self.files[0], 2))
+        self.cache.register({self.files[0]: [2]})
+        self.assertTrue(exists(entries[0]))
+        self.assertTrue(exists(entries[3]))
+        # lowering the budget in the preferences
+        self.cache.set_budget(500)
+        self.assertTrue(exists(entries[0]))
+        self.assertFalse(exists(entries[1]))
+        self.assertFalse(exists(entries[2]))
+        self.assertEqual(self.cache.pinned(), {self.cache.source_key(self.files[0]) + "_1"})
+        # as soon as the channel is not loaded anymore, the entry can be evicted
+        self.cache.unpin("loaded")
+        self.cache.set_budget(500)
+        self.assertFalse(exists(entries[0]))
+
+    def test07_PinsOfSeveralOwners(self):
+        entries = self.register_all()
+        self.cache.pin("loaded", {self.files[0]: [1]})
+        self.cache.pin("loading", {self.files[1]: [1]})
+        self.cache.set_budget(1)
+        self.assertTrue(exists(entries[0]))
+        self.assertTrue(exists(entries[1]))
+        self.assertFalse(exists(entries[2]))
+        # pinning again replaces the entries of the owner
+        self.cache.pin("loading", {self.files[2]: [1]})
+        self.cache.set_budget(1)
+        self.assertTrue(exists(entries[0]))
+        self.assertFalse(exists(entries[1]))
+
+    def test08_ConcurrentProcesses(self):
+        files = []
+        for i in range(40):
+            filename = join(self.tmp, "other%d.nev" % i)
+            with open(filename, "wb") as fn:
+                fn.write(b"x")
+            files.append(filename)
+        # no process overwrites the entries registered by the others
+        with get_context("spawn").Pool(4) as pool:
+            pool.map(register_sessions, [(self.cache_dir, files[i::4]) for i in range(4)])
+        manifest = self.cache.read_manifest()
+        self.assertEqual(len(manifest["sources"]), 40)
+        self.assertEqual(len(manifest["entries"]), 40)
+
+    def test09_OrphansAreSwept(self):
+        # entries written by cancelled loads and an interrupted write
+        old = [self.make_entry(self.files[0], 1), self.make_entry(self.files[1], 1), join(self.cache_dir, ".tmp_x")]
+        makedirs(old[2])
+        young = self.make_entry(self.files[2], 1)
+        for name in old:
+            utime(name, (time.time() - ORPHAN_AGE - 10,) * 2)
+        self.cache.pin("loading", {self.files[1]: [1]})
+        self.cache.register({self.files[2]: [2]})
+        self.assertFalse(exists(old[0]))
+        self.assertTrue(exists(old[1]))
+        self.assertFalse(exists(old[2]))
+        # it may still be registered by a running load
+        self.assertTrue(exists(young))
+
+    def test10_ThumbnailsAreNotCounted(self):
+        self.register_all()
+        makedirs(join(self.cache_dir, THUMBNAIL_DIR))
+        with open(join(self.cache_dir, THUMBNAIL_DIR, "thumbnail.png"), "wb") as fn:
+            fn.write(b"0" * 5000)
+        self.assertEqual(self.cache.usage(), 3000)
+        self.cache.set_budget(3000)
+        self.assertEqual(len(self.cache.read_manifest()["entries"]), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
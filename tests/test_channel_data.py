@@ -0,0 +1,102 @@
+"""
+Created on Oct 18, 2026
+
+@author: SWAN authors and contributors
+
+Unit test module for the :class:`swan.channel_data.ChannelData` class.
+"""
+import sys
+from os.path import pardir, join, realpath, abspath
+import unittest
+
+import numpy as np
+import quantities as pq
+from neo.core import Block, ChannelIndex, Unit, SpikeTrain
+
+p = abspath(join(realpath(__file__), pardir, pardir))
+sys.path.insert(1, p)
+
+from swan.channel_data import ChannelData, is_real_unit
+
+
+def make_block(descriptions, seed=0):
+    # a block of one channel with a unit for every description
+    rng = np.random.default_rng(seed)
+    block = Block()
+    channel_index = ChannelIndex(index=np.array([0]))
+    block.channel_indexes.append(channel_index)
+    for description in descriptions:
+        unit = Unit(description=description)
+        n = int(rng.integers(1, 50))
+        unit.spiketrains.append(SpikeTrain(np.sort(rng.uniform(0, 10, n)) * pq.s, t_stop=10 * pq.s))
+        channel_index.units.append(unit)
+    return block
+
+
+class Test(unittest.TestCase):
+    """
+    Test class for testing :class:`swan.channel_data.ChannelData`.
+
+    """
+
+    def setUp(self):
+        self.blocks = [make_block(["unclassified", "SUA", "noise", "MUA"], 0),
+                       make_block(["SUA", "SUA"], 1),
+                       Block()]
+        self.data = ChannelData(self.blocks)
+
+    def units(self, session):
+        return self.blocks[session].channel_indexes[0].units
+
+    def test01_IsRealUnit(self):
+        self.assertTrue(is_real_unit(Unit(description="SUA")))
+        self.assertTrue(is_real_unit(Unit()))
+        self.assertFalse(is_real_unit(Unit(description="noise")))
+        self.assertFalse(is_real_unit(Unit(description="unclassified")))
+
+    def test02_Records(self):
+        self.assertEqual(len(self.data.records), 6)
+        self.assertEqual([len(session) for session in self.data.sessions], [4, 2, 0])
+        self.assertEqual(self.data.total_units_per_block, [2, 2, 0])
+        self.assertEqual(self.data.units[0], [self.units(0)[1], self.units(0)[3]])
+        np.testing.assert_array_equal(self.data.session_ids, [0, 0, 0, 0, 1, 1])
+        np.testing.assert_array_equal(self.data.unit_ids, [0, 1, 2, 3, 0, 1])
+        np.testing.assert_array_equal(self.data.real, [False, True, False, True, True, True])
+
+    def test03_SpikeTimes(self):
+        self.assertEqual(self.data.offsets[-1], len(self.data.spike_times))
+        for session in range(2):
+            for unit in self.units(session):
+                record = self.data.get_record(unit)
+                self.assertIs(record.unit, unit)
+                self.assertEqual(record.n_spikes, len(unit.spiketrains[0]))
+                np.testing.assert_array_equal(self.data.get_spike_times(record), unit.spiketrains[0].magnitude)
+        # units of other channels have no record
+        self.assertIsNone(self.data.get_record(Unit()))
+
+    def test04_RealUnits(self):
+        # the unclassified unit of the first session is not counted
+        self.assertIs(self.data.get_realunit(0, 1), self.units(0)[1])
+        self.assertIs(self.data.get_realunit(0, 3), self.units(0)[3])
+        self.assertIs(self.data.get_realunit(1, 1), self.units(1)[0])
+        self.assertIs(self.data.get_realunit(1, 2), self.units(1)[1])
+        self.assertTrue(self.data.is_real(0, 1))
+        self.assertFalse(self.data.is_real(0, 2))
+        self.assertRaises(IndexError, self.data.is_real, 2, 0)
+
+    def test05_NoDescriptions(self):
+        # units without a description are real units
+        data = ChannelData([make_block([None, "noise", None], 2)])
+        np.testing.assert_array_equal(data.real, [True, False, True])
+        self.assertIs(data.get_realunit(0, 1), data.sessions[0][0].unit)
+        self.assertIs(data.get_realunit(0, 3), data.sessions[0][2].unit)
+
+    def test06_NoBlocks(self):
+        data = ChannelData([])
+        self.assertEqual(data.records, [])
+        self.assertEqual(len(data.spike_times), 0)
+        np.testing.assert_array_equal(data.offsets, [0])
+
+
+if __name__ == "__main__":
+    unittest.main()
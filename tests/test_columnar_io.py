@@ -0,0 +1,154 @@
+"""
+Created on Oct 18, 2026
+
+@author: SWAN authors and contributors
+
+Unit test module for the :class:`swan.columnar_io.ColumnarIO` class.
+"""
+import sys
+import json
+import tempfile
+from datetime import datetime
+from os.path import pardir, join, realpath, abspath, getsize
+from shutil import rmtree
+import unittest
+from unittest import mock
+
+import numpy as np
+import quantities as pq
+from neo.core import Block, Segment, ChannelIndex, Unit, SpikeTrain, Event
+
+p = abspath(join(realpath(__file__), pardir, pardir))
+sys.path.insert(1, p)
+
+from swan.columnar_io import ColumnarIO, LazyWaveforms
+
+
+def make_block(n_units=3, seed=0):
+    # a block of one channel like the ones read by the BlackrockIO
+    rng = np.random.default_rng(seed)
+    block = Block(name="block", rec_datetime=datetime(2020, 1, 2, 3, 4, 5))
+    segment = Segment(name="segment")
+    block.segments.append(segment)
+    segment.events.append(Event(times=np.sort(rng.uniform(0, 10000, 50)) * pq.ms,
+                                labels=rng.choice(["a", "bb", "c"], 50), name="events"))
+    channel_index = ChannelIndex(index=np.array([0]), channel_ids=np.array([5]), name="ch5")
+    block.channel_indexes.append(channel_index)
+    for u in range(n_units):
+        unit = Unit(name="unit %d" % u, description="noise" if u == 0 else "SUA")
+        n = int(rng.integers(10, 200))
+        train = SpikeTrain(np.sort(rng.uniform(0, 10, n)) * pq.s, t_stop=10 * pq.s,
+                           waveforms=rng.normal(size=(n, 1, 48)) * pq.uV,
+                           sampling_rate=30 * pq.kHz, left_sweep=0.3 * pq.ms)
+        train.segment = segment
+        train.unit = unit
+        segment.spiketrains.append(train)
+        unit.spiketrains.append(train)
+        channel_index.units.append(unit)
+    return block
+
+
+class Test(unittest.TestCase):
+    """
+    Test class for testing :class:`swan.columnar_io.ColumnarIO`.
+
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.block = make_block()
+        self.cIO = ColumnarIO(join(self.tmp, "session_1.col"))
+
+    def tearDown(self):
+        rmtree(self.tmp, ignore_errors=True)
+
+    def trains(self, block):
+        return [unit.spiketrains[0] for unit in block.channel_indexes[0].units]
+
+    def test01_RoundTrip(self):
+        self.assertFalse(self.cIO.exists())
+        self.cIO.write_block(self.block)
+        self.assertTrue(self.cIO.exists())
+        block = self.cIO.read_block(mmap=False)
+
+        self.assertEqual(block.name, self.block.name)
+        self.assertEqual(block.rec_datetime, self.block.rec_datetime)
+        event, expected = block.segments[0].events[0], self.block.segments[0].events[0]
+        np.testing.assert_array_equal(event.times.rescale(pq.ms).magnitude, expected.times.magnitude)
+        np.testing.assert_array_equal(event.labels, expected.labels)
+
+        units = block.channel_indexes[0].units
+        self.assertEqual([unit.description for unit in units],
+                         [unit.description for unit in self.block.channel_indexes[0].units])
+        np.testing.assert_array_equal(block.channel_indexes[0].channel_ids, [5])
+        for train, expected in zip(self.trains(block), self.trains(self.block)):
+            np.testing.assert_array_equal(train.magnitude, expected.magnitude)
+            self.assertEqual(train.units, expected.units)
+            self.assertEqual(train.t_stop, expected.t_stop)
+            np.testing.assert_array_equal(train.waveforms.magnitude, expected.waveforms.magnitude)
+            self.assertIs(train.segment, block.segments[0])
+            np.testing.assert_allclose(train.summary.mean, expected.waveforms.magnitude.mean(axis=0))
+            self.assertIsNotNone(train.summary.density)
+
+    def test02_WaveformsAreMemoryMapped(self):
+        self.cIO.write_block(self.block)
+        block = self.cIO.read_block()
+        waveforms = self.trains(block)[0].waveforms
+        self.assertFalse(waveforms.flags.writeable)
+        without = self.cIO.read_block(load_waveforms=False)
+        self.assertIsNone(self.trains(without)[0].waveforms)
+
+    def test03_LazyWaveforms(self):
+        self.cIO.write_block(self.block)
+        block = self.cIO.read_block(lazy=True)
+        for train, expected in zip(self.trains(block), self.trains(self.block)):
+            self.assertIsNone(train.waveforms)
+            self.assertIsInstance(train.lazy_waveforms, LazyWaveforms)
+            self.assertEqual(train.lazy_waveforms.shape, expected.waveforms.shape)
+            np.testing.assert_array_equal(train.lazy_waveforms.load().magnitude, expected.waveforms.magnitude)
+
+    def test04_WaveformDtypes(self):
+        expected = np.concatenate([train.waveforms.magnitude for train in self.trains(self.block)])
+        self.cIO.write_block(self.block, "float32")
+        self.assertEqual(self.cIO.read_waveforms().dtype, np.float32)
+        np.testing.assert_allclose(self.cIO.read_waveforms(), expected, rtol=1e-6)
+
+        self.cIO.write_block(self.block, "int16")
+        self.assertEqual(self.cIO.read_waveforms(scaled=False).dtype, np.int16)
+        # the rounding error is at most half a step of the largest amplitude
+        step = np.abs(expected).max() / np.iinfo(np.int16).max
+        np.testing.assert_allclose(self.cIO.read_waveforms(), expected, rtol=0, atol=step)
+        lazy = self.trains(self.cIO.read_block(lazy=True))[1].lazy_waveforms.load(mmap=False)
+        np.testing.assert_allclose(lazy.magnitude, self.trains(self.block)[1].waveforms.magnitude, atol=step)
+
+    def test05_OtherVersionsDoNotExist(self):
+        self.cIO.write_block(self.block)
+        with open(join(self.cIO.dirname, ColumnarIO.MANIFEST)) as f:
+            manifest = json.load(f)
+        manifest["version"] = ColumnarIO.VERSION - 1
+        with open(join(self.cIO.dirname, ColumnarIO.MANIFEST), "w") as f:
+            json.dump(manifest, f)
+        self.assertFalse(self.cIO.exists())
+        # the entry is replaced by writing it again
+        self.cIO.write_block(self.block)
+        self.assertTrue(self.cIO.exists())
+
+    def test06_NBytes(self):
+        self.cIO.write_block(self.block)
+        waveforms = sum(train.waveforms.nbytes for train in self.trains(self.block))
+        size = self.cIO.nbytes() - self.cIO.nbytes(waveforms=False)
+        # the file of the waveforms has a small header
+        self.assertEqual(size, getsize(join(self.cIO.dirname, "waveforms.npy")))
+        self.assertTrue(waveforms <= size < waveforms + 1024)
+
+    def test07_LazyReadDoesNotScale(self):
+        self.cIO.write_block(self.block, "int16")
+        # the waveforms are scaled when they are loaded, not when the block is read
+        with mock.patch("swan.columnar_io._scale") as scale:
+            block = self.cIO.read_block(lazy=True)
+        scale.assert_not_called()
+        self.assertEqual(self.trains(block)[0].lazy_waveforms.shape, self.trains(self.block)[0].waveforms.shape)
+
+
+if __name__ == "__main__":
+    unittest.main()
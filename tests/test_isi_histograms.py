@@ -0,0 +1,54 @@
+"""
+Created on Oct 18, 2026
+
+@author: SWAN authors and contributors
+
+Unit test module for the histogram functions of :mod:`swan.views.isi_histograms_view`.
+"""
+import sys
+from os.path import pardir, join, realpath, abspath
+import unittest
+
+import numpy as np
+
+p = abspath(join(realpath(__file__), pardir, pardir))
+sys.path.insert(1, p)
+
+from swan.views.isi_histograms_view import histogram_sorted, pooled_histograms
+
+
+class Test(unittest.TestCase):
+    """
+    Test class for testing :func:`swan.views.isi_histograms_view.histogram_sorted`
+    and :func:`swan.views.isi_histograms_view.pooled_histograms`.
+
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.bins = np.linspace(0, 0.05, 51)
+        self.arrays = [np.sort(rng.exponential(0.02, n)) for n in (0, 10, 1000, 5000)]
+
+    def test01_HistogramSorted(self):
+        for values in self.arrays + [np.array([0., 0.01, 0.05, 0.05, 0.06])]:
+            expected, _ = np.histogram(values, bins=self.bins)
+            np.testing.assert_array_equal(histogram_sorted(values, self.bins), expected)
+        self.assertEqual(len(histogram_sorted(self.arrays[2], np.array([0.]))), 0)
+
+    def test02_PooledHistograms(self):
+        groups = [[self.arrays[1], self.arrays[2]], [], [self.arrays[0], self.arrays[3]]]
+        pooled, totals = pooled_histograms(groups, self.bins)
+        self.assertEqual(pooled.shape, (3, 50))
+        for group, counts, total in zip(groups, pooled, totals):
+            expected = sum((np.histogram(values, bins=self.bins)[0] for values in group), np.zeros(50))
+            np.testing.assert_array_equal(counts, expected)
+            self.assertEqual(total, sum(len(values) for values in group))
+
+    def test03_NoArrays(self):
+        pooled, totals = pooled_histograms([[], []], self.bins)
+        np.testing.assert_array_equal(pooled, np.zeros((2, 50)))
+        np.testing.assert_array_equal(totals, [0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+Created on Oct 18, 2026
+
+@author: SWAN authors and contributors
+
+Unit test module for the :class:`swan.neodata.NeoData` class.
+"""
+import sys
+import tempfile
+import threading
+from os import makedirs
+from os.path import pardir, join, realpath, abspath, exists
+from shutil import rmtree
+import unittest
+
+import numpy as np
+import quantities as pq
+from neo.core import Block, Segment, ChannelIndex, Unit, SpikeTrain, Event
+
+p = abspath(join(realpath(__file__), pardir, pardir))
+sys.path.insert(1, p)
+
+from swan.neodata import NeoData, get_cache_name
+from swan.columnar_io import ColumnarIO
+
+
+def make_block(channel, n_units=2, seed=0):
+    # a block of one channel like the ones read by the BlackrockIO
+    rng = np.random.default_rng(seed)
+    block = Block(name="block")
+    segment = Segment(name="segment")
+    block.segments.append(segment)
+    segment.events.append(Event(times=np.sort(rng.uniform(0, 10000, 20)) * pq.ms,
+                                labels=rng.choice(["a", "b"], 20), name="events"))
+    channel_index = ChannelIndex(index=np.array([0]), channel_ids=np.array([channel]))
+    block.channel_indexes.append(channel_index)
+    for u in range(n_units):
+        unit = Unit(description="unclassified" if u == 0 else "SUA")
+        n = int(rng.integers(20, 100))
+        train = SpikeTrain(np.sort(rng.uniform(0, 10, n)) * pq.s, t_stop=10 * pq.s,
+                           waveforms=rng.normal(size=(n, 1, 48)) * pq.uV, sampling_rate=30 * pq.kHz)
+        train.segment = segment
+        train.unit = unit
+        segment.spiketrains.append(train)
+        unit.spiketrains.append(train)
+        channel_index.units.append(unit)
+    return block
+
+
+class Test(unittest.TestCase):
+    """
+    Test class for testing :class:`swan.neodata.NeoData`.
+
+    The session files are not read, because their cache entries
+    are written before.
+
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.cache_dir = join(self.tmp, "cache")
+        makedirs(self.cache_dir)
+        self.files = []
+        for i in range(2):
+            filename = join(self.tmp, "session%d.nev" % i)
+            with open(filename, "wb") as fn:
+                fn.write(b"x" * (i + 1))
+            self.files.append(filename)
+        self.data = NeoData(self.cache_dir, workers=1)
+        for channel in (1, 2):
+            for i, filename in enumerate(self.files):
+                name = get_cache_name(self.data.cache.get_prefix(filename), channel)
+                ColumnarIO(name).write_block(make_block(channel, seed=10 * channel + i))
+
+    def tearDown(self):
+        rmtree(self.tmp, ignore_errors=True)
+
+    def entries(self, channel):
+        return set(self.data.cache.entry_names({f: [channel] for f in self.files}))
+
+    def test01_PinWhileLoading(self):
+        blocks = self.data.read_channel(self.files, 1, owner=("loading", 0))
+        self.assertEqual(len(blocks), 2)
+        self.assertEqual(self.data.cache.pinned(), self.entries(1))
+        self.data.set_blocks(blocks, self.files, 1, ("loading", 0))
+        # only the loaded channel stays pinned
+        self.assertEqual(self.data.cache.pinned(), self.entries(1))
+        self.data.delete_blocks()
+        self.assertEqual(self.data.cache.pinned(), set())
+
+    def test02_OverlappingLoads(self):
+        self.data.read_channel(self.files, 1, owner=("loading", 0))
+        blocks = self.data.read_channel(self.files, 2, owner=("loading", 1))
+        # the first load was cancelled after it had read its blocks
+        self.data.release_channel(("loading", 0))
+        self.assertEqual(self.data.cache.pinned(), self.entries(2))
+        # the entries of the running load are not evicted
+        self.data.set_cache_budget(1)
+        for name in self.entries(2):
+            self.assertTrue(exists(join(self.cache_dir, name + ".col")))
+        for name in self.entries(1):
+            self.assertFalse(exists(join(self.cache_dir, name + ".col")))
+        self.data.set_blocks(blocks, self.files, 2, ("loading", 1))
+        self.assertEqual(self.data.cache.pinned(), self.entries(2))
+        self.assertEqual(self.data.channel, 2)
+
+    def test03_CancelledLoad(self):
+        cancelled = threading.Event()
+        cancelled.set()
+        self.assertIsNone(self.data.read_channel(self.files, 1, cancelled, owner=("loading", 0)))
+        self.assertEqual(self.data.cache.pinned(), set())
+
+    def test04_FailedLoad(self):
+        blocks = self.data.read_channel(self.files, 1, owner=("loading", 0))
+        # the waveforms of the second session are wider
+        wider = make_block(1, seed=3)
+        for train in wider.segments[0].spiketrains:
+            train.waveforms = np.zeros((len(train), 1, 64)) * pq.uV
+        blocks[1] = wider
+        self.assertRaises(ValueError, self.data.set_blocks, blocks, self.files, 1, ("loading", 0))
+        self.assertEqual(self.data.cache.pinned(), set())
+
+    def test05_MemoizedData(self):
+        self.data.load(self.files, 1)
+        unit = self.data.units[0][0]
+        average = self.data.get_data("average", unit)
+        self.assertIs(self.data.get_data("average", unit), average)
+        info = self.data.get_memo_info()
+        self.assertEqual((info["hits"], info["misses"], info["size"]), (1, 1, 1))
+        self.assertEqual(info["bytes"], average.nbytes)
+        # the memoized results can not be changed by the views
+        self.assertFalse(average.flags.writeable)
+        self.assertRaises(ValueError, average.__setitem__, 0, 1.)
+        # other parameters are memoized separately
+        profile = self.data.get_data("rate profile", unit)
+        self.assertIsNot(self.data.get_data("rate profile", unit, bins=100), profile)
+        self.assertEqual(self.data.get_memo_info()["size"], 3)
+        # lists are copied, so the memo is not changed through them
+        self.data.get_data("sessions", unit).append(0.)
+        self.assertEqual(len(self.data.get_data("sessions", unit)), len(unit.spiketrains[0]) - 1)
+        self.data.clear_memo()
+        self.assertEqual(self.data.get_memo_info()["size"], 0)
+        self.assertEqual(self.data.get_memo_info()["bytes"], 0)
+
+    def test06_AllWaveformsAreNotMemoized(self):
+        self.data.load(self.files, 1)
+        unit = self.data.units[0][0]
+        waveforms = self.data.get_data("all", unit)
+        self.assertEqual(waveforms.shape, (len(unit.spiketrains[0]), 48))
+        self.assertFalse(waveforms.flags.writeable)
+        self.assertIsNot(self.data.get_data("all", unit), waveforms)
+        self.assertEqual(self.data.get_memo_info()["size"], 0)
+
+    def test07_MemoBounds(self):
+        self.data.load(self.files, 1)
+        units = [unit for units in self.data.units for unit in units]
+        self.data.memo_size = 2
+        for unit in units:
+            self.data.get_data("average", unit)
+        self.assertEqual(self.data.get_memo_info()["size"], 2)
+        # the least recently used results are dropped first
+        self.assertIs(self.data.get_data("average", units[-1]), self.data.get_data("average", units[-1]))
+        self.data.memo_size = 100
+        self.data.memo_bytes = 48 * 8
+        self.data.get_data("standard deviation", units[0])
+        self.data.get_data("average", units[0])
+        info = self.data.get_memo_info()
+        self.assertEqual((info["size"], info["bytes"]), (1, 48 * 8))
+
+    def test08_Prefetch(self):
+        self.data.load(self.files, 1)
+        self.data.prefetch(self.files, [2])
+        self.assertEqual(self.data.cache.pinned(), self.entries(1) | self.entries(2))
+        # the prefetched blocks are taken instead of reading them again
+        blocks = self.data.read_channel(self.files, 2)
+        self.assertEqual(len(blocks), 2)
+        self.assertEqual(self.data.cache.pinned(), self.entries(1) | self.entries(2))
+        self.data.set_blocks(blocks, self.files, 2)
+        self.assertEqual(self.data.cache.pinned(), self.entries(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Created on Oct 18, 2026
+
+@author: SWAN authors and contributors
+
+Unit test module for the :mod:`swan.psth` module.
+"""
+import sys
+from os.path import pardir, join, realpath, abspath
+import unittest
+
+import numpy as np
+import quantities as pq
+from neo import SpikeTrain
+from elephant.statistics import instantaneous_rate
+from elephant.kernels import GaussianKernel
+
+p = abspath(join(realpath(__file__), pardir, pardir))
+sys.path.insert(1, p)
+
+from swan.psth import compute_psths, aligned_spikes
+
+
+def elephant_psth(spike_times, trigger, timerange, sampling_period, kernel_width, border_correction,
+                  minimum_spikes=10):
+    # the rate estimate of one unit, as it was computed before with elephant
+    trigger = trigger[(trigger >= spike_times[0]) & (trigger <= spike_times[-1])]
+    if len(trigger) < 1:
+        return [], []
+    raster = [spike_times[(spike_times >= t + timerange[0] - border_correction) &
+                          (spike_times <= t + timerange[1] + border_correction)] - t for t in trigger]
+    raster = np.sort(np.hstack(raster))
+    if len(raster) <= minimum_spikes:
+        return [], []
+    t_start = timerange[0] - border_correction
+    t_stop = timerange[1] + border_correction
+    train = SpikeTrain(raster * pq.ms, t_start=t_start * pq.ms, t_stop=t_stop * pq.ms)
+    rate = instantaneous_rate(train, sampling_period=sampling_period * pq.ms,
+                              kernel=GaussianKernel(kernel_width * pq.ms))
+    rate = rate.time_slice(t_start=timerange[0] * pq.ms, t_stop=timerange[1] * pq.ms)
+    return rate.times.rescale(pq.s).magnitude, rate.rescale(pq.Hz).magnitude[:, 0] / len(trigger)
+
+
+class Test(unittest.TestCase):
+    """
+    Test class for testing :mod:`swan.psth`.
+
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.spiketrains = [np.sort(rng.uniform(0, 1e6, n)) for n in (5000, 50, 20000)]
+        self.trigger = np.sort(rng.uniform(0, 1e6, 200))
+
+    def test01_AlignedSpikes(self):
+        spikes = np.array([1., 5., 9., 10., 12., 30.])
+        triggers = np.array([10., 28.])
+        aligned = aligned_spikes(spikes, triggers, -5., 2.)
+        np.testing.assert_array_equal(aligned, [-5., -1., 0., 2., 2.])
+        self.assertEqual(len(aligned_spikes(spikes, np.array([100.]), -5., 2.)), 0)
+
+    def test02_MatchesElephant(self):
+        for sampling_period, kernel_width, timerange, multiplier in [(1.0, 50.0, (-1000, 1000), 3),
+                                                                     (5.0, 30.0, (-500, 1500), 2),
+                                                                     (3.0, 20.0, (-333, 777), 1),
+                                                                     (1.0, 100.0, (-1000, 1000), 0)]:
+            border_correction = multiplier * kernel_width
+            results = compute_psths(self.spiketrains, [self.trigger] * len(self.spiketrains), timerange,
+                                    sampling_period, kernel_width, border_correction)
+            for spike_times, (times, values) in zip(self.spiketrains, results):
+                expected_times, expected_values = elephant_psth(spike_times, self.trigger, timerange,
+                                                                sampling_period, kernel_width, border_correction)
+                self.assertEqual(len(times), len(expected_times))
+                if len(times):
+                    np.testing.assert_allclose(times, expected_times, rtol=0, atol=1e-12)
+                    np.testing.assert_allclose(values, expected_values, rtol=1e-9, atol=1e-9)
+
+    def test03_SmallBatches(self):
+        triggers = [self.trigger] * len(self.spiketrains)
+        results = compute_psths(self.spiketrains, triggers, (-500, 500), 5.0, 30.0, 60.0)
+        # the histograms are convolved in batches of one unit
+        batched = compute_psths(self.spiketrains, triggers, (-500, 500), 5.0, 30.0, 60.0, max_elements=1)
+        for (times, values), (batched_times, batched_values) in zip(results, batched):
+            np.testing.assert_array_equal(times, batched_times)
+            np.testing.assert_allclose(values, batched_values)
+
+    def test04_NotEnoughSpikes(self):
+        spike_times = np.sort(np.random.default_rng(1).uniform(0, 1000, 5))
+        results = compute_psths([spike_times, self.spiketrains[0], self.spiketrains[0]],
+                                [self.trigger, np.array([-10.]), self.trigger], (-100, 100), 1.0, 10.0)
+        # too few spikes and no trigger within the spikes
+        self.assertEqual(results[0], ([], []))
+        self.assertEqual(results[1], ([], []))
+        self.assertGreater(len(results[2][0]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
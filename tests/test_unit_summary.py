@@ -0,0 +1,80 @@
+"""
+Created on Oct 18, 2026
+
+@author: SWAN authors and contributors
+
+Unit test module for the :mod:`swan.unit_summary` module.
+"""
+import sys
+from os.path import pardir, join, realpath, abspath
+import unittest
+
+import numpy as np
+import quantities as pq
+from neo import SpikeTrain
+
+p = abspath(join(realpath(__file__), pardir, pardir))
+sys.path.insert(1, p)
+
+from swan.unit_summary import UnitSummary, waveform_moments, waveform_density, intervals, DENSITY_BINS
+
+
+class Test(unittest.TestCase):
+    """
+    Test class for testing :mod:`swan.unit_summary`.
+
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.waveforms = rng.normal(5., 20., size=(1000, 2, 48))
+
+    def test01_WaveformMoments(self):
+        # one chunk and chunks of a few spikes give the same result
+        for chunk_bytes in (2 ** 24, 8 * 2 * 48 * 7):
+            mean, std, extremes = waveform_moments(self.waveforms, chunk_bytes)
+            np.testing.assert_allclose(mean, np.mean(self.waveforms, axis=0), rtol=1e-12, atol=1e-12)
+            np.testing.assert_allclose(std, np.std(self.waveforms, axis=0), rtol=1e-12)
+            np.testing.assert_array_equal(extremes, [self.waveforms.min(), self.waveforms.max()])
+
+    def test02_WaveformMomentsOfInt16(self):
+        waveforms = np.round(self.waveforms).astype(np.int16)
+        mean, std, extremes = waveform_moments(waveforms, chunk_bytes=8 * 2 * 48 * 3)
+        np.testing.assert_allclose(mean, np.mean(waveforms, axis=0), rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(std, np.std(waveforms.astype(np.float64), axis=0), rtol=1e-12)
+
+    def test03_NoWaveforms(self):
+        mean, std, extremes = waveform_moments(np.empty((0, 1, 48)))
+        self.assertEqual(mean.shape, (1, 48))
+        self.assertTrue(np.all(np.isnan(mean)) and np.all(np.isnan(std)) and np.all(np.isnan(extremes)))
+        density = waveform_density(np.empty((0, 1, 48)), extremes)
+        self.assertEqual(density.shape, (48, DENSITY_BINS))
+        self.assertEqual(density.sum(), 0)
+
+    def test04_WaveformDensity(self):
+        extremes = np.array([self.waveforms.min(), self.waveforms.max()])
+        density = waveform_density(self.waveforms, extremes, bins=16, chunk_bytes=8 * 48 * 9)
+        self.assertEqual(density.shape, (48, 16))
+        # every sample of every waveform is counted once
+        np.testing.assert_array_equal(density.sum(axis=1), np.full(48, len(self.waveforms)))
+        edges = np.linspace(extremes[0], extremes[1], 17)
+        for sample in (0, 17, 47):
+            expected, _ = np.histogram(self.waveforms[:, 0, sample], bins=edges)
+            np.testing.assert_array_equal(density[sample], expected)
+
+    def test05_Intervals(self):
+        train = SpikeTrain([3., 1., 2.5] * pq.ms, t_stop=10. * pq.ms)
+        np.testing.assert_allclose(intervals(train), [0.0015, 0.0005])
+
+    def test06_Compute(self):
+        times = np.sort(np.random.default_rng(1).uniform(0, 10, len(self.waveforms)))
+        train = SpikeTrain(times * pq.s, t_stop=10. * pq.s, waveforms=self.waveforms * pq.uV)
+        summary = UnitSummary.compute(train)
+        np.testing.assert_allclose(summary.mean, np.mean(self.waveforms, axis=0), rtol=1e-12, atol=1e-12)
+        self.assertEqual((summary.minimum, summary.maximum), (self.waveforms.min(), self.waveforms.max()))
+        np.testing.assert_allclose(summary.isi, np.diff(times))
+        self.assertEqual(summary.density.shape, (48, DENSITY_BINS))
+
+
+if __name__ == "__main__":
+    unittest.main()